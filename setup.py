@@ -32,5 +32,6 @@ setup(
     console_scripts={
         "cryptoVDF": "crypto_VDF.entry_point:main"},
     install_requires=requirements,
+    extras_require={"gmpy2": ["gmpy2>=2.1"]},
     zip_safe=False
 )
@@ -0,0 +1,112 @@
+import random
+from time import perf_counter
+from typing import Annotated, Callable, Dict, Iterable, List
+
+import typer
+
+from crypto_VDF.utils.exponentiation import sliding_window_exp, FixedBaseExp, multi_exp
+from crypto_VDF.utils.montgomery import CONTEXTS
+from crypto_VDF.utils.utils import exp_modular, exp_modular_naive
+
+app = typer.Typer(pretty_exceptions_show_locals=False, no_args_is_help=True)
+
+
+def print_timings(timings: Dict[str, float], reference: str) -> None:
+    for name, timing in timings.items():
+        print(f"{name:<40} {timing * 1e3:>12.4f} ms   x{timings[reference] / timing:.1f}")
+
+
+def time_call(func: Callable, inputs: Iterable) -> float:
+    """
+    Mean execution time of func over the inputs (in seconds)
+    """
+    inputs = list(inputs)
+    start = perf_counter()
+    for item in inputs:
+        func(item)
+    return (perf_counter() - start) / len(inputs)
+
+
+@app.command(name="exp")
+def cmd_exp(
+        bits: Annotated[int, typer.Option(help="Bit length of the modulus")] = 2048,
+        exponent_bits: Annotated[int, typer.Option(help="Bit length of the exponent")] = 256,
+        repeat: Annotated[int, typer.Option(help="Number of exponentiations per measure")] = 20
+):
+    """
+    Compare the modular exponentiation engines with the square-and-multiply on the list of bits (the fixed-base
+    table is built once before the measure)
+    """
+    n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+    a = random.randrange(n)
+    exponents = [random.getrandbits(exponent_bits) for _ in range(repeat)]
+    fixed_base = FixedBaseExp(base=a, n=n, max_bits=exponent_bits)
+    timings = {
+        "square-and-multiply (exp_modular_naive)": time_call(lambda e: exp_modular_naive(a=a, exponent=e, n=n),
+                                                             exponents),
+        "native pow (exp_modular)": time_call(lambda e: exp_modular(a=a, exponent=e, n=n), exponents),
+        "sliding window (sliding_window_exp)": time_call(lambda e: sliding_window_exp(a=a, exponent=e, n=n),
+                                                         exponents),
+        "fixed base (FixedBaseExp.exp)": time_call(fixed_base.exp, exponents),
+    }
+    print(f"Modular exponentiation, {bits}-bit modulus, {exponent_bits}-bit exponent, mean of {repeat}")
+    print_timings(timings, reference="square-and-multiply (exp_modular_naive)")
+
+
+def square_loop(a: int, steps: int, n: int) -> int:
+    for _ in range(steps):
+        a = (a * a) % n
+    return a
+
+
+@app.command(name="squaring")
+def cmd_squaring(
+        bits: Annotated[List[int], typer.Option(help="Bit lengths of the modulus")] = (1024, 2048, 3072),
+        steps: Annotated[int, typer.Option(help="Number of squarings per measure")] = 20000,
+        backend: Annotated[str, typer.Option(help="Arithmetic backend: int, gmpy2 or auto")] = "auto"
+):
+    """
+    Compare the squaring chain of the modular reductions of the arithmetic contexts (native, Montgomery, Barrett)
+    with the per-step squaring loop (the contexts are built once before the measure)
+    """
+    for size in bits:
+        n = random.getrandbits(size) | (1 << (size - 1)) | 1
+        a = random.randrange(n)
+        expected = square_loop(a=a, steps=steps, n=n)
+        timings = {"per-step loop (a * a % n)": time_call(lambda x: square_loop(a=x, steps=steps, n=n), [a])}
+        for name, context_class in CONTEXTS.items():
+            context = context_class(n=n, backend=backend)
+            assert context.square_chain(a=a, steps=steps)[0] == expected
+            timings[f"{name} context ({context.backend.name})"] = time_call(
+                lambda x: context.square_chain(a=x, steps=steps), [a])
+        print(f"{steps} squarings, {size}-bit modulus")
+        print_timings(timings, reference="per-step loop (a * a % n)")
+
+
+@app.command(name="multi-exp")
+def cmd_multi_exp(
+        bits: Annotated[int, typer.Option(help="Bit length of the modulus")] = 2048,
+        exponent_bits: Annotated[int, typer.Option(help="Bit length of the exponents")] = 256,
+        repeat: Annotated[int, typer.Option(help="Number of multi-exponentiations per measure")] = 20
+):
+    """
+    Compare the multi-exponentiation prod_i a_i^{e_i} with the product of separate modular exponentiations, for 2 to
+    4 bases
+    """
+    n = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+    for k in range(2, 5):
+        inputs = [([random.randrange(n) for _ in range(k)], [random.getrandbits(exponent_bits) for _ in range(k)])
+                  for _ in range(repeat)]
+
+        def separate(item):
+            result = 1
+            for base, exponent in zip(*item):
+                result = (result * exp_modular(a=base, exponent=exponent, n=n)) % n
+            return result
+
+        timings = {
+            "separate exponentiations (exp_modular)": time_call(separate, inputs),
+            "multi-exponentiation (multi_exp)": time_call(lambda item: multi_exp(*item, n=n), inputs),
+        }
+        print(f"{k} bases, {bits}-bit modulus, {exponent_bits}-bit exponents, mean of {repeat}")
+        print_timings(timings, reference="separate exponentiations (exp_modular)")
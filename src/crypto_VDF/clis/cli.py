@@ -1,8 +1,13 @@
 import typer
 
+from crypto_VDF.clis.benchmark import app as benchmark
 from crypto_VDF.clis.pietrzak import app as pietrzak
+from crypto_VDF.clis.service import cmd_load_test, cmd_serve
 from crypto_VDF.clis.wesolowski import app as wesolowski
 
 app = typer.Typer(pretty_exceptions_show_locals=False, no_args_is_help=True)
 app.add_typer(pietrzak, name='pietrzak')
 app.add_typer(wesolowski, name='wesolowski')
+app.add_typer(benchmark, name='benchmark')
+app.command(name='serve')(cmd_serve)
+app.command(name='load-test')(cmd_load_test)
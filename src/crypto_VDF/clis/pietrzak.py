@@ -9,6 +9,8 @@ from crypto_VDF.data_transfer_objects.dto import PublicParams
 from crypto_VDF.data_transfer_objects.plotter import InputType, VDFName
 from crypto_VDF.plotter.pietrazk_grapher import PietrzakGrapher
 from crypto_VDF.utils.logger import get_logger
+from crypto_VDF.verifiable_delay_functions.beacon import Beacon, BeaconLog
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
 from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
 from time import time as t
 
@@ -21,13 +23,23 @@ _log = get_logger(__name__)
 def cmd_full_vdf(
         delay: Annotated[int, typer.Option(help="Delay of the VDF")] = 2,
         security_parameter: Annotated[int, typer.Option(help="Bit lengths of the modulus")] = 10,
+        trapdoor: Annotated[bool, typer.Option(help="Use trapdoor")] = False,
         verbose: Annotated[bool, typer.Option(help="Show Debug logs")] = False,
+        param_store: Annotated[bool, typer.Option(help="Reuse the moduli of the parameter store")] = False,
 ):
-    pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay)
+    if param_store:
+        store = ParameterStore(keep_trapdoor=trapdoor)
+        pp = store.setup(vdf=PietrzakVDF, security_param=security_parameter, delay=delay, ret_sk=trapdoor)
+    else:
+        pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay, ret_sk=trapdoor)
     print(f"Public parameters: {orjson.loads(pp.json())}\n")
     x = PietrzakVDF.gen(pp)
     print(f"\nGenerated input: {x}\n")
-    evaluation = PietrzakVDF.eval(public_params=pp, input_param=x, _verbose=verbose, _hide=True)
+    if trapdoor:
+        print(f"Running Trapdoor with p = {pp.p} and q = {pp.q}\n")
+        evaluation = PietrzakVDF.trapdoor(public_params=pp, input_param=x, _verbose=verbose, _hide=True)
+    else:
+        evaluation = PietrzakVDF.eval(public_params=pp, input_param=x, _verbose=verbose, _hide=True)
     print(f"\nGenerated output: {evaluation.output}")
     print(f"Generated Proof: {evaluation.proof}\n")
     verif = PietrzakVDF.verify(pp, x, evaluation.output, evaluation.proof, verbose, _hide=True)
@@ -65,18 +77,33 @@ def cmd_verif(
 @app.command(name="eval")
 def cmd_eval(
         security_parameter: Annotated[int, typer.Option(help="security_parameter")] = 128,
-        delay: Annotated[int, typer.Option(help="Delay of the VDF")] = 4
+        delay: Annotated[int, typer.Option(help="Delay of the VDF")] = 4,
+        modulus: Annotated[int, typer.Option(help="Modulus of a previous evaluation")] = None,
+        x: Annotated[int, typer.Option(help="Input of a previous evaluation")] = None,
+        resume: Annotated[bool, typer.Option(help="Checkpoint the squarings and resume the previous evaluation of "
+                                                  "--modulus and --x")] = False,
+        checkpoint_dir: Annotated[str, typer.Option(help="Directory of the checkpoints (data/checkpoints)")] = None
 ):
-    pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay)
-    x = PietrzakVDF.gen(pp)
-    y = PietrzakVDF.eval(public_params=pp, input_param=x)
+    if modulus is None:
+        pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay)
+    else:
+        pp = PietrzakVDF.params_from_modulus(n=modulus, security_param=security_parameter, delay=delay)
+    x = PietrzakVDF.gen(pp) if x is None else x
+    print("Input:", x)
+    # printed before the squarings, so that an interrupted evaluation can be resumed
     print("Modulus:", pp.modulus)
+    if resume or checkpoint_dir is not None:
+        print(f"Resume with: --modulus {pp.modulus} --x {x} --resume")
+        y = PietrzakVDF.eval_resumable(setup=pp, input_param=x, checkpoint_dir=checkpoint_dir, resume=resume)
+    else:
+        y = PietrzakVDF.eval(public_params=pp, input_param=x)
     print("Output of Eval:", y)
 
 
 @app.command(name="setup")
-def cmd_setup(security_parameter: int = 100, delay: int = 2 ** 10):
-    pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay)
+def cmd_setup(security_parameter: int = 100, delay: int = 2 ** 10,
+              workers: Annotated[int, typer.Option(help="Number of processes searching the primes")] = 1):
+    pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay, workers=workers)
     print(f"{orjson.loads(pp.json())}")
 
 
@@ -87,6 +114,29 @@ def cmd_gen(delay: int = 2 ** 10, modulus: int = 21):
     print(f"Generated quadratic residue: {x}")
 
 
+@app.command(name="beacon")
+def cmd_beacon(
+        security_parameter: Annotated[int, typer.Option(help="Bit length of the modulus")] = 128,
+        delay: Annotated[int, typer.Option(help="Delay of an epoch")] = 2 ** 16,
+        seed: Annotated[int, typer.Option(help="Seed of the input of the epoch 0")] = 0,
+        epochs: Annotated[int, typer.Option(help="Number of epochs to run (forever if not given)")] = None,
+        log: Annotated[str, typer.Option(help="Append-only log of the epochs")] = None,
+        workers: Annotated[int, typer.Option(help="Number of processes computing the proofs")] = 1,
+        param_store: Annotated[bool, typer.Option(help="Reuse the moduli of the parameter store")] = False
+):
+    header = BeaconLog(log).header() if log is not None else None
+    if header is not None:
+        # a logged beacon goes on under the modulus of its log
+        pp = PietrzakVDF.params_from_modulus(n=header.modulus, security_param=security_parameter, delay=delay)
+    elif param_store:
+        pp = ParameterStore().setup(vdf=PietrzakVDF, security_param=security_parameter, delay=delay)
+    else:
+        pp = PietrzakVDF.setup(security_param=security_parameter, delay=delay)
+    print(pp.json())
+    for record in Beacon(vdf=PietrzakVDF, setup=pp, seed=seed, log=log, workers=workers).run(epochs=epochs):
+        print(record.json())
+
+
 @app.command(name="plots")
 def cmd_complexity_plots(
         security_parameter: Annotated[int, typer.Option(help="Security parameter")] = 128,
@@ -97,12 +147,14 @@ def cmd_complexity_plots(
         re_measure: Annotated[
             bool, typer.Option(help="Re-run the VDF instead of using past measurement to plot")] = True,
         show: Annotated[bool, typer.Option(help="Show the plot")] = False,
-        verbose: Annotated[bool, typer.Option(help="Show Debug Logs")] = False
+        verbose: Annotated[bool, typer.Option(help="Show Debug Logs")] = False,
+        param_store: Annotated[bool, typer.Option(help="Reuse the moduli of the parameter store")] = False
 ):
     s = t()
     input_type = InputType.RANDOM_INPUT if fix_input is False else InputType.FIX_INPUT
+    store = ParameterStore() if param_store else None
     grapher = PietrzakGrapher(number_of_delays=max_delay_exp, number_ot_iterations=iterations, input_type=input_type,
-                              security_parameter=security_parameter)
+                              security_parameter=security_parameter, store=store)
     title = rf"Pietrzak VDF complexity (mean after {grapher.number_ot_iterations} iterations) $\lambda$ = " \
             rf"{security_parameter}"
     if re_measure is False and not grapher.paths.macrostate_file_name.is_file():
@@ -0,0 +1,52 @@
+from typing import Annotated, List
+
+import typer
+
+from crypto_VDF.service.load_generator import run_load
+from crypto_VDF.service.server import VDFService, make_server
+from crypto_VDF.utils.logger import get_logger
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
+
+_log = get_logger(__name__)
+
+
+def cmd_serve(
+        param_set: Annotated[List[str], typer.Option(help="Parameter set scheme:security_param:delay (repeatable)")],
+        host: Annotated[str, typer.Option(help="Address to listen on")] = "127.0.0.1",
+        port: Annotated[int, typer.Option(help="Port to listen on")] = 8000,
+        workers: Annotated[int, typer.Option(help="Number of processes evaluating the jobs (all CPUs)")] = None,
+        max_queued: Annotated[int, typer.Option(help="Maximum number of unfinished jobs")] = 1024,
+        verify_window: Annotated[float, typer.Option(help="Seconds a verification waits to be batched")] = 0.002,
+        param_store: Annotated[str, typer.Option(help="Directory of the parameter store")] = None
+):
+    """
+    Serve the VDF evaluation and verification API over HTTP
+    """
+    service = VDFService(param_sets=param_set, workers=workers, store=ParameterStore(directory=param_store),
+                         max_queued=max_queued, verify_window=verify_window)
+    server = make_server(service=service, host=host, port=port)
+    print(f"Serving {list(service.params)} on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def cmd_load_test(
+        param_set: Annotated[str, typer.Option(help="Parameter set of the requests")],
+        url: Annotated[str, typer.Option(help="Base url of the service")] = "http://127.0.0.1:8000",
+        requests: Annotated[int, typer.Option(help="Number of requests")] = 200,
+        concurrency: Annotated[int, typer.Option(help="Number of requests in flight")] = 8,
+        kind: Annotated[str, typer.Option(help="Kind of requests: verify or eval")] = "verify"
+):
+    """
+    Load generator of the service: throughput and latency percentiles of verify or eval requests
+    """
+    stats = run_load(url=url, params=param_set, requests=requests, concurrency=concurrency, kind=kind)
+    print(f"{stats['requests']} {kind} requests ({stats['failures']} failed) in {stats['duration']:.2f} s: "
+          f"{stats['throughput']:.1f} requests/s")
+    print(f"latency mean {stats['mean_ms']:.2f} ms, p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+          f"max {stats['max_ms']:.2f} ms")
@@ -8,6 +8,8 @@ from crypto_VDF.data_transfer_objects.plotter import InputType, VDFName
 from crypto_VDF.plotter.wesolowski_grapher import WesolowskiGrapher
 from crypto_VDF.utils.logger import get_logger
 from crypto_VDF.utils.utils import square_sequences_v2
+from crypto_VDF.verifiable_delay_functions.beacon import Beacon, BeaconLog
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
 from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
 import pandas as pd
 from time import time as t, strftime, gmtime
@@ -47,8 +49,13 @@ def cmd_full_vdf(
         security_parameter: Annotated[int, typer.Option(help="Bit lengths of the modulus")] = 10,
         trapdoor: Annotated[bool, typer.Option(help="Use trapdoor")] = False,
         verbose: Annotated[bool, typer.Option(help="Show Debug logs")] = False,
+        param_store: Annotated[bool, typer.Option(help="Reuse the moduli of the parameter store")] = False,
 ):
-    pp = WesolowskiVDF.setup(security_param=security_parameter, ret_sk=True, delay=delay)
+    if param_store:
+        store = ParameterStore(keep_trapdoor=trapdoor)
+        pp = store.setup(vdf=WesolowskiVDF, security_param=security_parameter, ret_sk=trapdoor, delay=delay)
+    else:
+        pp = WesolowskiVDF.setup(security_param=security_parameter, ret_sk=True, delay=delay)
     print(f"Public parameters: {orjson.loads(pp.json())}\n")
     x = WesolowskiVDF.gen(pp)
     print(f"\nGenerated input: {x}\n")
@@ -95,16 +102,63 @@ def cmd_verif(
     print(out)
 
 
+@app.command(name="setup")
+def cmd_setup(security_parameter: int = 100, delay: int = 2 ** 10,
+              ret_sk: Annotated[bool, typer.Option(help="Keep the secret key phi")] = False,
+              workers: Annotated[int, typer.Option(help="Number of processes searching the primes")] = 1):
+    pp = WesolowskiVDF.setup(security_param=security_parameter, delay=delay, ret_sk=ret_sk, workers=workers)
+    print(pp.json())
+
+
 @app.command(name="eval")
-def cmd_eval(security_parameter: int = 8, delay: int = 8):
-    pp = WesolowskiVDF.setup(security_param=security_parameter, delay=delay)
-    x = WesolowskiVDF.gen(pp)
+def cmd_eval(
+        security_parameter: int = 8,
+        delay: int = 8,
+        modulus: Annotated[int, typer.Option(help="Modulus of a previous evaluation")] = None,
+        x: Annotated[int, typer.Option(help="Input of a previous evaluation")] = None,
+        resume: Annotated[bool, typer.Option(help="Checkpoint the squarings and resume the previous evaluation of "
+                                                  "--modulus and --x")] = False,
+        checkpoint_dir: Annotated[str, typer.Option(help="Directory of the checkpoints (data/checkpoints)")] = None
+):
+    if modulus is None:
+        pp = WesolowskiVDF.setup(security_param=security_parameter, delay=delay)
+    else:
+        pp = WesolowskiVDF.params_from_modulus(n=modulus, security_param=security_parameter, delay=delay)
+    x = WesolowskiVDF.gen(pp) if x is None else x
     print('input x:', x)
-    y = WesolowskiVDF.eval(setup=pp, input_param=x)
+    # printed before the squarings, so that an interrupted evaluation can be resumed
     print("Modulus:", pp.n)
+    if resume or checkpoint_dir is not None:
+        print(f"Resume with: --modulus {pp.n} --x {x} --resume")
+        y = WesolowskiVDF.eval_resumable(setup=pp, input_param=x, checkpoint_dir=checkpoint_dir, resume=resume)
+    else:
+        y = WesolowskiVDF.eval(setup=pp, input_param=x)
     print("Output of Eval:", y)
 
 
+@app.command(name="beacon")
+def cmd_beacon(
+        security_parameter: Annotated[int, typer.Option(help="Bit length of the modulus")] = 128,
+        delay: Annotated[int, typer.Option(help="Delay of an epoch")] = 2 ** 16,
+        seed: Annotated[int, typer.Option(help="Seed of the input of the epoch 0")] = 0,
+        epochs: Annotated[int, typer.Option(help="Number of epochs to run (forever if not given)")] = None,
+        log: Annotated[str, typer.Option(help="Append-only log of the epochs")] = None,
+        workers: Annotated[int, typer.Option(help="Number of processes computing the proofs")] = 1,
+        param_store: Annotated[bool, typer.Option(help="Reuse the moduli of the parameter store")] = False
+):
+    header = BeaconLog(log).header() if log is not None else None
+    if header is not None:
+        # a logged beacon goes on under the modulus of its log
+        pp = WesolowskiVDF.params_from_modulus(n=header.modulus, security_param=security_parameter, delay=delay)
+    elif param_store:
+        pp = ParameterStore().setup(vdf=WesolowskiVDF, security_param=security_parameter, delay=delay)
+    else:
+        pp = WesolowskiVDF.setup(security_param=security_parameter, delay=delay)
+    print(pp.json())
+    for record in Beacon(vdf=WesolowskiVDF, setup=pp, seed=seed, log=log, workers=workers).run(epochs=epochs):
+        print(record.json())
+
+
 @app.command(name="plots")
 def cmd_complexity_plots(
         security_parameter: Annotated[int, typer.Option(help="Number of bits of the modulus")] = 20,
@@ -115,12 +169,14 @@ def cmd_complexity_plots(
         re_measure: Annotated[
             bool, typer.Option(help="Re-run the VDF instead of using past measurement to plot")] = True,
         show: Annotated[bool, typer.Option(help="Show the plot")] = False,
-        verbose: Annotated[bool, typer.Option(help="Show Debug Logs")] = False
+        verbose: Annotated[bool, typer.Option(help="Show Debug Logs")] = False,
+        param_store: Annotated[bool, typer.Option(help="Reuse the moduli of the parameter store")] = False
 ):
     s = t()
     input_type = InputType.RANDOM_INPUT if fix_input is False else InputType.FIX_INPUT
+    store = ParameterStore() if param_store else None
     grapher = WesolowskiGrapher(number_of_delays=max_delay_exp, number_ot_iterations=iterations, input_type=input_type,
-                                security_parameter=security_parameter)
+                                security_parameter=security_parameter, store=store)
     title = rf"Wesolowski VDF complexity (mean after {grapher.number_ot_iterations} iterations) $\lambda$ = {security_parameter}"
     if re_measure is False and not grapher.paths.macrostate_file_name.is_file():
         _log.warning(f"File {grapher.paths.macrostate_file_name} does not exist, will re-take the measurements by"
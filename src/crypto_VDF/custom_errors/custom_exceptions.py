@@ -39,3 +39,14 @@ class ValuesDivergenceException(pydantic.PydanticValueError):
 class CoPrimeException(BaseCaseException):
     def __init__(self, name="IntegersAreNotCoPrimes", message="The integers are not co-primes"):
         super().__init__(name=name, message=message)
+
+
+class BackendNotAvailable(BaseCaseException):
+    def __init__(self, name="BackendNotAvailable", message="The arithmetic backend is not available"):
+        super().__init__(name=name, message=message)
+
+
+class JobQueueFull(BaseCaseException):
+
+    def __init__(self, name="JobQueueFull", message="The job queue is full"):
+        super().__init__(name=name, message=message)
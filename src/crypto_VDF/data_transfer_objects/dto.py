@@ -30,6 +30,8 @@ class BaseSetup(pydantic.BaseModel):
 
 class PublicParams(BaseSetup):
     modulus: int
+    p: Optional[int]
+    q: Optional[int]
 
 
 class RsaPrimes(pydantic.BaseModel):
@@ -40,8 +42,81 @@ class RsaPrimes(pydantic.BaseModel):
 class RsaSetup(BaseSetup):
     phi: Optional[int]
     n: int
+    p: Optional[int]
+    q: Optional[int]
 
 
 class EvalResponse(pydantic.BaseModel):
     output: int
     proof: Union[List[int], int]
+    input_param: Optional[int]
+
+
+class BatchVerifyResponse(pydantic.BaseModel):
+    results: List[bool]
+    valid: bool
+    elapsed: float
+    throughput: float
+
+
+class StoredModulus(pydantic.BaseModel):
+    n: int
+    p: Optional[int]
+    q: Optional[int]
+
+    @property
+    def phi(self) -> Optional[int]:
+        if self.p is None or self.q is None:
+            return None
+        return (self.p - 1) * (self.q - 1)
+
+
+class ParameterStoreEntry(pydantic.BaseModel):
+    scheme: str
+    security_param: int
+    issued: List[StoredModulus] = []
+    ready: List[StoredModulus] = []
+
+
+class EvalState(pydantic.BaseModel):
+    scheme: str
+    modulus: int
+    input_param: int
+    step: int
+    value: int
+    interval: int
+    checkpoints: List[int]
+
+
+class BeaconHeader(pydantic.BaseModel):
+    scheme: str
+    modulus: int
+    delay: int
+    seed: int
+
+
+class BeaconRecord(pydantic.BaseModel):
+    epoch: int
+    input_param: int
+    output: int
+    proof: Union[List[int], int]
+
+
+class EvalProgress(pydantic.BaseModel):
+    input_param: int
+    steps: int
+    total: int
+    rate: float
+    eta: float
+    response: Optional[EvalResponse]
+
+
+class JobStatus(pydantic.BaseModel):
+    job: str
+    params: str
+    input_param: int
+    status: str
+    submitted: float
+    finished: Optional[float]
+    result: Optional[EvalResponse]
+    error: Optional[str]
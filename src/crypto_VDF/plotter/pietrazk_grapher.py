@@ -3,6 +3,7 @@ from crypto_VDF.plotter.grapher import Grapher
 from crypto_VDF.data_transfer_objects.dto import PublicParams
 from crypto_VDF.data_transfer_objects.plotter import CollectVDFData, InputType, VDFName
 from crypto_VDF.utils.logger import get_logger, set_level
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
 from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
 from crypto_VDF.utils.number_theory import NumberTheory
 from time import time as t
@@ -17,7 +18,8 @@ _log = get_logger(__name__)
 class PietrzakGrapher(Grapher):
 
     def __init__(self, number_of_delays: int, number_ot_iterations: int, security_parameter: int,
-                 input_type: InputType = InputType.RANDOM_INPUT):
+                 input_type: InputType = InputType.RANDOM_INPUT, store: ParameterStore = None):
+        self.store = store
         self.delays = np.array(arrange_powers_of_2(1, number_of_delays))
         self.security_parameter = security_parameter
         self.paths = self.get_paths(delay_sub_dir=f"2_to_power_{number_of_delays}", iterations=number_ot_iterations,
@@ -51,8 +53,19 @@ class PietrzakGrapher(Grapher):
         assert verification is True
         return t_out_end, t_verif_end, input_pram, pp.delay
 
+    def setup_with_delay(self, delay) -> PublicParams:
+        if self.store is not None:
+            return self.store.setup(vdf=PietrzakVDF, security_param=self.security_parameter, delay=delay)
+        return PietrzakVDF.setup(security_param=self.security_parameter, delay=delay)
+
+    def gen_input(self, pp: PublicParams) -> int:
+        if self.store is not None:
+            return self.store.gen(vdf=PietrzakVDF, params=pp)
+        return NumberTheory.generate_quadratic_residue(pp.modulus)
+
     def run_vdf_random_with_delay(self, delay):
-        return self.run_vdf_random(PietrzakVDF.setup(security_param=self.security_parameter, delay=delay))
+        pp = self.setup_with_delay(delay)
+        return self.run_vdf(pp=pp, input_pram=self.gen_input(pp))
 
     def generate_pietrzak_complexity_data(self, fix_input=False) -> pd.DataFrame:
 
@@ -62,17 +75,15 @@ class PietrzakGrapher(Grapher):
 
         if fix_input:
 
-            primes = PietrzakVDF.generate_rsa_primes(self.security_parameter)
-            modulus = primes.q.base_10 * primes.p.base_10
-            x = NumberTheory.generate_quadratic_residue(modulus=modulus)
+            x = self.gen_input(self.setup_with_delay(delay=2))
             results = [
-                self.run_vdf(pp := PietrzakVDF.setup(security_param=self.security_parameter, delay=i), input_pram=x) for
+                self.run_vdf(pp := self.setup_with_delay(delay=i), input_pram=x) for
                 idx, i in
                 enumerate(delays_list) for _ in range(self.number_ot_iterations)]
             time_eval_macro, time_verif_macro, macrostate_counted_delays, macrostate_inputs = zip(*results)
 
         else:
-            results = [self.run_vdf_random(pp := PietrzakVDF.setup(security_param=self.security_parameter, delay=i)) for
+            results = [self.run_vdf_random_with_delay(delay=i) for
                        idx, i in
                        enumerate(delays_list) for _ in range(self.number_ot_iterations)]
             time_eval_macro, time_verif_macro, macrostate_counted_delays, macrostate_inputs = zip(*results)
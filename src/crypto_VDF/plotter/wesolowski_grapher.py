@@ -3,6 +3,7 @@ from crypto_VDF.plotter.grapher import Grapher
 from crypto_VDF.data_transfer_objects.dto import RsaSetup
 from crypto_VDF.data_transfer_objects.plotter import CollectVDFData, InputType, VDFName
 from crypto_VDF.utils.logger import get_logger, set_level
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
 from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
 from time import time as t
 from time import strftime, gmtime
@@ -16,7 +17,8 @@ _log = get_logger(__name__)
 class WesolowskiGrapher(Grapher):
 
     def __init__(self, number_of_delays: int, number_ot_iterations: int, security_parameter: int,
-                 input_type: InputType = InputType.RANDOM_INPUT):
+                 input_type: InputType = InputType.RANDOM_INPUT, store: ParameterStore = None):
+        self.store = store
         self.delays = np.array(arrange_powers_of_2(1, number_of_delays))
         self.security_parameter = security_parameter
         self.paths = self.get_paths(delay_sub_dir=f"2_to_power_{number_of_delays}", iterations=number_ot_iterations,
@@ -24,7 +26,7 @@ class WesolowskiGrapher(Grapher):
         super().__init__(number_of_delays=number_of_delays, number_ot_iterations=number_ot_iterations)
 
     def run_vdf_random(self, pp: RsaSetup):
-        x = WesolowskiVDF.gen(setup=pp)
+        x = self.gen_input(pp)
         return self.run_vdf(pp=pp, input_pram=x)
 
     def run_vdf(self, pp: RsaSetup, input_pram: int):
@@ -46,8 +48,18 @@ class WesolowskiGrapher(Grapher):
 
         return tOutEnd, tVerifEnd, input_pram, pp.delay
 
+    def setup_with_delay(self, delay) -> RsaSetup:
+        if self.store is not None:
+            return self.store.setup(vdf=WesolowskiVDF, security_param=self.security_parameter, delay=delay)
+        return WesolowskiVDF.setup(security_param=self.security_parameter, delay=delay)
+
+    def gen_input(self, pp: RsaSetup) -> int:
+        if self.store is not None:
+            return self.store.gen(vdf=WesolowskiVDF, params=pp)
+        return WesolowskiVDF.gen(setup=pp)
+
     def run_vdf_random_with_delay(self, delay):
-        return self.run_vdf_random(WesolowskiVDF.setup(security_param=self.security_parameter, delay=delay))
+        return self.run_vdf_random(self.setup_with_delay(delay))
 
     def generate_wesolowski_complexity_data(self, fix_input=False) -> pd.DataFrame:
 
@@ -56,16 +68,15 @@ class WesolowskiGrapher(Grapher):
         _log.info(f"[WESOLOWSKI-GENERATE-DATA] Delay repeat {self.number_ot_iterations}")
 
         if fix_input:
-            rsa_setup = WesolowskiVDF.setup(security_param=self.security_parameter, delay=2)
-            x = WesolowskiVDF.gen(setup=rsa_setup)
+            x = self.gen_input(self.setup_with_delay(delay=2))
             results = [
-                self.run_vdf(pp := WesolowskiVDF.setup(security_param=self.security_parameter, delay=i), input_pram=x)
+                self.run_vdf(pp := self.setup_with_delay(delay=i), input_pram=x)
                 for idx, i in
                 enumerate(delays_list) for _ in range(self.number_ot_iterations)]
             time_eval_macro, time_verif_macro, macrostate_counted_delays, macrostate_inputs = zip(*results)
 
         else:
-            results = [self.run_vdf_random(pp := WesolowskiVDF.setup(security_param=self.security_parameter, delay=i)) for idx, i in
+            results = [self.run_vdf_random_with_delay(delay=i) for idx, i in
                        enumerate(delays_list) for _ in range(self.number_ot_iterations)]
             time_eval_macro, time_verif_macro, macrostate_counted_delays, macrostate_inputs = zip(*results)
 
@@ -0,0 +1,113 @@
+import json
+import math
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+
+# number of seconds between two polls of the result of an eval job
+POLL_INTERVAL = 0.01
+
+
+def request(url: str, body: dict = None, timeout: float = 60) -> dict:
+    """
+    GET (POST if body is given) the url of the service
+
+    Returns:
+        JSON response, with its HTTP status in "_status"
+    """
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            status, content = response.status, response.read()
+    except urllib.error.HTTPError as exc:
+        status, content = exc.code, exc.read()
+    result = json.loads(content)
+    result["_status"] = status
+    return result
+
+
+def wait_result(url: str, job: str, timeout: float = 600) -> dict:
+    """
+    Poll the result of the eval job until it is finished
+
+    Raises:
+        GeneralException if the job fails or is not finished after timeout seconds
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = request(f"{url}/jobs/{job}/result")
+        if result["_status"] == 200:
+            return result
+        if result["_status"] != 202:
+            raise GeneralException(message=f"Job {job} failed: {result.get('error')}")
+        time.sleep(POLL_INTERVAL)
+    raise GeneralException(message=f"Job {job} not finished after {timeout} s")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    q-th percentile (nearest rank) of the values
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def run_load(url: str, params: str, requests: int = 100, concurrency: int = 8,
+             kind: str = "verify") -> Dict[str, float]:
+    """
+    Send requests to the service from concurrency threads and measure the latencies: a verify request is answered
+    inline, an eval request is measured from its submission to its result
+
+    Args:
+        url: base url of the service, e.g. http://127.0.0.1:8000
+        params: parameter set of the requests
+        requests: number of requests
+        concurrency: number of requests in flight
+        kind: 'verify' or 'eval'
+    Returns:
+        number of requests and failures, duration (s), throughput (requests/s), mean, p50, p99 and max latency (ms)
+    """
+    url = url.rstrip("/")
+    if kind == "verify":
+        # a valid proof to verify, from one eval job
+        reference = wait_result(url, request(f"{url}/eval", {"params": params})["job"])
+        body = {"params": params, "x": reference["input_param"], "y": reference["output"],
+                "proof": reference["proof"]}
+
+        def send(_) -> float:
+            start = time.perf_counter()
+            result = request(f"{url}/verify", body)
+            if result["_status"] != 200 or not result["valid"]:
+                raise GeneralException(message=f"Verification failed: {result}")
+            return time.perf_counter() - start
+    elif kind == "eval":
+        def send(_) -> float:
+            start = time.perf_counter()
+            submitted = request(f"{url}/eval", {"params": params})
+            if submitted["_status"] != 202:
+                raise GeneralException(message=f"Submission failed: {submitted}")
+            wait_result(url, submitted["job"])
+            return time.perf_counter() - start
+    else:
+        raise GeneralException(message=f"Unknown request kind {kind}, expected 'verify' or 'eval'")
+
+    latencies, failures = [], 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(send, i) for i in range(requests)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                failures += 1
+    duration = time.perf_counter() - start
+    if not latencies:
+        raise GeneralException(message=f"All the {requests} requests failed")
+    return {"requests": requests, "failures": failures, "duration": duration, "throughput": len(latencies) / duration,
+            "mean_ms": 1e3 * sum(latencies) / len(latencies), "p50_ms": 1e3 * percentile(latencies, 50),
+            "p99_ms": 1e3 * percentile(latencies, 99), "max_ms": 1e3 * max(latencies)}
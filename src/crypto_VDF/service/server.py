@@ -0,0 +1,301 @@
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+from typing import Deque, Dict, List, Optional, Tuple, Type, Union
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException, JobQueueFull
+from crypto_VDF.data_transfer_objects.dto import EvalResponse, JobStatus, PublicParams, RsaSetup
+from crypto_VDF.utils.logger import get_logger
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+from crypto_VDF.verifiable_delay_functions.vdf import VDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
+
+_log = get_logger(__name__)
+
+SCHEMES: Dict[str, Type[VDF]] = {PietrzakVDF.name: PietrzakVDF, WesolowskiVDF.name: WesolowskiVDF}
+# number of finished jobs kept for the status and result endpoints
+MAX_FINISHED_JOBS = 10000
+
+
+def parse_param_set(name: str) -> Tuple[Type[VDF], int, int]:
+    """
+    Args:
+        name: parameter set 'scheme:security_param:delay', e.g. 'wesolowski:2048:1048576'
+    Returns:
+        VDF class, security parameter and delay
+    Raises:
+        GeneralException if the name is not a parameter set
+    """
+    try:
+        scheme, security_param, delay = name.split(":")
+        return SCHEMES[scheme], int(security_param), int(delay)
+    except (KeyError, ValueError):
+        raise GeneralException(message=f"Invalid parameter set {name}, expected scheme:security_param:delay with "
+                                       f"scheme in {list(SCHEMES)}")
+
+
+def _service_eval(vdf: Type[VDF], setup: Union[PublicParams, RsaSetup], input_param: int) -> EvalResponse:
+    response = vdf.eval(setup, input_param, _hide=True)
+    response.input_param = input_param
+    return response
+
+
+def _as_int(value, name: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise GeneralException(message=f"Invalid {name} {value!r}, expected an integer")
+    return value
+
+
+class VerifyBatcher:
+    """
+    Verification of the requests of one parameter set: the requests arriving within window seconds of each other
+    are verified together by verify_batch. The first request of a batch waits for the window, then verifies the
+    batch for all the requests, which get their own results back.
+    """
+
+    def __init__(self, vdf: Type[VDF], setup: Union[PublicParams, RsaSetup], window: float = 0.002,
+                 max_batch: int = 256):
+        self.vdf = vdf
+        self.setup = setup
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._pending: List[dict] = []
+        self._collecting = False
+
+    def _check_triples(self, triples: List[Tuple[int, int, Union[List[int], int]]]) \
+            -> List[Tuple[int, int, Union[List[int], int]]]:
+        """
+        Check the triples of a request before it joins a batch, so that a malformed request fails on its own
+
+        Returns:
+            triples (x, y, proof) with integer x and y, and a list of integers (Pietrzak) or an integer as proof
+        Raises:
+            GeneralException if a triple is malformed
+        """
+        checked = []
+        for triple in triples:
+            if not isinstance(triple, (list, tuple)) or len(triple) != 3:
+                raise GeneralException(message=f"Invalid triple {triple!r}, expected (x, y, proof)")
+            x, y, proof = triple
+            if issubclass(self.vdf, PietrzakVDF):
+                if not isinstance(proof, (list, tuple)):
+                    raise GeneralException(message=f"Invalid proof {proof!r}, expected a list of integers")
+                proof = [_as_int(item, "proof item") for item in proof]
+            else:
+                proof = _as_int(proof, "proof")
+            checked.append((_as_int(x, "input"), _as_int(y, "output"), proof))
+        return checked
+
+    def verify(self, triples: List[Tuple[int, int, Union[List[int], int]]]) -> List[bool]:
+        """
+        Raises:
+            GeneralException if a triple of the request is malformed
+        """
+        item = {"triples": self._check_triples(triples), "results": None, "error": None, "done": threading.Event()}
+        with self._lock:
+            self._pending.append(item)
+            leader = not self._collecting
+            self._collecting = True
+            if sum(len(pending["triples"]) for pending in self._pending) >= self.max_batch:
+                self._full.set()
+        if leader:
+            self._full.wait(timeout=self.window)
+            with self._lock:
+                batch, self._pending, self._collecting = self._pending, [], False
+                self._full.clear()
+            self._run(batch)
+        item["done"].wait()
+        if item["error"] is not None:
+            raise item["error"]
+        return item["results"]
+
+    def _run(self, batch: List[dict]) -> None:
+        try:
+            triples = [triple for item in batch for triple in item["triples"]]
+            try:
+                results = self.vdf.verify_batch(self.setup, triples, _hide=True).results
+                _log.debug(f"[SERVICE] Verified a batch of {len(triples)} proofs from {len(batch)} requests")
+                start = 0
+                for item in batch:
+                    item["results"] = results[start:start + len(item["triples"])]
+                    start += len(item["triples"])
+            except Exception as exc:
+                # one request should not fail the others: each request is verified alone
+                _log.warning(f"[SERVICE] The batch of {len(batch)} requests failed ({exc}), verifying them one by one")
+                for item in batch:
+                    try:
+                        item["results"] = self.vdf.verify_batch(self.setup, item["triples"], _hide=True).results
+                    except Exception as item_exc:
+                        item["error"] = item_exc
+        finally:
+            for item in batch:
+                item["done"].set()
+
+
+class VDFService:
+    """
+    Evaluation and verification service: the parameter sets are set up once, the eval jobs are queued on a pool of
+    worker processes, and the verifications are answered inline, batched by parameter set.
+    """
+
+    def __init__(self, param_sets: List[str], workers: int = None, store: ParameterStore = None,
+                 max_queued: int = 1024, verify_window: float = 0.002):
+        """
+        Args:
+            param_sets: parameter sets 'scheme:security_param:delay'
+            workers: number of processes evaluating the jobs (number of CPUs if None)
+            store: parameter store of the moduli (default store if None)
+            max_queued: maximum number of unfinished jobs
+            verify_window: number of seconds a verification waits for others to be batched with
+        """
+        store = store or ParameterStore()
+        self.params: Dict[str, Tuple[Type[VDF], Union[PublicParams, RsaSetup]]] = {}
+        self.batchers: Dict[str, VerifyBatcher] = {}
+        for name in param_sets:
+            vdf, security_param, delay = parse_param_set(name)
+            setup = store.setup(vdf=vdf, security_param=security_param, delay=delay)
+            self.params[name] = (vdf, setup)
+            self.batchers[name] = VerifyBatcher(vdf=vdf, setup=setup, window=verify_window)
+            _log.info(f"[SERVICE] Loaded the parameter set {name}")
+        self.max_queued = max_queued
+        self._pool = Pool(processes=workers)
+        self._jobs: Dict[str, JobStatus] = {}
+        self._finished: Deque[str] = deque()
+        self._queued = 0
+        self._lock = threading.Lock()
+
+    def param_set(self, name: str) -> Tuple[Type[VDF], Union[PublicParams, RsaSetup]]:
+        if name not in self.params:
+            raise GeneralException(message=f"Unknown parameter set {name}")
+        return self.params[name]
+
+    def submit(self, name: str, input_param: int = None) -> JobStatus:
+        """
+        Queue the evaluation of the input (generated if None) under the parameter set
+
+        Raises:
+            GeneralException if the parameter set is unknown
+            JobQueueFull if max_queued jobs are not finished
+        """
+        vdf, setup = self.param_set(name)
+        if input_param is None:
+            input_param = vdf.gen(setup)
+        with self._lock:
+            if self._queued >= self.max_queued:
+                raise JobQueueFull(message=f"The job queue is full ({self.max_queued} jobs)")
+            job = JobStatus(job=uuid.uuid4().hex, params=name, input_param=input_param, status="queued",
+                            submitted=time.time())
+            self._jobs[job.job] = job
+            self._queued += 1
+            submitted = job.copy()
+        self._pool.apply_async(_service_eval, (vdf, setup, input_param),
+                               callback=lambda response: self._finish(job.job, result=response),
+                               error_callback=lambda exc: self._finish(job.job, error=f"{type(exc).__name__}: {exc}"))
+        return submitted
+
+    def _finish(self, job_id: str, result: EvalResponse = None, error: str = None) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.status, job.result, job.error = ("done" if error is None else "failed"), result, error
+            job.finished = time.time()
+            self._queued -= 1
+            self._finished.append(job_id)
+            while len(self._finished) > MAX_FINISHED_JOBS:
+                del self._jobs[self._finished.popleft()]
+
+    def job(self, job_id: str) -> Optional[JobStatus]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.copy() if job is not None else None
+
+    def verify(self, name: str, triples: List[Tuple[int, int, Union[List[int], int]]]) -> List[bool]:
+        self.param_set(name)
+        return self.batchers[name].verify(triples)
+
+    def close(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
+
+
+class VDFRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of the service:
+        GET /params: public parameters of the parameter sets
+        POST /eval {"params", "x" (optional)}: queue an eval job, answers 202 with the job status
+        GET /jobs/<id>: status of the job, GET /jobs/<id>/result: result of the job (202 while not finished)
+        POST /verify {"params", "x", "y", "proof"} or {"params", "items": [{"x", "y", "proof"}, ...]}: validity
+    """
+    service: VDFService = None
+
+    def log_message(self, format, *args):
+        _log.debug(f"[SERVICE] {self.address_string()} {format % args}")
+
+    def send_json(self, status: HTTPStatus, body: Union[dict, str]) -> None:
+        content = (body if isinstance(body, str) else json.dumps(body)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts == ["params"]:
+            self.send_json(HTTPStatus.OK, {name: json.loads(setup.json()) for name, (_, setup) in
+                                           self.service.params.items()})
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and parts[2:] in ([], ["result"]):
+            job = self.service.job(parts[1])
+            if job is None:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown job {parts[1]}"})
+            elif len(parts) == 2:
+                self.send_json(HTTPStatus.OK, job.json(exclude={"result"}))
+            elif job.status == "done":
+                self.send_json(HTTPStatus.OK, job.result.json())
+            elif job.status == "failed":
+                self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": job.error})
+            else:
+                self.send_json(HTTPStatus.ACCEPTED, job.json(exclude={"result"}))
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            body = self.read_json()
+            if self.path == "/eval":
+                job = self.service.submit(name=body.get("params"), input_param=body.get("x"))
+                self.send_json(HTTPStatus.ACCEPTED, job.json(exclude={"result"}))
+            elif self.path == "/verify":
+                items = body["items"] if "items" in body else [body]
+                results = self.service.verify(name=body.get("params"),
+                                              triples=[(item["x"], item["y"], item["proof"]) for item in items])
+                self.send_json(HTTPStatus.OK, {"results": results} if "items" in body else {"valid": results[0]})
+            else:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+        except JobQueueFull as exc:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)})
+        except GeneralException as exc:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+        except (KeyError, TypeError, ValueError) as exc:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": f"Invalid request: {exc}"})
+
+
+def make_server(service: VDFService, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """
+    HTTP server of the service (port 0 picks a free port, given by server.server_address)
+    """
+    handler = type("BoundVDFRequestHandler", (VDFRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
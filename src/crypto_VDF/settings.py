@@ -1,5 +1,15 @@
 import logging
+import os
 
 log_level = logging.INFO
 
 logging.basicConfig(level=log_level)
+
+# Big-integer arithmetic backend: 'auto' (gmpy2 when installed), 'gmpy2' or 'int'
+arithmetic_backend = os.environ.get("CRYPTO_VDF_BACKEND", "auto")
+
+# Modular reduction of the squaring chains and exponentiations: 'native', 'montgomery' or 'barrett'
+modular_reduction = os.environ.get("CRYPTO_VDF_REDUCTION", "native")
+
+# Directory of the parameter store (data/parameters of the repository if not set)
+parameter_store_path = os.environ.get("CRYPTO_VDF_PARAMETER_STORE")
@@ -0,0 +1,94 @@
+import math
+from typing import Union
+
+from crypto_VDF import settings
+from crypto_VDF.custom_errors.custom_exceptions import BackendNotAvailable
+
+try:
+    import gmpy2
+except ImportError:  # pragma: no cover - depends on the environment
+    gmpy2 = None
+
+
+class ArithmeticBackend:
+    """
+    Big-integer arithmetic on builtin Python ints.
+    Backends convert the inputs of the hot paths with mpz and the outputs back with to_int, so that the results are
+    builtin ints whatever the backend.
+    """
+    name = "int"
+
+    @staticmethod
+    def mpz(x: int) -> int:
+        return int(x)
+
+    @staticmethod
+    def to_int(x) -> int:
+        return int(x)
+
+    @staticmethod
+    def powmod(a, exponent: int, n):
+        return pow(a, exponent, n)
+
+    @staticmethod
+    def gcd(a, b):
+        return math.gcd(a, b)
+
+    @staticmethod
+    def invert(a, n):
+        return pow(a, -1, n)
+
+
+class Gmpy2Backend(ArithmeticBackend):
+    """
+    Big-integer arithmetic on GMP integers (gmpy2 mpz)
+    """
+    name = "gmpy2"
+
+    @staticmethod
+    def mpz(x: int):
+        return gmpy2.mpz(x)
+
+    @staticmethod
+    def powmod(a, exponent: int, n):
+        return gmpy2.powmod(a, exponent, n)
+
+    @staticmethod
+    def gcd(a, b):
+        return gmpy2.gcd(a, b)
+
+    @staticmethod
+    def invert(a, n):
+        return gmpy2.invert(a, n)
+
+
+BACKENDS = {ArithmeticBackend.name: ArithmeticBackend, Gmpy2Backend.name: Gmpy2Backend}
+
+
+def gmpy2_available() -> bool:
+    return gmpy2 is not None
+
+
+def get_backend(backend: Union[str, ArithmeticBackend, None] = None) -> ArithmeticBackend:
+    """
+    Get an arithmetic backend
+
+    Args:
+        backend: backend name ('int', 'gmpy2' or 'auto'), backend instance or None for the default backend of the
+         settings. 'auto' selects gmpy2 when it is installed and builtin ints otherwise.
+    Returns:
+        arithmetic backend
+    Raises:
+        Raises BackendNotAvailable if the backend is unknown or not installed
+    """
+    if isinstance(backend, ArithmeticBackend):
+        return backend
+    if backend is None:
+        backend = settings.arithmetic_backend
+    if backend == "auto":
+        backend = Gmpy2Backend.name if gmpy2_available() else ArithmeticBackend.name
+    if backend not in BACKENDS:
+        raise BackendNotAvailable(message=f"Unknown arithmetic backend {backend}, available: {list(BACKENDS)}")
+    if backend == Gmpy2Backend.name and not gmpy2_available():
+        raise BackendNotAvailable(message="gmpy2 is not installed")
+    return BACKENDS[backend]()
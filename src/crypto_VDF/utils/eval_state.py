@@ -0,0 +1,106 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Union
+
+from crypto_VDF.data_transfer_objects.dto import EvalState
+from crypto_VDF.utils.hash_to_prime import encode_integers
+from crypto_VDF.utils.logger import get_logger
+from crypto_VDF.utils.montgomery import ModulusContext
+from crypto_VDF.utils.utils import exp_modular, square_chain
+
+_log = get_logger(__name__)
+
+# number of squarings between two writes of the state
+SAVE_EVERY = 1 << 22
+
+
+def new_state(scheme: str, modulus: int, input_param: int, interval: int) -> EvalState:
+    """
+    State of an evaluation before the first squaring
+    """
+    return EvalState(scheme=scheme, modulus=modulus, input_param=input_param, step=0, value=input_param % modulus,
+                     interval=interval, checkpoints=[])
+
+
+def state_path(directory: Union[str, Path], state: EvalState) -> Path:
+    """
+    File of the state of (scheme, modulus, input): the states of the other delays of the same chain share the file
+    """
+    digest = hashlib.sha256(encode_integers(state.modulus, state.input_param)).hexdigest()[:32]
+    return Path(directory) / f"{state.scheme}_{digest}.json"
+
+
+def save_state(path: Path, state: EvalState) -> None:
+    """
+    Write the state atomically: the content is written and fsync'd to a temporary file, which then replaces the
+    previous state, and the directory is fsync'd so that the replacement survives a crash
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w") as file:
+        file.write(state.json())
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        directory = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def load_state(path: Path, state: EvalState) -> EvalState:
+    """
+    Args:
+        path: file of the state
+        state: new state of the evaluation
+    Returns:
+        the saved state if it exists and is a state of the same (scheme, modulus, input), otherwise state
+    """
+    if not path.is_file():
+        return state
+    saved = EvalState.parse_file(path)
+    if (saved.scheme, saved.modulus, saved.input_param) != (state.scheme, state.modulus, state.input_param):
+        _log.warning(f"[EVAL-STATE] {path} is the state of another evaluation, starting from the input")
+        return state
+    _log.info(f"[EVAL-STATE] Resuming from step {saved.step} of {path}")
+    return saved
+
+
+def advance_state(state: EvalState, steps: int, context: ModulusContext, path: Path = None,
+                  save_every: int = SAVE_EVERY) -> EvalState:
+    """
+    Square the value of the state up to the step steps, storing the checkpoints x^{2^(j * interval)} on the way.
+    The state is advanced in place (the checkpoints are appended to its list), so a caller keeping the previous
+    state copies it first. If the state is already further, a new state is brought back to the step from its
+    checkpoints.
+
+    Args:
+        state: state of the evaluation
+        steps: number of squarings to reach
+        context: arithmetic context of the modulus
+        path: file where the state is written every save_every squarings and at the end (not written if None)
+        save_every: number of squarings between two writes
+    Returns:
+        state at the step steps, with the checkpoints x^{2^(j * interval)} for j * interval < steps
+    """
+    if state.step > steps:
+        checkpoint = (steps // state.interval) * state.interval
+        value = exp_modular(a=state.checkpoints[checkpoint // state.interval], exponent=1 << (steps - checkpoint),
+                            n=state.modulus, context=context)
+        return state.copy(update={"step": steps, "value": value,
+                                  "checkpoints": state.checkpoints[:-(-steps // state.interval)]})
+    while state.step < steps:
+        target = min(steps, state.step + save_every)
+        first = -(-state.step // state.interval) * state.interval
+        value, checkpoints = square_chain(a=state.value, steps=target - state.step, n=state.modulus,
+                                          checkpoints=[i - state.step for i in range(first, target, state.interval)],
+                                          context=context)
+        state.checkpoints.extend(int(item) for item in checkpoints)
+        state.step, state.value = target, int(value)
+        if path is not None:
+            save_state(path=path, state=state)
+            _log.debug(f"[EVAL-STATE] Saved step {state.step} in {path}")
+    return state
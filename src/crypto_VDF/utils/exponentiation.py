@@ -0,0 +1,164 @@
+from typing import Callable, List
+
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
+
+
+def optimal_window(bits: int) -> int:
+    """
+    Window size minimising the number of multiplications of the sliding-window exponentiation
+
+    Args:
+        bits: bit length of the exponent
+    Returns:
+        window size
+    """
+    for window, max_bits in enumerate([8, 24, 80, 240, 672, 1792], start=1):
+        if bits <= max_bits:
+            return window
+    return 7
+
+
+def sliding_window_exp(a, exponent: int, n: int = None, window: int = None,
+                       multiply: Callable = None, one=None):
+    """
+    Left-to-right sliding-window exponentiation, for the arithmetic that does not have a native modular
+    exponentiation (e.g. values kept in Montgomery form). Only the odd powers a, a^3, ..., a^{2^window - 1} are
+    pre-calculated.
+
+    Args:
+        a: number to exponentiate
+        exponent: non-negative exponent
+        n: modulus, used when multiply is not given
+        window: window size (default depending on the size of the exponent)
+        multiply: multiplication of two values (default multiplication modulo n)
+        one: neutral element of the multiplication (default 1 % n)
+    Returns:
+        a^exponent
+    """
+    if multiply is None:
+        def multiply(u, v):
+            return (u * v) % n
+    if exponent == 0:
+        return 1 % n if one is None else one
+    if window is None:
+        window = optimal_window(exponent.bit_length())
+    a_2 = multiply(a, a)
+    odd_powers = [a]
+    for _ in range((1 << (window - 1)) - 1):
+        odd_powers.append(multiply(odd_powers[-1], a_2))
+
+    result = None
+    i = exponent.bit_length() - 1
+    while i >= 0:
+        if not (exponent >> i) & 1:
+            result = multiply(result, result)
+            i -= 1
+            continue
+        j = max(i - window + 1, 0)
+        while not (exponent >> j) & 1:
+            j += 1
+        value = (exponent >> j) & ((1 << (i - j + 1)) - 1)
+        if result is None:
+            result = odd_powers[value >> 1]
+        else:
+            for _ in range(i - j + 1):
+                result = multiply(result, result)
+            result = multiply(result, odd_powers[value >> 1])
+        i = j - 1
+    return result
+
+
+class FixedBaseExp:
+    """
+    Fixed-base exponentiation with a pre-calculated table base^{d * 2^(window * i)}, for a base that is exponentiated
+    many times modulo the same n. An exponentiation then costs about max_bits / window multiplications and no
+    squaring.
+    """
+
+    def __init__(self, base: int, n: int, max_bits: int, window: int = 4, backend: ArithmeticBackend = None):
+        """
+        Args:
+            base: base of the exponentiations
+            n: modulus
+            max_bits: maximum bit length of the exponents covered by the table
+            window: number of bits of the exponent consumed per multiplication
+            backend: arithmetic backend (default backend of the settings if None)
+        """
+        self.backend = get_backend(backend)
+        self.n = self.backend.mpz(n)
+        self.base = self.backend.mpz(base) % self.n
+        self.window = window
+        self.max_bits = max_bits
+        self.table: List[List[int]] = []
+        power = self.base
+        for _ in range(-(-max_bits // window)):
+            row = [1 % self.n, power]
+            for _ in range((1 << window) - 2):
+                row.append((row[-1] * power) % self.n)
+            self.table.append(row)
+            power = (row[-1] * power) % self.n
+
+    def exp(self, exponent: int) -> int:
+        """
+        Args:
+            exponent: non-negative exponent
+        Returns:
+            base^exponent (mod n), falling back to the modular exponentiation of the backend if the exponent is
+             larger than max_bits
+        """
+        if exponent.bit_length() > self.max_bits:
+            return self.backend.to_int(self.backend.powmod(self.base, exponent, self.n))
+        mask = (1 << self.window) - 1
+        result = 1 % self.n
+        for row in self.table:
+            if exponent == 0:
+                break
+            digit = exponent & mask
+            if digit:
+                result = (result * row[digit]) % self.n
+            exponent >>= self.window
+        return self.backend.to_int(result)
+
+
+def multi_exp(bases: List[int], exponents: List[int], n: int, window: int = None,
+              backend: ArithmeticBackend = None) -> int:
+    """
+    Simultaneous multi-exponentiation (Shamir/Straus trick with interleaved windows): the exponents are read window
+    by window from the top, and a single chain of squarings, done window-wise by the native modular exponentiation,
+    is shared by all the bases. prod_i bases_i^{exponents_i} then costs max(exponents).bit_length() squarings plus
+    one multiplication per non-zero window digit, instead of one chain of squarings per base.
+
+    Args:
+        bases: numbers to exponentiate
+        exponents: non-negative exponents, one per base
+        n: modulus
+        window: window size (default minimising the table and multiplication costs)
+        backend: arithmetic backend (default backend of the settings if None)
+    Returns:
+        prod_i bases_i^{exponents_i} (mod n)
+    """
+    backend = get_backend(backend)
+    n = backend.mpz(n)
+    bits = max((exponent.bit_length() for exponent in exponents), default=0)
+    if bits == 0:
+        return backend.to_int(1 % n)
+    if window is None:
+        window = min(range(1, 9), key=lambda w: len(bases) * ((1 << w) + bits / w))
+    tables = []
+    for base in bases:
+        table = [1 % n, backend.mpz(base) % n]
+        for _ in range((1 << window) - 2):
+            table.append((table[-1] * table[1]) % n)
+        tables.append(table)
+
+    mask = (1 << window) - 1
+    shift = ((bits - 1) // window) * window
+    result = 1 % n
+    while shift >= 0:
+        result = backend.powmod(result, 1 << window, n)
+        for table, exponent in zip(tables, exponents):
+            digit = (exponent >> shift) & mask
+            if digit:
+                result = (result * table[digit]) % n
+        shift -= window
+    return backend.to_int(result)
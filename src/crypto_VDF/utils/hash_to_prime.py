@@ -0,0 +1,201 @@
+import hashlib
+import math
+from functools import lru_cache
+from typing import List
+
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
+
+HASH_BITS = 256
+SIEVE_BOUND = 2000
+# Miller-Rabin with the first 13 prime bases is deterministic below this bound
+DETERMINISTIC_MR_BOUND = 3317044064679887385961981
+DETERMINISTIC_MR_BASES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+
+def small_primes(bound: int = SIEVE_BOUND) -> List[int]:
+    """
+    Args:
+        bound: exclusive upper bound
+    Returns:
+        primes smaller than bound (sieve of Eratosthenes)
+    """
+    sieve = bytearray([1]) * bound
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(bound - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytearray(len(range(p * p, bound, p)))
+    return [p for p in range(bound) if sieve[p]]
+
+
+SMALL_PRIMES = small_primes()
+
+
+def strong_probable_prime(n: int, base: int, backend: ArithmeticBackend = None) -> bool:
+    """
+    Miller-Rabin round: strong probable prime test of the odd n > 2 to the base
+    """
+    backend = get_backend(backend)
+    n = backend.mpz(n)
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = backend.powmod(backend.mpz(base), d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = (x * x) % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def jacobi(a: int, n: int) -> int:
+    """
+    Jacobi symbol (a/n) for an odd positive n
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def strong_lucas_probable_prime(n: int, backend: ArithmeticBackend = None) -> bool:
+    """
+    Strong Lucas probable prime test of the odd n > 2 that is not a perfect square, with the parameters of Selfridge:
+    D is the first of 5, -7, 9, -11, ... with (D/n) = -1, P = 1 and Q = (1 - D) / 4
+    """
+    d = 5
+    while True:
+        symbol = jacobi(d, n)
+        if symbol == -1:
+            break
+        if symbol == 0 and abs(d) != n:
+            return False
+        d = -d - 2 if d > 0 else -d + 2
+    p, q = 1, (1 - d) // 4
+    k, s = n + 1, 0
+    while k % 2 == 0:
+        k //= 2
+        s += 1
+
+    def halve(x):
+        return (x + n if x % 2 else x) // 2 % n
+
+    # U_k, V_k and Q^k with the binary expansion of k
+    n = get_backend(backend).mpz(n)
+    u, v, q_k = 1, p, q % n
+    for bit in bin(k)[3:]:
+        u, v, q_k = (u * v) % n, (v * v - 2 * q_k) % n, (q_k * q_k) % n
+        if bit == "1":
+            u, v = halve(p * u + v), halve(d * u + p * v)
+            q_k = (q_k * q) % n
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v, q_k = (v * v - 2 * q_k) % n, (q_k * q_k) % n
+        if v == 0:
+            return True
+    return False
+
+
+def probable_prime(n: int, backend: ArithmeticBackend = None) -> bool:
+    """
+    Primality test of an n > SIEVE_BOUND without small prime factors: deterministic Miller-Rabin below
+    DETERMINISTIC_MR_BOUND and Baillie-PSW (Miller-Rabin to the base 2 and strong Lucas test) above, for which no
+    counterexample is known
+    """
+    if n < SIEVE_BOUND ** 2:
+        return True
+    if n < DETERMINISTIC_MR_BOUND:
+        return all(strong_probable_prime(n, base, backend=backend) for base in DETERMINISTIC_MR_BASES)
+    if not strong_probable_prime(n, 2, backend=backend):
+        return False
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return strong_lucas_probable_prime(n, backend=backend)
+
+
+def is_prime(n: int, backend: ArithmeticBackend = None) -> bool:
+    """
+    Primality test: trial division by the small primes, then probable_prime
+
+    Args:
+        n: number to test
+        backend: arithmetic backend of the probable prime tests (default backend of the settings if None)
+    Returns:
+        True if n is prime
+    """
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    return probable_prime(n, backend=backend)
+
+
+def next_prime(candidate: int, window: int = None, backend: ArithmeticBackend = None) -> int:
+    """
+    Smallest prime larger than or equal to the candidate. The candidates are sieved by windows: the multiples of the
+    small primes are crossed out, and only the remaining candidates are tested with probable_prime.
+
+    Args:
+        candidate: lower bound of the prime
+        window: number of candidates sieved at once (default proportional to the bit length)
+        backend: arithmetic backend of the primality tests (default backend of the settings if None)
+    Returns:
+        smallest prime >= candidate
+    """
+    if candidate <= SMALL_PRIMES[-1]:
+        return next(p for p in SMALL_PRIMES if p >= candidate)
+    if window is None:
+        window = max(64, 4 * candidate.bit_length())
+    start = candidate
+    while True:
+        sieve = bytearray([1]) * window
+        for p in SMALL_PRIMES:
+            sieve[(-start) % p::p] = bytearray(len(range((-start) % p, window, p)))
+        for offset in range(window):
+            if sieve[offset] and probable_prime(start + offset, backend=backend):
+                return start + offset
+        start += window
+
+
+def encode_integers(*values: int) -> bytes:
+    """
+    Byte encoding of non-negative integers: each integer is big-endian, prefixed by its byte length on 8 bytes
+    """
+    encoding = b""
+    for value in values:
+        value_bytes = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+        encoding += len(value_bytes).to_bytes(8, "big") + value_bytes
+    return encoding
+
+
+@lru_cache(maxsize=1024)
+def hash_to_prime(g: int, y: int, security_param: int) -> int:
+    """
+    Hash (g, y) to a prime of 2 * security_param bits (at most 256 bits): the SHA-256 digest of the byte encoding of
+    the inputs gives a candidate with the top bit set, and the prime is the next prime after the candidate.
+    The primes are memoised on (g, y, security_param), so that the prover and the verifier running in the same
+    process compute each prime once.
+
+    Args:
+        g: input of the VDF
+        y: output of the VDF
+        security_param: security parameter lambda (256-bit prime if None)
+    Returns:
+        prime number l
+    """
+    bits = HASH_BITS if security_param is None else max(2, min(2 * security_param, HASH_BITS))
+    digest = hashlib.sha256(b"crypto-VDF/wesolowski" + encode_integers(bits, int(g), int(y))).digest()
+    candidate = (int.from_bytes(digest, "big") >> (HASH_BITS - bits)) | (1 << (bits - 1))
+    return next_prime(candidate)
@@ -0,0 +1,196 @@
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
+from crypto_VDF.utils.exponentiation import sliding_window_exp
+from crypto_VDF.utils.number_theory import NumberTheory
+
+# maximum number of squarings per modular exponentiation a^{2^block} of the native squaring chains
+SQUARING_BLOCK = 1024
+
+
+class ModulusContext:
+    """
+    Arithmetic bound to a fixed modulus n. The values are converted once to the internal representation of the
+    context, kept in that representation along a whole squaring chain or exponentiation, and converted back only at
+    the checkpoints and at the output.
+    This base context keeps the plain residues and uses the native reduction of the backend.
+    """
+    name = "native"
+
+    def __init__(self, n: int, backend: ArithmeticBackend = None):
+        self.backend = get_backend(backend)
+        self.n = self.backend.mpz(n)
+        self.one = self.to_internal(1)
+
+    def to_internal(self, x: int):
+        return self.backend.mpz(x) % self.n
+
+    def from_internal(self, x):
+        return x % self.n
+
+    def multiply(self, a, b):
+        return (a * b) % self.n
+
+    def square(self, a):
+        return (a * a) % self.n
+
+    def square_steps(self, a, steps: int, block: int = SQUARING_BLOCK):
+        """
+        Square steps times a value in the internal representation, by modular exponentiations a^{2^block} so that
+        the exponent stays small whatever the number of steps
+        """
+        while steps > 0:
+            k = min(block, steps)
+            a = self.backend.powmod(a, 1 << k, self.n)
+            steps -= k
+        return a
+
+    def square_chain(self, a: int, steps: int, checkpoints: Iterable[int] = (), normalise: bool = False,
+                     block: int = SQUARING_BLOCK) -> Tuple[int, List[int]]:
+        """
+        Squaring chain a, a^2, ..., a^{2^steps} kept in the internal representation
+
+        Args:
+            a: number to square
+            steps: number of squarings
+            checkpoints: increasing indices i <= steps at which to return a^{2^i}
+            normalise: map the checkpoints and the output to QR_N^+ (absolute value min(x, n - x)), except a itself
+            block: maximum number of squarings per modular exponentiation (native reduction)
+        Returns:
+            a^{2^steps} (mod n) and the list of a^{2^i} (mod n) for i in checkpoints, as numbers of the backend
+        """
+        c = self.to_internal(a)
+        values = []
+        i = 0
+        for target in list(checkpoints) + [steps]:
+            if target < i or target > steps:
+                raise ValueError(f"Checkpoint {target} is not in [{i}, {steps}]")
+            c = self.square_steps(c, target - i, block=block)
+            value = self.from_internal(c)
+            if normalise and target > 0:
+                value = NumberTheory.modular_abs(value, self.n)
+            values.append(value)
+            i = target
+        return self.backend.to_int(values.pop()), values
+
+    def exp(self, a: int, exponent: int) -> int:
+        """
+        Args:
+            a: number to exponentiate
+            exponent: non-negative exponent
+        Returns:
+            a^exponent (mod n)
+        """
+        return self.backend.to_int(self.backend.powmod(self.backend.mpz(a), exponent, self.n))
+
+
+class MontgomeryContext(ModulusContext):
+    """
+    Montgomery arithmetic: x is represented by x * R (mod n) with R = 2^k > 4n, and a product is reduced with
+    REDC, i.e. with masks, shifts and multiplications instead of a division by n. With R > 4n the values stay below
+    2n without any conditional subtraction.
+    """
+    name = "montgomery"
+
+    def __init__(self, n: int, backend: ArithmeticBackend = None):
+        if n % 2 == 0:
+            raise GeneralException(message=f"Montgomery arithmetic needs an odd modulus, got {n}")
+        backend = get_backend(backend)
+        self.k = int(n).bit_length() + 2
+        self.mask = backend.mpz((1 << self.k) - 1)
+        self.n_prime = backend.mpz((-pow(int(n), -1, 1 << self.k)) & ((1 << self.k) - 1))
+        super().__init__(n=n, backend=backend)
+
+    def redc(self, t):
+        return (t + (((t & self.mask) * self.n_prime) & self.mask) * self.n) >> self.k
+
+    def to_internal(self, x: int):
+        return (self.backend.mpz(x) << self.k) % self.n
+
+    def from_internal(self, x):
+        return self.redc(x) % self.n
+
+    def multiply(self, a, b):
+        return self.redc(a * b)
+
+    def square(self, a):
+        return self.redc(a * a)
+
+    def square_steps(self, a, steps: int, block: int = SQUARING_BLOCK):
+        n, k, mask, n_prime = self.n, self.k, self.mask, self.n_prime
+        for _ in range(steps):
+            t = a * a
+            a = (t + (((t & mask) * n_prime) & mask) * n) >> k
+        return a
+
+    def exp(self, a: int, exponent: int) -> int:
+        result = sliding_window_exp(a=self.to_internal(a), exponent=exponent, multiply=self.multiply, one=self.one)
+        return self.backend.to_int(self.from_internal(result))
+
+
+class BarrettContext(ModulusContext):
+    """
+    Barrett arithmetic: the residues are plain, and a product t < n^2 is reduced with the pre-calculated
+    mu = floor(4^k / n) as t - floor(floor(t / 2^(k-1)) * mu / 2^(k+1)) * n, followed by at most two subtractions
+    """
+    name = "barrett"
+
+    def __init__(self, n: int, backend: ArithmeticBackend = None):
+        backend = get_backend(backend)
+        self.k = int(n).bit_length()
+        self.mu = backend.mpz((1 << (2 * self.k)) // int(n))
+        super().__init__(n=n, backend=backend)
+
+    def reduce(self, t):
+        r = t - (((t >> (self.k - 1)) * self.mu) >> (self.k + 1)) * self.n
+        while r >= self.n:
+            r -= self.n
+        return r
+
+    def multiply(self, a, b):
+        return self.reduce(a * b)
+
+    def square(self, a):
+        return self.reduce(a * a)
+
+    def square_steps(self, a, steps: int, block: int = SQUARING_BLOCK):
+        n, k, mu = self.n, self.k, self.mu
+        for _ in range(steps):
+            t = a * a
+            a = t - (((t >> (k - 1)) * mu) >> (k + 1)) * n
+            while a >= n:
+                a -= n
+        return a
+
+    def exp(self, a: int, exponent: int) -> int:
+        result = sliding_window_exp(a=self.to_internal(a), exponent=exponent, multiply=self.multiply, one=self.one)
+        return self.backend.to_int(self.from_internal(result))
+
+
+CONTEXTS = {context.name: context for context in [ModulusContext, MontgomeryContext, BarrettContext]}
+
+
+@lru_cache(maxsize=32)
+def _cached_context(n: int, reduction: str, backend_name: str) -> ModulusContext:
+    return CONTEXTS[reduction](n=n, backend=get_backend(backend_name))
+
+
+def get_modulus_context(n: int, reduction: str = ModulusContext.name, backend: ArithmeticBackend = None) \
+        -> ModulusContext:
+    """
+    Get the arithmetic context of the modulus n, created once per modulus, reduction and backend
+
+    Args:
+        n: modulus
+        reduction: 'native', 'montgomery' or 'barrett'
+        backend: arithmetic backend (default backend of the settings if None)
+    Returns:
+        arithmetic context
+    Raises:
+        Raises GeneralException if the reduction is unknown
+    """
+    if reduction not in CONTEXTS:
+        raise GeneralException(message=f"Unknown reduction {reduction}, available: {list(CONTEXTS)}")
+    return _cached_context(int(n), reduction, get_backend(backend).name)
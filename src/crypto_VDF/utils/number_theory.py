@@ -1,27 +1,25 @@
 import random
 
 from crypto_VDF.custom_errors.custom_exceptions import QuadraticResidueFailed, CoPrimeException
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
 
 
 class NumberTheory:
 
     @staticmethod
-    def gcd(a: int, b: int) -> int:
+    def gcd(a: int, b: int, backend: ArithmeticBackend = None) -> int:
         """
-        Euclidian algorithm to find the Greatest Common Divisor
+        Greatest Common Divisor
 
         Args:
             a:
             b:
+            backend: arithmetic backend (default backend of the settings if None)
         Returns:
             gcd of a and b
         """
-        r = a % b
-        while r != 0:
-            x = b
-            b = r
-            r = x % b
-        return b
+        backend = get_backend(backend)
+        return backend.to_int(backend.gcd(backend.mpz(a), backend.mpz(b)))
 
     @classmethod
     def check_quadratic_residue(cls, x, modulus) -> bool:
@@ -63,12 +61,13 @@ class NumberTheory:
         return min(x, n - x)
 
     @classmethod
-    def multiply(cls, u: int, v: int, n: int):
-        x = (u * v) % n
-        return NumberTheory.modular_abs(x, n)
+    def multiply(cls, u: int, v: int, n: int, backend: ArithmeticBackend = None):
+        backend = get_backend(backend)
+        x = (backend.mpz(u) * backend.mpz(v)) % backend.mpz(n)
+        return backend.to_int(NumberTheory.modular_abs(x, n))
 
     @classmethod
-    def modular_inverse(cls, a: int, n: int) -> int:
+    def modular_inverse(cls, a: int, n: int, backend: ArithmeticBackend = None) -> int:
         """
         Modular inverse of a in modulo n.
         Find u such that a * u + n * v = 1
@@ -76,23 +75,13 @@ class NumberTheory:
         Args:
             a: integer of which to calculate the modular inverse
             n: modulus
+            backend: arithmetic backend (default backend of the settings if None)
         Returns:
-            modular inverse of a in modulo n
+            modular inverse of a in modulo n, in [0, n)
         Raises:
             Raises CoPrimeException a and n are not co-primes
         """
-        if cls.gcd(a, n) != 1:
+        if cls.gcd(a, n, backend=backend) != 1:
             raise CoPrimeException(f"Integers {a} and {n} are not co-primes")
-        r_list = [a, n]
-        u = [1, 0]
-        v = [0, 1]
-        while r_list[-1] != 0:
-            # Only store the latests two values of u,v and r's
-            q = r_list[0] // r_list[1]
-            u_value = u[0] - q * u[1]
-            v_value = v[0] - q * v[1]
-            u = [u[1], u_value]
-            v = [v[1], v_value]
-            r = r_list[0] % r_list[1]
-            r_list = [r_list[1], r]
-        return u[-2]
+        backend = get_backend(backend)
+        return backend.to_int(backend.invert(backend.mpz(a), backend.mpz(n)))
@@ -1,10 +1,17 @@
+import random
 from random import randint
-from typing import Generator
+from typing import Generator, Tuple
 
 from crypto_VDF.custom_errors.custom_exceptions import PrimeNumberNotFound
 from crypto_VDF.data_transfer_objects.dto import KBitPrimeResponse
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
+from crypto_VDF.utils.hash_to_prime import SMALL_PRIMES, DETERMINISTIC_MR_BOUND, is_prime
 from crypto_VDF.utils.utils import exp_modular, base_to_10
 
+# Miller-Rabin rounds per bit length of the candidate (FIPS 186-4, appendix C.3), for an error probability below
+# 2^-100 on random candidates
+MR_ROUNDS = [(1536, 3), (1024, 4), (512, 7), (0, 40)]
+
 
 class PrimNumbers:
 
@@ -23,42 +30,43 @@ class PrimNumbers:
             yield randint(0, 1)
 
     @staticmethod
-    def robin_miller_test(n: int, t=100) -> bool:
+    def robin_miller_test(n: int, t=100, backend: ArithmeticBackend = None) -> bool:
         """
         Robin-Miller Test - probabilistic primality test
 
         :param t: repeat parameter of the Robin-Miller Test Test
         :param n: numbers to test
+        :param backend: arithmetic backend (default backend of the settings if None)
         :return: True if n is probable prime and False if it isn't a probable prime
         """
-        # d*2^s = n - 1
-        if (n == 0) or ((n % 2) == 0):
-            return False
-
-        if n == 3:
+        backend = get_backend(backend)
+        if n in (2, 3):
             return True
+        if n < 2 or (n % 2) == 0:
+            return False
 
-        power = 0
-        target = n - 1
-        while target % 2 == 0:
-            target //= 2
-            power += 1
+        # d*2^s = n - 1
+        d, s = n - 1, 0
+        while d % 2 == 0:
+            d //= 2
+            s += 1
 
         for _ in range(t):
             a = randint(2, n - 2)
-            x = exp_modular(a, (n - 1) // power, n)
-            y = 0
-            for _ in range(power):
-                y = exp_modular(x, 2, n)
-                if (y == 1) and (x != 1) and (x != (n - 1)):
-                    return False
-
-            if y != 1:
+            x = exp_modular(a, d, n, backend=backend)
+            if x == 1 or x == n - 1:
+                continue
+            for _ in range(s - 1):
+                x = exp_modular(x, 2, n, backend=backend)
+                if x == n - 1:
+                    break
+            else:
                 return False
         return True
 
     @classmethod
-    def k_bit_prim_number(cls, k, t: int = 100, max_iter: int = 10000) -> KBitPrimeResponse:
+    def k_bit_prim_number(cls, k, t: int = 100, max_iter: int = 10000, backend: ArithmeticBackend = None) \
+            -> KBitPrimeResponse:
         """
         Generate a k-bit prime number
 
@@ -68,6 +76,7 @@ class PrimNumbers:
             max_iter: maximum possible iterations allowed for succeeding to generate the prime number -
             default max_iter = 10000 to have a high probability of successfully generating the prime number
              for k <= 2000 bits
+            backend: arithmetic backend of the Robin-Miller Test
         Returns:
             KBitPrimeResponse(status: bool, base_10: int, base_2: list)
         Raises:
@@ -77,8 +86,85 @@ class PrimNumbers:
         while i < max_iter:
             k_bit_n = list(cls.k_bit_numer(k))
             base_10_n = base_to_10(k_bit_n, 2)
-            response = cls.robin_miller_test(n=base_10_n, t=t)
+            response = cls.robin_miller_test(n=base_10_n, t=t, backend=backend)
             if response:
                 return KBitPrimeResponse(base_10=base_10_n, base_2=k_bit_n)
             i += 1
         raise PrimeNumberNotFound
+
+    @staticmethod
+    def miller_rabin_rounds(k: int) -> int:
+        """
+        Args:
+            k: bit length of the candidates
+        Returns:
+            number of Miller-Rabin rounds for k-bit candidates
+        """
+        return next(rounds for bits, rounds in MR_ROUNDS if k >= bits)
+
+    @classmethod
+    def sieved_prime_number(cls, k: int, t: int = None, window: int = None, max_iter: int = 10000,
+                            backend: ArithmeticBackend = None, rng: random.Random = None) -> KBitPrimeResponse:
+        """
+        Generate a k-bit prime number: a random odd k-bit start is drawn with getrandbits, and the odd candidates of
+        the interval [start, start + 2 * window) are sieved with the table of small primes. Only the remaining
+        candidates go through the Robin-Miller Test, and the search moves to the next interval if none is prime.
+
+        Args:
+            k: length of bit of the prime number to generate
+            t: repeat parameter of the Robin-Miller Test (default depending on k, see MR_ROUNDS)
+            window: number of odd candidates sieved at once (default proportional to k)
+            max_iter: maximum number of candidates tested
+            backend: arithmetic backend of the Robin-Miller Test
+            rng: random generator (default module random)
+        Returns:
+            KBitPrimeResponse(base_10: int, base_2: list)
+        Raises:
+            Raises PrimeNumberNotFound if the k-bit prime number is not found
+        """
+        rng = random if rng is None else rng
+        if k < 2:
+            raise PrimeNumberNotFound
+        if (1 << k) <= DETERMINISTIC_MR_BOUND:
+            for _ in range(max_iter):
+                candidate = rng.getrandbits(k - 1) | (1 << (k - 1))
+                if is_prime(candidate, backend=backend):
+                    return KBitPrimeResponse(base_10=candidate, base_2=[int(item) for item in bin(candidate)[2:]])
+            raise PrimeNumberNotFound
+        if t is None:
+            t = cls.miller_rabin_rounds(k)
+        if window is None:
+            window = 2 * k
+        tested = 0
+        start = rng.getrandbits(k - 1) | (1 << (k - 1)) | 1
+        while tested < max_iter:
+            if start.bit_length() > k:
+                start = rng.getrandbits(k - 1) | (1 << (k - 1)) | 1
+            # sieve[i] stands for start + 2 * i, crossed out if divisible by a small (odd) prime
+            sieve = bytearray([1]) * window
+            for p in SMALL_PRIMES[1:]:
+                first = (-start * ((p + 1) // 2)) % p
+                sieve[first::p] = bytearray(len(range(first, window, p)))
+            for i in range(window):
+                candidate = start + 2 * i
+                if not sieve[i] or candidate.bit_length() > k:
+                    continue
+                tested += 1
+                if cls.robin_miller_test(n=candidate, t=t, backend=backend):
+                    return KBitPrimeResponse(base_10=candidate, base_2=[int(item) for item in bin(candidate)[2:]])
+            start += 2 * window
+        raise PrimeNumberNotFound
+
+    @classmethod
+    def seeded_prime_number(cls, args: Tuple[int, int, str]) -> KBitPrimeResponse:
+        """
+        sieved_prime_number with a random generator seeded by the caller, for the searches run in worker processes:
+        forked workers inherit the state of the module random, so each search gets its own seed
+
+        Args:
+            args: bit length k, seed of the random generator and name of the arithmetic backend
+        Returns:
+            KBitPrimeResponse(base_10: int, base_2: list)
+        """
+        k, seed, backend = args
+        return cls.sieved_prime_number(k=k, backend=backend, rng=random.Random(seed))
@@ -0,0 +1,52 @@
+import hashlib
+
+from crypto_VDF.utils.hash_to_prime import encode_integers
+
+HASH_BITS = 256
+
+
+class Transcript:
+    """
+    Fiat-Shamir transcript: the messages are fed as big-endian byte strings into an incremental SHA-256, and the
+    challenges are read from the digest of the messages absorbed so far.
+    The group elements take the byte size of the modulus, and the other integers (e.g. delays, of any size) are
+    prefixed by their byte length (encode_integers), so that the encoding is unambiguous without separators and
+    nothing is converted to strings.
+    """
+
+    def __init__(self, label: bytes, modulus: int):
+        """
+        Args:
+            label: domain separation label of the protocol
+            modulus: modulus of the group, absorbed first
+        """
+        self.modulus = modulus
+        self.element_size = max(1, (modulus.bit_length() + 7) // 8)
+        self._hash = hashlib.sha256()
+        self.append_integer(len(label))
+        self._hash.update(label)
+        self.append_integer(self.element_size)
+        self._hash.update(modulus.to_bytes(self.element_size, "big"))
+
+    def append_integer(self, value: int) -> None:
+        """
+        Absorb a non-negative integer (e.g. a delay), prefixed by its byte length
+        """
+        self._hash.update(encode_integers(value))
+
+    def append_element(self, value: int) -> None:
+        """
+        Absorb a group element, reduced modulo the modulus, on the byte size of the modulus
+        """
+        self._hash.update((int(value) % self.modulus).to_bytes(self.element_size, "big"))
+
+    def challenge(self, bits: int = None) -> int:
+        """
+        Args:
+            bits: bit length of the challenge (default and at most 256)
+        Returns:
+            challenge made of the first bits of the digest of the transcript
+        """
+        if bits is None or bits > HASH_BITS:
+            bits = HASH_BITS
+        return int.from_bytes(self._hash.digest(), "big") >> (HASH_BITS - bits)
@@ -1,12 +1,56 @@
 import os
 import hashlib
 from pathlib import Path
-from typing import Tuple, List
+from typing import Iterable, Tuple, List
 
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
+from crypto_VDF.utils.montgomery import SQUARING_BLOCK, ModulusContext
 from crypto_VDF.utils.number_theory import NumberTheory
 
 
-def square_sequences(a: int, steps: int, n: int) -> int:
+def square_chain(a: int, steps: int, n: int, checkpoints: Iterable[int] = (), block: int = SQUARING_BLOCK,
+                 normalise: bool = False, backend: ArithmeticBackend = None, context: ModulusContext = None) \
+        -> Tuple[int, List[int]]:
+    """
+    Repeated squaring kernel: the chain a, a^2, a^{2^2}, ..., a^{2^steps} is computed by blocks of squarings done in
+    a single modular exponentiation a^{2^block}, and only the values at the requested indices are materialised
+
+    Args:
+        a: number to square
+        steps: number of squarings
+        n: modulus
+        checkpoints: increasing indices i <= steps at which to return a^{2^i}
+        block: maximum number of squarings per modular exponentiation
+        normalise: map the values to QR_N^+ (absolute value min(x, n - x)) after each block
+        backend: arithmetic backend (default backend of the settings if None), the checkpoint values are numbers of
+         the backend
+        context: arithmetic context of the modulus n (e.g. Montgomery), which then does the squarings
+
+    Returns:
+        a^{2^steps} (mod n) and the list of a^{2^i} (mod n) for i in checkpoints
+    """
+    if context is not None:
+        return context.square_chain(a=a, steps=steps, checkpoints=checkpoints, normalise=normalise, block=block)
+    backend = get_backend(backend)
+    n = backend.mpz(n)
+    c = backend.mpz(a) % n
+    values = []
+    i = 0
+    for target in list(checkpoints) + [steps]:
+        if target < i or target > steps:
+            raise ValueError(f"Checkpoint {target} is not in [{i}, {steps}]")
+        while i < target:
+            k = min(block, target - i)
+            c = backend.powmod(c, 1 << k, n)
+            if normalise:
+                c = NumberTheory.modular_abs(c, n)
+            i += k
+        values.append(c)
+    return backend.to_int(values.pop()), values
+
+
+def square_sequences(a: int, steps: int, n: int, backend: ArithmeticBackend = None,
+                     context: ModulusContext = None) -> int:
     """
     Modular exponentiation
 
@@ -14,17 +58,16 @@ def square_sequences(a: int, steps: int, n: int) -> int:
         a: number to exponentiate
         steps: exponent
         n: modulus
+        backend: arithmetic backend (default backend of the settings if None)
+        context: arithmetic context of the modulus n (default native reduction of the backend)
 
     Returns:
         a^exponent (mod n)
     """
-    c = a % n
-    for _ in range(steps):
-        c = NumberTheory.modular_abs((c * c) % n, n)
-    return c
+    return square_chain(a=a, steps=steps, n=n, normalise=True, backend=backend, context=context)[0]
 
 
-def square_sequences_v2(a: int, steps: int, n: int) -> Tuple[int, List[int]]:
+def square_sequences_v2(a: int, steps: int, n: int, backend: ArithmeticBackend = None) -> Tuple[int, List[int]]:
     """
     Modular exponentiation
 
@@ -32,21 +75,69 @@ def square_sequences_v2(a: int, steps: int, n: int) -> Tuple[int, List[int]]:
         a: number to exponentiate
         steps: exponent
         n: modulus
+        backend: arithmetic backend (default backend of the settings if None), the intermediate values are numbers
+         of the backend
 
     Returns:
         a^exponent (mod n)
     """
-    c = a % n
+    backend = get_backend(backend)
+    n = backend.mpz(n)
+    c = backend.mpz(a) % n
     cs = [c]
     for _ in range(steps):
         c = (c * c) % n
         cs.append(c)
-    return c, cs
+    return backend.to_int(c), cs
 
 
-def exp_modular(a: int, exponent: int, n: int) -> int:
+def square_sequences_checkpoints(a: int, steps: int, n: int, interval: int, backend: ArithmeticBackend = None,
+                                 context: ModulusContext = None) -> Tuple[int, List[int]]:
     """
-    Modular exponentiation
+    Modular exponentiation keeping only every interval-th intermediate value
+
+    Args:
+        a: number to exponentiate
+        steps: exponent
+        n: modulus
+        interval: distance between two stored values
+        backend: arithmetic backend (default backend of the settings if None), the stored values are numbers of the
+         backend
+        context: arithmetic context of the modulus n (default native reduction of the backend)
+
+    Returns:
+        a^(2^steps) (mod n) and the list of a^(2^(j * interval)) (mod n) for all j * interval < steps
+    """
+    return square_chain(a=a, steps=steps, n=n, checkpoints=range(0, steps, interval), backend=backend,
+                        context=context)
+
+
+def exp_modular(a: int, exponent: int, n: int, backend: ArithmeticBackend = None,
+                context: ModulusContext = None) -> int:
+    """
+    Modular exponentiation, done by the native modular exponentiation of the backend (builtin pow or gmpy2 powmod)
+
+    Args:
+        a: number to exponentiate
+        exponent: exponent
+        n: modulus
+        backend: arithmetic backend (default backend of the settings if None)
+        context: arithmetic context of the modulus n, which then does the exponentiation
+
+    Returns:
+        a^exponent (mod n)
+    """
+    if exponent == 0:
+        return 1 % n
+    if context is not None:
+        return context.exp(a=a, exponent=exponent)
+    backend = get_backend(backend)
+    return backend.to_int(backend.powmod(backend.mpz(a), exponent, backend.mpz(n)))
+
+
+def exp_modular_naive(a: int, exponent: int, n: int) -> int:
+    """
+    Square-and-multiply modular exponentiation on the list of bits of the exponent - Only used to test and benchmark
 
     Args:
         a: number to exponentiate
@@ -69,23 +160,16 @@ def exp_modular(a: int, exponent: int, n: int) -> int:
 
 def exp_non_modular(a: int, exponent: int) -> int:
     """
-    Modular exponentiation
+    Exponentiation
 
     Args:
         a: number to exponentiate
         exponent: exponent
-        n: modulus
 
     Returns:
-        a^exponent (mod n)
+        a^exponent
     """
-    exp = [int(item) for item in bin(exponent)[2:]]
-    c = a
-    for i in range(1, len(exp)):
-        c = c * c
-        if exp[i] == 1:
-            c = c * a
-    return c
+    return a ** exponent
 
 
 def int_2_base(a: int, base: int) -> list:
@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+import queue
+from time import perf_counter
+from typing import AsyncIterator, Union
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import EvalProgress, PublicParams, RsaSetup
+from crypto_VDF.utils.eval_state import advance_state, new_state
+from crypto_VDF.utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+# number of squarings between two progress reports (and two checks of the cancellation)
+PROGRESS_EVERY = 1 << 16
+# number of seconds between two checks that the worker process is alive
+POLL_INTERVAL = 0.5
+
+
+def _progress_worker(vdf, setup: Union[PublicParams, RsaSetup], input_param: int, chunk: int, backend: str,
+                     reduction: str, messages, cancel) -> None:
+    """
+    Worker process of aeval_progress: the chain is squared by chunks of squarings, the progress is put on the
+    messages queue after each chunk, and the evaluation stops at the first chunk boundary after cancel is set.
+    The messages are ("progress", steps, elapsed), then ("result", response), ("cancelled", steps) or ("error", text).
+    """
+    try:
+        vdf.set_backend(backend)
+        vdf.set_reduction(reduction)
+        modulus = setup.modulus if isinstance(setup, PublicParams) else setup.n
+        context = vdf.modulus_context(modulus)
+        total = vdf.chain_length(setup.delay)
+        state = new_state(scheme=vdf.name, modulus=modulus, input_param=input_param,
+                          interval=vdf.state_interval(setup))
+        start = perf_counter()
+        while state.step < total:
+            if cancel.is_set():
+                messages.put(("cancelled", state.step))
+                return
+            state = advance_state(state=state, steps=min(total, state.step + chunk), context=context)
+            messages.put(("progress", state.step, perf_counter() - start))
+        messages.put(("result", vdf.proof_from_state(setup=setup, state=state)))
+    except Exception as exc:
+        messages.put(("error", f"{type(exc).__name__}: {exc}"))
+
+
+def _next_message(messages, process) -> tuple:
+    """
+    Next message of the worker process, blocking until it arrives
+
+    Raises:
+        GeneralException if the worker process exits without a final message
+    """
+    while True:
+        try:
+            return messages.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            if not process.is_alive():
+                try:
+                    return messages.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    raise GeneralException(message=f"The eval worker exited with code {process.exitcode}")
+
+
+async def progress_messages(vdf, setup: Union[PublicParams, RsaSetup], input_param: int,
+                            chunk: int = PROGRESS_EVERY) -> AsyncIterator[EvalProgress]:
+    """
+    Evaluation in a worker process, reported as an async iterator of the progress, the last item carrying the response.
+    If the consumer is cancelled (or stops iterating), the worker stops at its next chunk boundary.
+
+    Raises:
+        GeneralException if the evaluation fails in the worker process
+    """
+    loop = asyncio.get_running_loop()
+    messages, cancel = multiprocessing.Queue(), multiprocessing.Event()
+    process = multiprocessing.Process(target=_progress_worker, daemon=True,
+                                      args=(vdf, setup, input_param, chunk, vdf.backend.name, vdf.reduction,
+                                            messages, cancel))
+    process.start()
+    total = vdf.chain_length(setup.delay)
+    finished = False
+    try:
+        while True:
+            message = await loop.run_in_executor(None, _next_message, messages, process)
+            if message[0] == "progress":
+                _, steps, elapsed = message
+                rate = steps / elapsed if elapsed > 0 else 0.0
+                eta = (total - steps) / rate if rate > 0 else 0.0
+                yield EvalProgress(input_param=input_param, steps=steps, total=total, rate=rate, eta=eta)
+            elif message[0] == "result":
+                finished = True
+                response = message[1]
+                response.input_param = input_param
+                yield EvalProgress(input_param=input_param, steps=total, total=total, rate=0.0, eta=0.0,
+                                   response=response)
+                return
+            else:
+                finished = True
+                raise GeneralException(message=f"The evaluation of {input_param} failed: {message[1]}")
+    finally:
+        if not finished:
+            _log.info(f"[ASYNC-EVAL] Cancelling the evaluation of {input_param}")
+            cancel.set()
+        # the worker is joined off the event loop: it returns at its next chunk boundary once cancelled
+        await asyncio.shield(loop.run_in_executor(None, process.join))
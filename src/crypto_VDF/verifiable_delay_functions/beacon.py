@@ -0,0 +1,250 @@
+import hashlib
+import os
+from collections import deque
+from multiprocessing import Pool
+from multiprocessing.pool import AsyncResult
+from pathlib import Path
+from typing import Iterator, Optional, Type, Union
+
+import pydantic
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import BeaconHeader, BeaconRecord, EvalResponse, PublicParams, RsaSetup
+from crypto_VDF.utils.eval_state import advance_state, new_state
+from crypto_VDF.utils.hash_to_prime import encode_integers
+from crypto_VDF.utils.logger import get_logger
+from crypto_VDF.verifiable_delay_functions.vdf import VDF, _init_eval_worker
+
+_log = get_logger(__name__)
+
+# size of an entry of the index: offset of the record in the log
+INDEX_ENTRY_SIZE = 8
+
+
+class BeaconLog:
+    """
+    Append-only log of the beacon epochs: a header line (scheme, modulus, delay and seed of the beacon), then one
+    JSON record per line in the log file, and the offset of each record on INDEX_ENTRY_SIZE bytes in the index file,
+    so that the record of any epoch is read with two seeks.
+    An epoch is committed once its offset is in the index: a record written after the last indexed offset (crash
+    between the two writes) is overwritten by the next append.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: log file, the index is the file with the suffix .idx next to it
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix(self.path.suffix + ".idx")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch()
+        self.index_path.touch()
+        # an index entry partially written by a crash is dropped
+        size = self.index_path.stat().st_size
+        if size % INDEX_ENTRY_SIZE:
+            os.truncate(self.index_path, size - size % INDEX_ENTRY_SIZE)
+
+    def __len__(self) -> int:
+        return self.index_path.stat().st_size // INDEX_ENTRY_SIZE
+
+    def offset(self, epoch: int) -> int:
+        with open(self.index_path, "rb") as index:
+            index.seek(epoch * INDEX_ENTRY_SIZE)
+            return int.from_bytes(index.read(INDEX_ENTRY_SIZE), "big")
+
+    def header(self) -> Optional[BeaconHeader]:
+        """
+        Header of the log, None if it has none (or a header partially written by a crash)
+        """
+        with open(self.path, "rb") as log:
+            line = log.readline()
+        if not line.endswith(b"\n"):
+            return None
+        try:
+            return BeaconHeader.parse_raw(line)
+        except pydantic.ValidationError:
+            return None
+
+    def write_header(self, header: BeaconHeader) -> None:
+        """
+        Write the header of an empty log
+
+        Raises:
+            ValueError if the log already has epochs
+        """
+        if len(self):
+            raise ValueError(f"Header written to a log of {len(self)} epochs")
+        with open(self.path, "r+b") as log:
+            log.write(header.json().encode() + b"\n")
+            log.truncate()
+            log.flush()
+            os.fsync(log.fileno())
+
+    def end(self) -> int:
+        """
+        Offset of the end of the last committed record (of the header if there is no record)
+        """
+        if len(self) == 0:
+            header = self.header()
+            return len(header.json().encode()) + 1 if header is not None else 0
+        with open(self.path, "rb") as log:
+            log.seek(self.offset(len(self) - 1))
+            return log.tell() + len(log.readline())
+
+    def append(self, record: BeaconRecord) -> None:
+        """
+        Append the record of the next epoch: the record is written and fsync'd, then its offset is appended to the
+        index
+
+        Raises:
+            ValueError if the epoch of the record is not the next epoch of the log
+        """
+        if record.epoch != len(self):
+            raise ValueError(f"Epoch {record.epoch} appended to a log of {len(self)} epochs")
+        offset = self.end()
+        with open(self.path, "r+b") as log:
+            log.seek(offset)
+            log.write(record.json().encode() + b"\n")
+            log.truncate()
+            log.flush()
+            os.fsync(log.fileno())
+        with open(self.index_path, "ab") as index:
+            index.write(offset.to_bytes(INDEX_ENTRY_SIZE, "big"))
+            index.flush()
+            os.fsync(index.fileno())
+
+    def get(self, epoch: int) -> BeaconRecord:
+        """
+        Raises:
+            IndexError if the epoch is not in the log
+        """
+        if not 0 <= epoch < len(self):
+            raise IndexError(f"Epoch {epoch} is not in the log ({len(self)} epochs)")
+        with open(self.path, "rb") as log:
+            log.seek(self.offset(epoch))
+            return BeaconRecord.parse_raw(log.readline())
+
+    def last(self) -> Optional[BeaconRecord]:
+        return self.get(len(self) - 1) if len(self) else None
+
+
+class Beacon:
+    """
+    Randomness beacon: the input of each epoch is a hash of the output of the previous epoch (of the seed for the
+    epoch 0). The squaring of the epoch i + 1 starts as soon as the output of the epoch i is known, while the proof of
+    the epoch i is computed by a pool of processes.
+    """
+
+    def __init__(self, vdf: Type[VDF], setup: Union[PublicParams, RsaSetup], seed: int,
+                 log: Union[str, Path, BeaconLog] = None, workers: int = 1):
+        """
+        Args:
+            vdf: VDF class (PietrzakVDF or WesolowskiVDF)
+            setup: public parameters, with the delay of an epoch
+            seed: seed of the input of the epoch 0
+            log: log of the epochs (path or BeaconLog), the beacon goes on from the last logged epoch
+            workers: number of processes computing the proofs (computed in the calling process if 0)
+        """
+        self.vdf = vdf
+        self.setup = setup
+        self.seed = seed
+        self.log = BeaconLog(log) if isinstance(log, (str, Path)) else log
+        self.workers = workers
+
+    @property
+    def modulus(self) -> int:
+        return self.setup.modulus if isinstance(self.setup, PublicParams) else self.setup.n
+
+    def derive_input(self, epoch: int, previous: int) -> int:
+        """
+        Input of the epoch: SHA-256 in counter mode of (epoch, previous output) expanded to 128 bits more than the
+        modulus, reduced and squared modulo the modulus, so that the input is a quadratic residue for both VDFs
+        """
+        width = (self.modulus.bit_length() + 128 + 255) // 256
+        seed = encode_integers(self.modulus, epoch, previous)
+        digest = b"".join(hashlib.sha256(b"crypto-VDF/beacon" + encode_integers(i) + seed).digest()
+                          for i in range(width))
+        return pow(int.from_bytes(digest, "big") % self.modulus, 2, self.modulus)
+
+    def header(self) -> BeaconHeader:
+        return BeaconHeader(scheme=self.vdf.name, modulus=self.modulus, delay=self.setup.delay, seed=self.seed)
+
+    def check_log(self) -> None:
+        """
+        Write the header of the beacon to an empty log, or check that the log was written by the same beacon
+
+        Raises:
+            GeneralException if the log was written under another scheme, modulus, delay or seed, or has no header
+        """
+        logged, header = self.log.header(), self.header()
+        if logged is None and len(self.log) == 0:
+            self.log.write_header(header)
+        elif logged is None:
+            raise GeneralException(message=f"The beacon log {self.log.path} has no header")
+        elif logged != header:
+            raise GeneralException(message=f"The beacon log {self.log.path} was written by the beacon {logged.dict()}, "
+                                           f"not by {header.dict()}")
+
+    def run(self, epochs: int = None) -> Iterator[BeaconRecord]:
+        """
+        Run the beacon from the epoch after the last logged one
+
+        Args:
+            epochs: number of epochs to run (forever if None)
+        Returns:
+            generator of the records of the epochs, in epoch order, each record being logged before it is yielded
+        Raises:
+            GeneralException if the log was not written by this beacon (check_log)
+        """
+        if self.log is not None:
+            self.check_log()
+        last = self.log.last() if self.log is not None else None
+        epoch, previous = (0, self.seed) if last is None else (last.epoch + 1, last.output)
+        stop = None if epochs is None else epoch + epochs
+        context = self.vdf.modulus_context(self.modulus)
+        steps = self.vdf.chain_length(self.setup.delay)
+        interval = self.vdf.state_interval(self.setup)
+        pool = Pool(processes=self.workers, initializer=_init_eval_worker,
+                    initargs=(self.vdf, self.setup, self.vdf.backend.name, self.vdf.reduction, {})) \
+            if self.workers > 0 else None
+        pending = deque()
+        try:
+            while stop is None or epoch < stop:
+                x = self.derive_input(epoch=epoch, previous=previous)
+                state = advance_state(state=new_state(scheme=self.vdf.name, modulus=self.modulus, input_param=x,
+                                                      interval=interval), steps=steps, context=context)
+                previous = self.vdf.output_from_state(setup=self.setup, state=state)
+                _log.debug(f"[BEACON] Output of epoch {epoch}: {previous}")
+                if pool is not None:
+                    pending.append((epoch, x, pool.apply_async(self.vdf.proof_from_state, (self.setup, state))))
+                else:
+                    pending.append((epoch, x, self.vdf.proof_from_state(setup=self.setup, state=state)))
+                # the proofs of the previous epochs are collected while the next epochs are squared
+                while pending and (pool is None or pending[0][2].ready()):
+                    yield self._commit(*pending.popleft())
+                epoch += 1
+            while pending:
+                yield self._commit(*pending.popleft())
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def _commit(self, epoch: int, x: int, response: Union[EvalResponse, AsyncResult]) -> BeaconRecord:
+        if isinstance(response, AsyncResult):
+            response = response.get()
+        record = BeaconRecord(epoch=epoch, input_param=x, output=response.output, proof=response.proof)
+        if self.log is not None:
+            self.log.append(record)
+        _log.info(f"[BEACON] Epoch {epoch}: {record.output}")
+        return record
+
+    def verify(self, record: BeaconRecord, previous: int = None) -> bool:
+        """
+        Verify a record: its input is derived from the previous output (from the log if None) and its proof is valid
+        """
+        if previous is None:
+            previous = self.seed if record.epoch == 0 else self.log.get(record.epoch - 1).output
+        if record.input_param != self.derive_input(epoch=record.epoch, previous=previous):
+            return False
+        return self.vdf.verify(self.setup, record.input_param, record.output, record.proof, _hide=True)
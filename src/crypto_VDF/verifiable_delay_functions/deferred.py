@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import Executor, Future
+from typing import List, Union
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import EvalResponse, EvalState, PublicParams, RsaSetup
+from crypto_VDF.utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+
+class ProofHandle:
+    """
+    Output of an evaluation whose proof is computed later. The handle keeps the eval state (the output and the
+    checkpoints of the squaring chain) until the proof is computed, either lazily on the first call of proof, or by
+    an executor as soon as the handle is created. The state is released once the proof is known, or by release, and
+    with the handle when it is dropped.
+    """
+
+    def __init__(self, vdf, setup: Union[PublicParams, RsaSetup], state: EvalState, executor: Executor = None):
+        """
+        Args:
+            vdf: VDF class of the evaluation
+            setup: public parameters of the evaluation
+            state: eval state at the end of the squaring chain
+            executor: executor computing the proof in the background (lazy proof if None)
+        """
+        self.vdf = vdf
+        self.setup = setup
+        self.input_param = state.input_param
+        self.output = vdf.output_from_state(setup=setup, state=state)
+        self._state = state
+        self._proof = None
+        self._future: Future = None
+        self._lock = threading.Lock()
+        if executor is not None:
+            self._future = executor.submit(vdf.proof_from_state, setup, state)
+            self._state = None
+
+    def done(self) -> bool:
+        """
+        True if the proof is known without computation
+        """
+        return self._proof is not None or (self._future is not None and self._future.done())
+
+    def proof(self, timeout: float = None) -> Union[List[int], int]:
+        """
+        Proof of the output, computed on the first call if the handle has no executor
+
+        Args:
+            timeout: maximum number of seconds to wait for the executor (no limit if None)
+        Returns:
+            proof of the VDF
+        Raises:
+            GeneralException if the handle was released before the proof was computed
+        """
+        with self._lock:
+            if self._proof is None:
+                if self._future is not None:
+                    self._proof = self._future.result(timeout=timeout).proof
+                    self._future = None
+                elif self._state is not None:
+                    _log.debug(f"[PROOF-HANDLE] Computing the proof of {self.output}")
+                    self._proof = self.vdf.proof_from_state(setup=self.setup, state=self._state).proof
+                    self._state = None
+                else:
+                    raise GeneralException(message="The proof handle was released before its proof was computed")
+            return self._proof
+
+    def response(self, timeout: float = None) -> EvalResponse:
+        return EvalResponse(output=self.output, proof=self.proof(timeout=timeout), input_param=self.input_param)
+
+    def release(self) -> None:
+        """
+        Drop the state of the proof (and cancel its computation if it has not started), the proof can no longer be
+        computed
+        """
+        with self._lock:
+            if self._future is not None:
+                self._future.cancel()
+                self._future = None
+            self._state = None
+
+    def __del__(self):
+        if self._future is not None:
+            self._future.cancel()
@@ -0,0 +1,230 @@
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple, Type, Union
+
+from crypto_VDF import settings
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import ParameterStoreEntry, PublicParams, RsaSetup, StoredModulus
+from crypto_VDF.utils.logger import get_logger
+from crypto_VDF.utils.utils import create_path_to_data_folder_v2
+from crypto_VDF.verifiable_delay_functions.vdf import VDF
+
+_log = get_logger(__name__)
+
+
+class ParameterStore:
+    """
+    Store of RSA moduli keyed by (scheme, security parameter), persisted as one JSON file per key.
+
+    The moduli handed out by setup are the issued ones: the first issued modulus is reused with the requested delay,
+    so that repeated setups cost no prime search. The ready moduli have never been handed out and are taken by
+    setup(fresh=True). A background thread can keep the ready moduli and the inputs of the issued moduli topped up,
+    so that setup and gen return without computation.
+    """
+
+    def __init__(self, directory: Union[str, Path] = None, keep_trapdoor: bool = False, workers: int = None):
+        """
+        Args:
+            directory: directory of the JSON files (settings.parameter_store_path, or data/parameters if None)
+            keep_trapdoor: persist the factors p and q of the new moduli, needed by setup(ret_sk=True). Anyone
+             reading the files can then evaluate the VDFs under those moduli instantly: the files holding factors
+             are only readable and writable by their owner (0600)
+            workers: number of processes searching the primes of a new modulus
+        """
+        if directory is None:
+            directory = settings.parameter_store_path or create_path_to_data_folder_v2() / "parameters"
+        self.directory = Path(directory)
+        self.keep_trapdoor = keep_trapdoor
+        self.workers = workers
+        self._entries: Dict[Tuple[str, int], ParameterStoreEntry] = {}
+        self._inputs: Dict[int, Deque[int]] = {}
+        self._lock = threading.RLock()
+        self._targets: Dict[Tuple[Type[VDF], int], Tuple[int, int]] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def path(self, scheme: str, security_param: int) -> Path:
+        return self.directory / f"{scheme}_{security_param}.json"
+
+    def entry(self, scheme: str, security_param: int) -> ParameterStoreEntry:
+        """
+        Entry of the key, loaded from its file on first access
+        """
+        key = (scheme, security_param)
+        with self._lock:
+            if key not in self._entries:
+                path = self.path(scheme=scheme, security_param=security_param)
+                if path.is_file():
+                    self._entries[key] = ParameterStoreEntry.parse_file(path)
+                    _log.debug(f"[PARAMETER-STORE] Loaded {path}")
+                else:
+                    self._entries[key] = ParameterStoreEntry(scheme=scheme, security_param=security_param)
+            return self._entries[key]
+
+    def save(self, entry: ParameterStoreEntry) -> None:
+        """
+        Write the entry to its file: the content is written to a temporary file which then replaces the previous one.
+        The file is created with the permissions 0600 if the entry holds factors of its moduli.
+        """
+        path = self.path(scheme=entry.scheme, security_param=entry.security_param)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with self._lock:
+            if any(modulus.p is not None for modulus in entry.issued + entry.ready):
+                tmp_path.unlink(missing_ok=True)
+                with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as file:
+                    file.write(entry.json())
+            else:
+                tmp_path.write_text(entry.json())
+            os.replace(tmp_path, path)
+
+    def generate_modulus(self, vdf: Type[VDF], security_param: int) -> StoredModulus:
+        primes = vdf.generate_rsa_primes(security_param=security_param, workers=self.workers)
+        p, q = primes.p.base_10, primes.q.base_10
+        if self.keep_trapdoor:
+            return StoredModulus(n=p * q, p=p, q=q)
+        return StoredModulus(n=p * q)
+
+    def add_ready(self, vdf: Type[VDF], security_param: int) -> StoredModulus:
+        """
+        Generate a new modulus and persist it as ready
+        """
+        modulus = self.generate_modulus(vdf=vdf, security_param=security_param)
+        with self._lock:
+            entry = self.entry(scheme=vdf.name, security_param=security_param)
+            entry.ready.append(modulus)
+            self.save(entry)
+        _log.debug(f"[PARAMETER-STORE] New ready modulus for ({vdf.name}, {security_param})")
+        return modulus
+
+    def take_modulus(self, vdf: Type[VDF], security_param: int, fresh: bool = False) -> StoredModulus:
+        """
+        Args:
+            vdf: VDF class
+            security_param: bit length of the modulus
+            fresh: hand out a modulus that was never handed out before
+        Returns:
+            first issued modulus, or a ready modulus (generated if none is ready) moved to the issued ones
+        """
+        with self._lock:
+            entry = self.entry(scheme=vdf.name, security_param=security_param)
+            if entry.issued and not fresh:
+                return entry.issued[0]
+            if entry.ready:
+                modulus = entry.ready.pop(0)
+                entry.issued.append(modulus)
+                self.save(entry)
+                self._wake.set()
+                return modulus
+        modulus = self.generate_modulus(vdf=vdf, security_param=security_param)
+        with self._lock:
+            entry.issued.append(modulus)
+            self.save(entry)
+        return modulus
+
+    def setup(self, vdf: Type[VDF], security_param: int, delay: int, ret_sk: bool = False,
+              fresh: bool = False) -> Union[PublicParams, RsaSetup]:
+        """
+        Public parameters of a stored modulus with the requested delay
+
+        Args:
+            vdf: VDF class (PietrzakVDF or WesolowskiVDF)
+            security_param: bit length of the modulus
+            delay: delay of the VDF
+            ret_sk: include the trapdoor phi in the parameters
+            fresh: use a modulus that was never handed out before
+        Returns:
+            public parameters of the VDF
+        Raises:
+            GeneralException if ret_sk is set and the factors of the modulus are not stored
+        """
+        modulus = self.take_modulus(vdf=vdf, security_param=security_param, fresh=fresh)
+        if ret_sk and modulus.phi is None:
+            raise GeneralException(message=f"The factors of the stored modulus for ({vdf.name}, {security_param}) "
+                                           f"are not stored")
+        if ret_sk:
+            return vdf.params_from_modulus(n=modulus.n, security_param=security_param, delay=delay, phi=modulus.phi,
+                                           p=modulus.p, q=modulus.q)
+        return vdf.params_from_modulus(n=modulus.n, security_param=security_param, delay=delay)
+
+    def gen(self, vdf: Type[VDF], params: Union[PublicParams, RsaSetup]) -> int:
+        """
+        Input of the VDF for the parameters: a pre-generated input of the modulus if one is available, otherwise an
+        input generated with vdf.gen. Each pre-generated input is handed out once.
+        """
+        with self._lock:
+            inputs = self._inputs.get(self.modulus_of(params))
+            if inputs:
+                self._wake.set()
+                return inputs.popleft()
+        return vdf.gen(params)
+
+    @staticmethod
+    def modulus_of(params: Union[PublicParams, RsaSetup]) -> int:
+        return params.modulus if isinstance(params, PublicParams) else params.n
+
+    def keep_ready(self, vdf: Type[VDF], security_param: int, moduli: int = 1, inputs: int = 0) -> None:
+        """
+        Register a key topped up by the background thread
+
+        Args:
+            vdf: VDF class
+            security_param: bit length of the moduli
+            moduli: number of ready moduli to keep
+            inputs: number of pre-generated inputs to keep for each issued modulus
+        """
+        with self._lock:
+            self._targets[(vdf, security_param)] = (moduli, inputs)
+        self._wake.set()
+
+    def top_up(self) -> None:
+        """
+        Generate the missing ready moduli and inputs of the registered keys
+        """
+        with self._lock:
+            targets = list(self._targets.items())
+        for (vdf, security_param), (moduli, inputs) in targets:
+            while not self._stop.is_set() and \
+                    len(self.entry(scheme=vdf.name, security_param=security_param).ready) < moduli:
+                self.add_ready(vdf=vdf, security_param=security_param)
+            for modulus in list(self.entry(scheme=vdf.name, security_param=security_param).issued):
+                params = vdf.params_from_modulus(n=modulus.n, security_param=security_param, delay=1)
+                with self._lock:
+                    pool = self._inputs.setdefault(modulus.n, deque())
+                while not self._stop.is_set() and len(pool) < inputs:
+                    x = vdf.gen(params)
+                    with self._lock:
+                        pool.append(x)
+
+    def start(self) -> None:
+        """
+        Start the background thread topping up the registered keys whenever a modulus or an input is taken
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="parameter-store", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.top_up()
+            except Exception as exc:
+                _log.error(f"[PARAMETER-STORE] Top up failed: {exc}")
+            self._wake.wait()
+
+    def ready_inputs(self, params: Union[PublicParams, RsaSetup]) -> List[int]:
+        with self._lock:
+            return list(self._inputs.get(self.modulus_of(params), []))
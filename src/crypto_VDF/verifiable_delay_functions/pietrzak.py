@@ -1,20 +1,108 @@
-from typing import List, Tuple
+import math
+from multiprocessing import Pool
+from time import perf_counter
+from typing import Iterable, List, Tuple
 
-from crypto_VDF.data_transfer_objects.dto import PublicParams, EvalResponse
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import PublicParams, EvalResponse, EvalState, BatchVerifyResponse
+from crypto_VDF.utils.exponentiation import multi_exp
 from crypto_VDF.utils.logger import get_logger, set_level
+from crypto_VDF.utils.montgomery import ModulusContext
 from crypto_VDF.utils.number_theory import NumberTheory
-from crypto_VDF.utils.utils import concat_hexs, hash_function, exp_modular, exp_non_modular, square_sequences, get_hex
+from crypto_VDF.utils.transcript import Transcript
+from crypto_VDF.utils.utils import exp_modular, square_sequences, square_sequences_checkpoints
 from crypto_VDF.verifiable_delay_functions.vdf import VDF
 
 _log = get_logger(__name__)
 
 
 class PietrzakVDF(VDF):
+    name = "pietrzak"
 
     @classmethod
-    def setup(cls, security_param: int, delay: int) -> PublicParams:
-        primes = cls.generate_rsa_primes(security_param)
-        return PublicParams(modulus=primes.q.base_10 * primes.p.base_10, delay=delay, security_param=security_param)
+    def setup(cls, security_param: int, delay: int, ret_sk: bool = False, workers: int = None) -> PublicParams:
+        primes = cls.generate_rsa_primes(security_param, workers=workers)
+        p, q = primes.p.base_10, primes.q.base_10
+        if ret_sk:
+            return cls.params_from_modulus(n=p * q, security_param=security_param, delay=delay, p=p, q=q)
+        return cls.params_from_modulus(n=p * q, security_param=security_param, delay=delay)
+
+    @classmethod
+    def params_from_modulus(cls, n: int, security_param: int, delay: int, phi: int = None, p: int = None,
+                            q: int = None) -> PublicParams:
+        return PublicParams(modulus=n, p=p, q=q, delay=delay, security_param=security_param)
+
+    @classmethod
+    def chain_length(cls, delay: int) -> int:
+        return 2 * cls.calc_next_step(step=delay)
+
+    @classmethod
+    def state_interval(cls, setup: PublicParams) -> int:
+        return max(1, math.isqrt(cls.chain_length(setup.delay)))
+
+    @classmethod
+    def output_from_state(cls, setup: PublicParams, state: EvalState) -> int:
+        return NumberTheory.modular_abs(state.value, setup.modulus) if state.step > 0 else state.value
+
+    @classmethod
+    def proof_from_state(cls, setup: PublicParams, state: EvalState) -> EvalResponse:
+        output, proof = cls.proof_from_checkpoints(public_params=setup, input_param=state.input_param,
+                                                   last=cls.backend.mpz(state.value),
+                                                   checkpoints=[cls.backend.mpz(item) for item in state.checkpoints],
+                                                   interval=state.interval)
+        return EvalResponse(output=output, proof=proof)
+
+    @classmethod
+    @set_level(logger=_log)
+    def trapdoor(cls, public_params: PublicParams, input_param: int, _verbose: bool = False,
+                 _hide: bool = False) -> EvalResponse:
+        """
+        Evaluation with the factors p and q of the modulus: each x_i^{2^t} is a CRT exponentiation with 2^t reduced
+        modulo p - 1 and q - 1, so the output and the proof take O(log delay) exponentiations instead of the delay
+        squarings. The output and the proof are the same as the ones of compute_proof.
+
+        Args:
+            public_params: public parameters with the factors p and q (setup with ret_sk=True)
+            input_param: input of the VDF x
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+        Returns:
+            Output of the VDF and Proof
+        Raises:
+            GeneralException if the factors are not in the public parameters
+        """
+        if public_params.p is None or public_params.q is None:
+            raise GeneralException(message="The trapdoor needs the factors p and q of the public parameters")
+        n, p, q = public_params.modulus, public_params.p, public_params.q
+        q_inv = NumberTheory.modular_inverse(a=q, n=p, backend=cls.backend)
+
+        def power(a: int, t: int) -> int:
+            # a^{2^t} mod n in QR_N^+
+            exp_p = exp_modular(a=2, exponent=t, n=p - 1, backend=cls.backend)
+            exp_q = exp_modular(a=2, exponent=t, n=q - 1, backend=cls.backend)
+            return NumberTheory.modular_abs(cls.crt_exp(a=a, exp_p=exp_p, exp_q=exp_q, p=p, q=q, q_inv=q_inv), n)
+
+        t_half = cls.calc_next_step(step=public_params.delay)
+        y = power(a=input_param, t=2 * t_half)
+        x_i = input_param
+        y_i = y
+        _log.info(f"[TRAPDOOR] Initial state: x = {x_i}, y = {y_i}")
+        mu = []
+        t = public_params.delay
+        while int(t) > 1:
+            t_previous = t
+            t = cls.calc_next_step(step=t)
+            mu_i = power(a=x_i, t=t)
+            r_i = cls.flat_shamir_hash(xi=int(x_i), mui=int(mu_i), delay=t_previous, yi=y_i,
+                                       public_params=public_params)
+            _log.debug(f"[TRAPDOOR] t = {t}, mu_i = {mu_i}, r_i = {r_i}")
+            x_i = NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=n, backend=cls.backend), v=mu_i, n=n,
+                                        backend=cls.backend)
+            y_i = NumberTheory.multiply(u=exp_modular(a=mu_i, exponent=r_i, n=n, backend=cls.backend), v=y_i, n=n,
+                                        backend=cls.backend)
+            mu.append(mu_i)
+        _log.info(f"[TRAPDOOR] Proof: {mu}")
+        return EvalResponse(output=y, proof=mu)
 
     @classmethod
     def gen(cls, public_params) -> int:
@@ -25,9 +113,22 @@ class PietrzakVDF(VDF):
         return cls.eval_function(public_params=public_params, input_param=input_param)
 
     @classmethod
-    def eval(cls, public_params, input_param, _verbose: bool = False, _hide: bool = False) -> EvalResponse:
-        output, proof = cls.compute_proof(public_params=public_params, input_param=input_param, _verbose=_verbose,
-                                          _hide=_hide)
+    def eval(cls, public_params, input_param, _verbose: bool = False, _hide: bool = False,
+             checkpoint_interval: int = None) -> EvalResponse:
+        """
+        Eval function, the proof is computed from the checkpoints stored during the evaluation
+
+        Args:
+            public_params: public parameters
+            input_param: input of the VDF
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+            checkpoint_interval: distance between two stored x^{2^i} (default about sqrt(delay))
+        Returns:
+            Output of the VDF and Proof
+        """
+        output, proof = cls.compute_proof_checkpoints(public_params=public_params, input_param=input_param,
+                                                      interval=checkpoint_interval, _verbose=_verbose, _hide=_hide)
         return EvalResponse(output=output, proof=proof)
 
     @classmethod
@@ -44,38 +145,124 @@ class PietrzakVDF(VDF):
             return y_i == NumberTheory.modular_abs((x_i ** 2) % public_params.modulus, public_params.modulus)
         t = public_params.delay
         for item in proof:
-            exp = exp_non_modular(a=2, exponent=t)
             _log.debug(f"[VERIFY] x_i = {x_i}, y_i:{y_i}")
-            r_i = cls.flat_shamir_hash(xi=x_i, exponent=exp, yi=y_i, mui=item, public_params=public_params)
+            r_i = cls.flat_shamir_hash(xi=x_i, delay=t, yi=y_i, mui=item, public_params=public_params)
             _log.debug(f"[VERIFY] r_i = {r_i}")
-            x_i = NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=public_params.modulus), v=item,
-                                        n=public_params.modulus)
-            y_i = NumberTheory.multiply(u=exp_modular(a=item, exponent=r_i, n=public_params.modulus), v=y_i,
-                                        n=public_params.modulus)
+            x_i = NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=public_params.modulus,
+                                                      backend=cls.backend),
+                                        v=item, n=public_params.modulus, backend=cls.backend)
+            y_i = NumberTheory.multiply(u=exp_modular(a=item, exponent=r_i, n=public_params.modulus,
+                                                      backend=cls.backend),
+                                        v=y_i, n=public_params.modulus, backend=cls.backend)
             _log.debug(f"[VERIFY] x = {x_i} and y = {y_i}\n")
             t = cls.calc_next_step(step=t)
         _log.info(f"[VERIFY] x = {x_i} and y = {y_i}\n")
-        return y_i == NumberTheory.modular_abs(exp_modular(a=x_i, exponent=2, n=public_params.modulus),
+        return y_i == NumberTheory.modular_abs(exp_modular(a=x_i, exponent=2, n=public_params.modulus,
+                                                           backend=cls.backend),
                                                public_params.modulus)
 
+    @classmethod
+    @set_level(logger=_log)
+    def verify_batch(cls, public_params: PublicParams, triples: Iterable[Tuple[int, int, List[int]]],
+                     workers: int = None, _verbose: bool = False, _hide: bool = False) -> BatchVerifyResponse:
+        """
+        Verify many (x, y, proof) triples under the same public parameters, round by round (see verify_rounds),
+        optionally spreading the triples over a pool of processes
+
+        Args:
+            public_params: public parameters
+            triples: (input x, output y, proof) triples
+            workers: number of processes (no pool if None or 1)
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+        Returns:
+            validity of each triple (same as verify), validity of the whole batch, elapsed time (s) and number of
+             proofs verified per second
+        """
+        start = perf_counter()
+        triples = [(int(x), int(y), [int(item) for item in proof]) for x, y, proof in triples]
+        if workers is not None and workers > 1 and len(triples) > 1:
+            workers = min(workers, len(triples))
+            with Pool(processes=workers) as pool:
+                chunk_results = pool.starmap(cls.verify_rounds,
+                                             [(public_params, triples[i::workers]) for i in range(workers)])
+            results = [False] * len(triples)
+            for i, chunk_result in enumerate(chunk_results):
+                results[i::workers] = chunk_result
+        else:
+            results = cls.verify_rounds(public_params=public_params, triples=triples)
+        elapsed = perf_counter() - start
+        _log.info(f"[VERIFY-BATCH] {sum(results)}/{len(results)} valid triples in {elapsed:.4f} s")
+        return BatchVerifyResponse(results=results, valid=all(results), elapsed=elapsed,
+                                   throughput=len(results) / elapsed if elapsed > 0 else float("inf"))
+
+    @classmethod
+    def verify_rounds(cls, public_params: PublicParams, triples: List[Tuple[int, int, List[int]]]) -> List[bool]:
+        """
+        Verify the triples round by round: the round i of all the proofs is done before the round i + 1
+
+        Args:
+            public_params: public parameters
+            triples: (input x, output y, proof) triples
+        Returns:
+            validity of each triple (same as verify)
+        """
+        n = public_params.modulus
+        states = {}
+        for idx, (x, y, proof) in enumerate(triples):
+            if all(NumberTheory.check_quadratic_residue(modulus=n, x=item) for item in [x, y]):
+                states[idx] = (x, y)
+        t = public_params.delay
+        for i in range(max((len(proof) for _, _, proof in triples), default=0)):
+            for idx, (x_i, y_i) in states.items():
+                proof = triples[idx][2]
+                if i >= len(proof):
+                    continue
+                r_i = cls.flat_shamir_hash(xi=x_i, delay=t, yi=y_i, mui=proof[i], public_params=public_params)
+                states[idx] = (
+                    NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=n, backend=cls.backend), v=proof[i],
+                                          n=n, backend=cls.backend),
+                    NumberTheory.multiply(u=exp_modular(a=proof[i], exponent=r_i, n=n, backend=cls.backend), v=y_i,
+                                          n=n, backend=cls.backend))
+            t = cls.calc_next_step(step=t)
+        results = [False] * len(triples)
+        for idx, (x_i, y_i) in states.items():
+            results[idx] = y_i == NumberTheory.modular_abs((x_i * x_i) % n, n)
+        return results
+
     @staticmethod
     def calc_next_step(step: int) -> int:
         return step // 2 if step % 2 == 0 else (step + 1) // 2
 
     @staticmethod
-    def flat_shamir_hash(public_params: PublicParams, xi, exponent, yi, mui) -> int:
-        h_in = concat_hexs(int(xi), exponent, int(yi))
-        hash_input = bytes.fromhex(get_hex(h_in)) + bytes.fromhex(get_hex(mui))
-        return hash_function(hash_input=hash_input, truncate_to=public_params.security_param)
+    def flat_shamir_hash(public_params: PublicParams, xi, delay: int, yi, mui) -> int:
+        """
+        Fiat-Shamir challenge of a round of the protocol
+
+        Args:
+            public_params: public parameters
+            xi: input x_i of the round
+            delay: delay t_i of the round (2^{t_i} is never built)
+            yi: output y_i of the round
+            mui: midpoint mu_i of the round
+        Returns:
+            challenge r_i of security_param bits (256 bits if None, at most 256 bits)
+        """
+        transcript = Transcript(label=b"crypto-VDF/pietrzak", modulus=public_params.modulus)
+        transcript.append_integer(delay)
+        for element in [xi, yi, mui]:
+            transcript.append_element(element)
+        return transcript.challenge(bits=public_params.security_param)
 
     @classmethod
     @set_level(logger=_log)
     def compute_proof(cls, public_params: PublicParams, input_param, _verbose: bool = False, _hide: bool = False) \
             -> Tuple[int, List[int]]:
         x_i = input_param
+        context = cls.modulus_context(public_params.modulus)
         t_half = cls.calc_next_step(step=public_params.delay)
-        y_half = square_sequences(a=input_param, n=public_params.modulus, steps=t_half)
-        y = square_sequences(a=y_half, n=public_params.modulus, steps=t_half)
+        y_half = square_sequences(a=input_param, n=public_params.modulus, steps=t_half, context=context)
+        y = square_sequences(a=y_half, n=public_params.modulus, steps=t_half, context=context)
         y_i = y
         _log.info(f"[COMPUTE-PROOF] Initial state: x = {x_i}, y = {y_i}")
 
@@ -92,22 +279,23 @@ class PietrzakVDF(VDF):
                 # Update t
                 t = cls.calc_next_step(step=t)
                 # Calculate mi, hash and ri
-                mu_i = square_sequences(a=x_i, steps=t, n=public_params.modulus)
-            exp_previous = exp_non_modular(a=2, exponent=t_previous)
+                mu_i = square_sequences(a=x_i, steps=t, n=public_params.modulus, context=context)
             _log.debug(
                 f"[COMPUTE-PROOF] x_i = {x_i}, y_i={y_i}, t = {t}, t_previous = {t_previous}")
 
             assert NumberTheory.check_quadratic_residue(modulus=public_params.modulus, x=mu_i)
 
-            r_i = cls.flat_shamir_hash(xi=int(x_i), mui=int(mu_i), exponent=exp_previous, yi=y_i,
+            r_i = cls.flat_shamir_hash(xi=int(x_i), mui=int(mu_i), delay=t_previous, yi=y_i,
                                        public_params=public_params)
             _log.debug(f"[COMPUTE-PROOF] r_i = {r_i}")
 
             # Update x_i any y_i
-            x_i = NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=public_params.modulus), v=mu_i,
-                                        n=public_params.modulus)
-            y_i = NumberTheory.multiply(u=exp_modular(a=mu_i, exponent=r_i, n=public_params.modulus), v=y_i,
-                                        n=public_params.modulus)
+            x_i = NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=public_params.modulus,
+                                                      backend=cls.backend),
+                                        v=mu_i, n=public_params.modulus, backend=cls.backend)
+            y_i = NumberTheory.multiply(u=exp_modular(a=mu_i, exponent=r_i, n=public_params.modulus,
+                                                      backend=cls.backend),
+                                        v=y_i, n=public_params.modulus, backend=cls.backend)
 
             _log.debug(f"[COMPUTE-PROOF] x_i = {x_i} and y_i = {y_i}\n")
             mu.append(mu_i)
@@ -115,6 +303,122 @@ class PietrzakVDF(VDF):
         _log.info(f"[COMPUTE-PROOF] Proof: {mu}")
         return y, mu
 
+    @staticmethod
+    def power_from_checkpoints(step: int, checkpoints: List[int], interval: int, last: int, total: int, n: int,
+                               context: ModulusContext = None) -> int:
+        """
+        Get x^{2^step} from the checkpoints x^{2^(j * interval)} and the last value x^{2^total}
+
+        Args:
+            step: exponent of the power of 2
+            checkpoints: pre-calculated x^{2^(j * interval)}s for j * interval < total
+            interval: distance between two checkpoints
+            last: x^{2^total}
+            total: number of squarings of the evaluation
+            n: modulus
+            context: arithmetic context of the modulus n
+        Returns:
+            x^{2^step} (mod n), up to the sign
+        """
+        if step >= total:
+            c, remaining = last, step - total
+        else:
+            c, remaining = checkpoints[step // interval], step % interval
+        return exp_modular(a=c, exponent=1 << remaining, n=n, context=context)
+
+    @classmethod
+    @set_level(logger=_log)
+    def compute_proof_checkpoints(cls, public_params: PublicParams, input_param, interval: int = None,
+                                  _verbose: bool = False, _hide: bool = False) -> Tuple[int, List[int]]:
+        """
+        Compute the output and the proof storing the checkpoints x^{2^(j * interval)} during the evaluation.
+        Each x_i is kept as prod_k (x^{2^{s_k}})^{e_k}, so mu_i = x_i^{2^t} = prod_k (x^{2^{s_k + t}})^{e_k} is a
+        multi-exponentiation (multi_exp) of the checkpoints instead of t fresh squarings. Once t is small enough for the
+        direct squaring of x_i to be cheaper, mu_i is squared directly. The output is the same as compute_proof.
+
+        Args:
+            public_params: public parameters
+            input_param: input of the VDF x
+            interval: distance between two checkpoints (default about sqrt(delay)), the smaller the interval the
+             more memory is used and the faster is the proof
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+        Returns:
+            output y and proof [mu_1, ..., mu_k]
+        """
+        n = public_params.modulus
+        total = cls.chain_length(public_params.delay)
+        if interval is None:
+            interval = max(1, math.isqrt(total))
+        last, checkpoints = square_sequences_checkpoints(a=input_param, steps=total, n=n, interval=interval,
+                                                         context=cls.modulus_context(n))
+        return cls.proof_from_checkpoints(public_params=public_params, input_param=input_param, last=last,
+                                          checkpoints=checkpoints, interval=interval)
+
+    @classmethod
+    def proof_from_checkpoints(cls, public_params: PublicParams, input_param: int, last: int, checkpoints: List[int],
+                               interval: int) -> Tuple[int, List[int]]:
+        """
+        Output and proof of compute_proof_checkpoints from the checkpoints of the evaluation
+
+        Args:
+            public_params: public parameters
+            input_param: input of the VDF x
+            last: x^{2^total} for total = chain_length(delay)
+            checkpoints: x^{2^(j * interval)}s for j * interval < total
+            interval: distance between two checkpoints
+        Returns:
+            output y and proof [mu_1, ..., mu_k]
+        """
+        n = public_params.modulus
+        context = cls.modulus_context(n)
+        total = cls.chain_length(public_params.delay)
+        y = NumberTheory.modular_abs(last, n) if total > 0 else last
+        x_i = input_param
+        y_i = y
+        _log.info(f"[COMPUTE-PROOF] Initial state: x = {x_i}, y = {y_i}, {len(checkpoints)} checkpoints")
+
+        # x_i = prod (x^{2^shift})^exponent for (shift, exponent) in terms
+        terms = [(0, 1)]
+        mu = []
+        t = public_params.delay
+        while int(t) > 1:
+            t_previous = t
+            t = cls.calc_next_step(step=t)
+            if terms is not None:
+                # the squarings of the multi-exponentiation are shared by all the terms
+                cost = max(e.bit_length() for _, e in terms) + sum(
+                    0.5 * e.bit_length() + ((s + t) % interval if s + t < total else s + t - total) for s, e in terms)
+                if cost > t:
+                    _log.debug(f"[COMPUTE-PROOF] Switching to direct squaring for t = {t}")
+                    terms = None
+            if terms is not None:
+                bases = [cls.power_from_checkpoints(step=s + t, checkpoints=checkpoints, interval=interval, last=last,
+                                                    total=total, n=n, context=context) for s, _ in terms]
+                mu_i = multi_exp(bases=bases, exponents=[e for _, e in terms], n=n, backend=cls.backend)
+                mu_i = NumberTheory.modular_abs(mu_i, n)
+            else:
+                mu_i = square_sequences(a=x_i, steps=t, n=n, context=context)
+            _log.debug(f"[COMPUTE-PROOF] x_i = {x_i}, y_i={y_i}, t = {t}, t_previous = {t_previous}")
+
+            assert NumberTheory.check_quadratic_residue(modulus=n, x=mu_i)
+
+            r_i = cls.flat_shamir_hash(xi=int(x_i), mui=int(mu_i), delay=t_previous, yi=y_i,
+                                       public_params=public_params)
+            _log.debug(f"[COMPUTE-PROOF] r_i = {r_i}")
+
+            x_i = NumberTheory.multiply(u=exp_modular(a=x_i, exponent=r_i, n=n, backend=cls.backend), v=mu_i, n=n,
+                                        backend=cls.backend)
+            y_i = NumberTheory.multiply(u=exp_modular(a=mu_i, exponent=r_i, n=n, backend=cls.backend), v=y_i, n=n,
+                                        backend=cls.backend)
+            if terms is not None:
+                terms = [(s, e * r_i) for s, e in terms if r_i != 0] + [(s + t, e) for s, e in terms]
+
+            _log.debug(f"[COMPUTE-PROOF] x_i = {x_i} and y_i = {y_i}\n")
+            mu.append(mu_i)
+        _log.info(f"[COMPUTE-PROOF] Proof: {mu}")
+        return y, mu
+
 
 if __name__ == '__main__':
     pp = PietrzakVDF.setup(security_param=100, delay=8)
@@ -1,17 +1,108 @@
+import asyncio
+import functools
+import inspect
+import random
+import secrets
 from abc import ABC, abstractmethod
-from typing import Union, List
+from concurrent.futures import Executor
+from multiprocessing import Pool
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Tuple, Union, List
 
-from crypto_VDF.custom_errors.custom_exceptions import PrimeNumberNotFound
-from crypto_VDF.data_transfer_objects.dto import PublicParams, RsaPrimes, RsaSetup, EvalResponse
+from crypto_VDF import settings
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException, PrimeNumberNotFound
+from crypto_VDF.data_transfer_objects.dto import PublicParams, RsaPrimes, RsaSetup, EvalProgress, EvalResponse, \
+    EvalState
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend
+from crypto_VDF.utils.eval_state import SAVE_EVERY, advance_state, load_state, new_state, state_path
+from crypto_VDF.utils.montgomery import ModulusContext, get_modulus_context
 from crypto_VDF.utils.prime_numbers import PrimNumbers
-from crypto_VDF.utils.utils import square_sequences
+from crypto_VDF.utils.utils import create_path_to_data_folder_v2, exp_modular, square_sequences
+from crypto_VDF.verifiable_delay_functions.async_eval import PROGRESS_EVERY, progress_messages
+from crypto_VDF.verifiable_delay_functions.deferred import ProofHandle
+
+
+# state of the eval_many worker processes, set once per process by _init_eval_worker
+_worker_state = {}
+
+
+def _init_eval_worker(vdf, setup, backend: str, reduction: str, eval_kwargs: dict) -> None:
+    """
+    Initializer of the eval_many workers: the parameters are received once per process, and the random generator of
+    the process is re-seeded from the OS, since forked workers inherit the state of the parent
+    """
+    random.seed(secrets.randbits(128))
+    vdf.set_backend(backend)
+    vdf.set_reduction(reduction)
+    _worker_state.update(vdf=vdf, setup=setup, eval_kwargs=eval_kwargs)
+
+
+def _eval_worker(input_param: int) -> EvalResponse:
+    response = _worker_state["vdf"].eval(_worker_state["setup"], input_param, **_worker_state["eval_kwargs"])
+    response.input_param = input_param
+    return response
 
 
 class VDF(ABC):
+    name: str = "vdf"
+    backend: ArithmeticBackend = get_backend()
+    reduction: str = settings.modular_reduction
+
+    @classmethod
+    def set_backend(cls, backend: Union[str, ArithmeticBackend]) -> None:
+        """
+        Set the big-integer arithmetic backend used by the VDF
+
+        Args:
+            backend: backend name ('int', 'gmpy2' or 'auto') or backend instance
+        """
+        cls.backend = get_backend(backend)
+
+    @classmethod
+    def set_reduction(cls, reduction: str) -> None:
+        """
+        Set the modular reduction of the squaring chains and exponentiations of the VDF
+
+        Args:
+            reduction: 'native', 'montgomery' or 'barrett'
+        """
+        get_modulus_context(n=3, reduction=reduction, backend=cls.backend)
+        cls.reduction = reduction
+
+    @classmethod
+    def modulus_context(cls, n: int) -> ModulusContext:
+        """
+        Arithmetic context of the modulus of the public parameters, created once per modulus
+
+        Args:
+            n: modulus
+        Returns:
+            arithmetic context with the reduction and the backend of the VDF
+        """
+        return get_modulus_context(n=n, reduction=cls.reduction, backend=cls.backend)
+
+    @classmethod
+    @abstractmethod
+    def setup(cls, security_param: int, delay: int, workers: int = None):
+        pass
 
     @classmethod
     @abstractmethod
-    def setup(cls, security_param: int, delay: int):
+    def params_from_modulus(cls, n: int, security_param: int, delay: int, phi: int = None, p: int = None,
+                            q: int = None):
+        """
+        Public parameters of an existing modulus (e.g. a modulus of the parameter store)
+
+        Args:
+            n: RSA modulus
+            security_param: bit length of the modulus
+            delay: delay of the VDF
+            phi: order of the group Z_N^* (trapdoor, optional)
+            p: first prime factor of the modulus (trapdoor, optional)
+            q: second prime factor of the modulus (trapdoor, optional)
+        Returns:
+            public parameters of the VDF
+        """
         pass
 
     @classmethod
@@ -49,13 +140,348 @@ class VDF(ABC):
 
     @classmethod
     def eval_function(cls, public_params, input_param):
-        return square_sequences(steps=public_params.delay, a=input_param, n=public_params.modulus)
+        return square_sequences(steps=public_params.delay, a=input_param, n=public_params.modulus,
+                                backend=cls.backend, context=cls.modulus_context(public_params.modulus))
 
-    @staticmethod
-    def generate_rsa_primes(security_param) -> RsaPrimes:
+    @classmethod
+    @abstractmethod
+    def state_interval(cls, setup: Union[PublicParams, RsaSetup]) -> int:
+        """
+        Distance between two checkpoints of the eval states of the VDF for the setup
+        """
+        pass
+
+    @classmethod
+    def chain_length(cls, delay: int) -> int:
+        """
+        Number of squarings of the evaluation for the delay
+        """
+        return delay
+
+    @classmethod
+    def output_from_state(cls, setup: Union[PublicParams, RsaSetup], state: EvalState) -> int:
+        """
+        Output of the VDF from an eval state at the step chain_length(setup.delay), known before the proof
+        """
+        return state.value
+
+    @classmethod
+    @abstractmethod
+    def proof_from_state(cls, setup: Union[PublicParams, RsaSetup], state: EvalState) -> EvalResponse:
+        """
+        Output and proof of the VDF from an eval state at the step chain_length(setup.delay)
+        """
+        pass
+
+    @classmethod
+    def eval_state(cls, setup: Union[PublicParams, RsaSetup], input_param: int, state: EvalState = None,
+                   path: Path = None, save_every: int = SAVE_EVERY) -> Tuple[EvalResponse, EvalState]:
+        """
+        Continuation eval: the squarings start from the state of a previous evaluation of the same input (e.g. at a
+        smaller delay), so that reaching the delay 4T after T costs 3T squarings. The proof is computed from the
+        checkpoints of the state.
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            state: state returned by a previous evaluation of the input (new state if None)
+            path: file where the state is written while squaring (not written if None)
+            save_every: number of squarings between two writes of the state
+        Returns:
+            Output of the VDF and Proof, and the state of the evaluation at the delay of the setup
+        Raises:
+            GeneralException if the state is not a state of the input under the modulus of the setup
+        """
+        modulus = setup.modulus if isinstance(setup, PublicParams) else setup.n
+        if state is None:
+            state = new_state(scheme=cls.name, modulus=modulus, input_param=input_param,
+                              interval=cls.state_interval(setup))
+        elif (state.scheme, state.modulus, state.input_param) != (cls.name, modulus, input_param):
+            raise GeneralException(message="The state is not a state of the input under the modulus of the setup")
+        else:
+            # the state of the caller is left as it is
+            state = state.copy(deep=True)
+        state = advance_state(state=state, steps=cls.chain_length(setup.delay), context=cls.modulus_context(modulus),
+                              path=path, save_every=save_every)
+        return cls.proof_from_state(setup=setup, state=state), state
+
+    @classmethod
+    def eval_resumable(cls, setup: Union[PublicParams, RsaSetup], input_param: int,
+                       checkpoint_dir: Union[str, Path] = None, resume: bool = True,
+                       save_every: int = SAVE_EVERY) -> EvalResponse:
+        """
+        Resumable eval: the state of the evaluation is written to a file of the checkpoint directory every
+        save_every squarings, and an evaluation of the same (setup, input) restarts from the last written state,
+        including after a crash or at a larger delay
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            checkpoint_dir: directory of the states (data/checkpoints if None)
+            resume: restart from the saved state, if any
+            save_every: number of squarings between two writes of the state
+        Returns:
+            Output of the VDF and Proof
+        """
+        if checkpoint_dir is None:
+            checkpoint_dir = create_path_to_data_folder_v2() / "checkpoints"
+        modulus = setup.modulus if isinstance(setup, PublicParams) else setup.n
+        state = new_state(scheme=cls.name, modulus=modulus, input_param=input_param,
+                          interval=cls.state_interval(setup))
+        path = state_path(directory=checkpoint_dir, state=state)
+        if resume:
+            state = load_state(path=path, state=state)
+        response, _ = cls.eval_state(setup=setup, input_param=input_param, state=state, path=path,
+                                     save_every=save_every)
+        return response
+
+    @classmethod
+    def eval_deferred(cls, setup: Union[PublicParams, RsaSetup], input_param: int,
+                      executor: Executor = None) -> ProofHandle:
+        """
+        Output-first eval: returns as soon as the squaring chain ends, with a handle computing the proof lazily on
+        its first access, or in the background on the executor (e.g. a ProcessPoolExecutor). Until the proof is
+        computed, the handle only keeps the output and the checkpoints of the chain.
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            executor: executor computing the proof in the background (proof computed on first access if None)
+        Returns:
+            handle with the output in output and the proof given by proof()
+        """
+        modulus = setup.modulus if isinstance(setup, PublicParams) else setup.n
+        state = advance_state(state=new_state(scheme=cls.name, modulus=modulus, input_param=input_param,
+                                              interval=cls.state_interval(setup)),
+                              steps=cls.chain_length(setup.delay), context=cls.modulus_context(modulus))
+        return ProofHandle(vdf=cls, setup=setup, state=state, executor=executor)
+
+    @classmethod
+    def eval_multi_delay(cls, setup: Union[PublicParams, RsaSetup], input_param: int, delays: List[int],
+                         workers: int = None) -> List[EvalResponse]:
+        """
+        Outputs and proofs of one input for several delays from a single squaring chain: the chain is squared once up
+        to the largest delay, the state is taken at the end of each delay, and the proof of each delay is computed
+        from its state. With workers, the proofs are computed by a pool of processes while the chain goes on.
+
+        Args:
+            setup: public parameters (the delay is replaced by each of the delays)
+            input_param: input of the VDF
+            delays: delays of the outputs
+            workers: number of processes computing the proofs (computed in the calling process if None or 1)
+        Returns:
+            Output of the VDF and Proof for each delay, in the order of delays
+        """
+        modulus = setup.modulus if isinstance(setup, PublicParams) else setup.n
+        ordered = sorted(set(delays))
+        state = new_state(scheme=cls.name, modulus=modulus, input_param=input_param,
+                          interval=cls.state_interval(setup.copy(update={"delay": ordered[-1]})))
+        context = cls.modulus_context(modulus)
+        pool = Pool(processes=workers, initializer=_init_eval_worker,
+                    initargs=(cls, setup, cls.backend.name, cls.reduction, {})) \
+            if workers is not None and workers > 1 else None
+        responses = {}
+        try:
+            for delay in ordered:
+                params = setup.copy(update={"delay": delay})
+                state = advance_state(state=state, steps=cls.chain_length(delay), context=context)
+                if pool is not None:
+                    # the chain goes on in place while the snapshot of the state is sent to the pool
+                    snapshot = state.copy(update={"checkpoints": list(state.checkpoints)})
+                    responses[delay] = pool.apply_async(cls.proof_from_state, (params, snapshot))
+                else:
+                    responses[delay] = cls.proof_from_state(setup=params, state=state)
+            if pool is not None:
+                responses = {delay: response.get() for delay, response in responses.items()}
+        finally:
+            if pool is not None:
+                pool.terminate()
+        return [responses[delay] for delay in delays]
+
+    @classmethod
+    def eval_many(cls, setup: Union[PublicParams, RsaSetup], inputs: Iterable[int], workers: int = None,
+                  **eval_kwargs) -> Iterator[EvalResponse]:
+        """
+        Evaluate many independent inputs under the same parameters on a pool of processes. The parameters are sent
+        once to each worker by the pool initializer, which also gives each worker its own random seed.
+
+        Args:
+            setup: public parameters
+            inputs: inputs of the VDF
+            workers: number of processes (evaluation in the calling process if None or 1)
+            eval_kwargs: keyword arguments of eval (e.g. checkpoint_interval), _hide defaults to True
+        Returns:
+            generator of the responses of eval, in completion order, with the input in input_param
+        """
+        eval_kwargs.setdefault("_hide", True)
+        if workers is None or workers <= 1:
+            for input_param in inputs:
+                response = cls.eval(setup, input_param, **eval_kwargs)
+                response.input_param = input_param
+                yield response
+            return
+        with Pool(processes=workers, initializer=_init_eval_worker,
+                  initargs=(cls, setup, cls.backend.name, cls.reduction, eval_kwargs)) as pool:
+            yield from pool.imap_unordered(_eval_worker, inputs)
+
+    @classmethod
+    def aeval_progress(cls, setup: Union[PublicParams, RsaSetup], input_param: int,
+                       chunk: int = PROGRESS_EVERY) -> AsyncIterator[EvalProgress]:
+        """
+        Asynchronous eval in a worker process, as an async iterator of the progress (steps done, squarings per second
+        and ETA in seconds) reported every chunk squarings. The last item carries the output and proof in response.
+        Cancelling the consumer (or leaving the iteration) stops the worker at its next chunk boundary.
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            chunk: number of squarings between two progress reports
+        Returns:
+            async iterator of the progress of the evaluation
+        """
+        return progress_messages(vdf=cls, setup=setup, input_param=input_param, chunk=chunk)
+
+    @classmethod
+    async def aeval(cls, setup: Union[PublicParams, RsaSetup], input_param: int,
+                    progress: Callable[[EvalProgress], Union[None, Awaitable[None]]] = None,
+                    chunk: int = PROGRESS_EVERY) -> EvalResponse:
+        """
+        Asynchronous eval: the squarings run in a worker process, and the evaluation is cancelled at the next chunk
+        boundary when the awaiting task is cancelled
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            progress: function (or coroutine function) called with the progress every chunk squarings
+            chunk: number of squarings between two progress reports
+        Returns:
+            Output of the VDF and Proof
+        """
+        reports = cls.aeval_progress(setup=setup, input_param=input_param, chunk=chunk)
+        try:
+            async for report in reports:
+                if report.response is not None:
+                    return report.response
+                if progress is not None:
+                    result = progress(report)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            await reports.aclose()
+
+    @classmethod
+    async def averify(cls, setup: Union[PublicParams, RsaSetup], input_param: int, output_param: int,
+                      proof: Union[List[int], int], executor: Executor = None) -> bool:
+        """
+        Asynchronous verify, run on the executor (default executor of the event loop if None)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(cls.verify, setup, input_param, output_param,
+                                                                      proof, _hide=True))
+
+    @classmethod
+    async def aeval_many(cls, setup: Union[PublicParams, RsaSetup], inputs: Iterable[int], workers: int = None,
+                         progress: Callable[[EvalProgress], Union[None, Awaitable[None]]] = None,
+                         chunk: int = PROGRESS_EVERY) -> AsyncIterator[EvalResponse]:
+        """
+        Asynchronous eval_many: each input is evaluated by aeval in its own worker process, with at most workers
+        evaluations at once (one if None)
+
+        Args:
+            setup: public parameters
+            inputs: inputs of the VDF
+            workers: maximum number of simultaneous evaluations
+            progress: function (or coroutine function) called with the progress of each input
+            chunk: number of squarings between two progress reports
+        Returns:
+            async iterator of the responses, in completion order, with the input in input_param
+        """
+        semaphore = asyncio.Semaphore(workers or 1)
+
+        async def evaluate(input_param: int) -> EvalResponse:
+            async with semaphore:
+                return await cls.aeval(setup=setup, input_param=input_param, progress=progress, chunk=chunk)
+
+        tasks = [asyncio.ensure_future(evaluate(input_param)) for input_param in inputs]
         try:
-            resp_q = PrimNumbers.k_bit_prim_number(security_param // 2, t=100000)
-            resp_p = PrimNumbers.k_bit_prim_number(security_param // 2, t=100000)
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @classmethod
+    def crt_exp(cls, a: int, exp_p: int, exp_q: int, p: int, q: int, q_inv: int) -> int:
+        """
+        a^e mod pq from e reduced modulo p - 1 and q - 1, recombined with Garner's formula
+
+        Args:
+            a: number to exponentiate
+            exp_p: exponent modulo p - 1
+            exp_q: exponent modulo q - 1
+            p: first prime factor
+            q: second prime factor
+            q_inv: inverse of q modulo p
+        Returns:
+            a^e (mod pq)
+        """
+        # Fermat's reduction of the exponent does not hold for a multiple of the prime, whose power is 0
+        a_p, a_q = a % p, a % q
+        y_p = exp_modular(a=a_p, exponent=exp_p, n=p, backend=cls.backend) if a_p else 0
+        y_q = exp_modular(a=a_q, exponent=exp_q, n=q, backend=cls.backend) if a_q else 0
+        return y_q + q * (((y_p - y_q) * q_inv) % p)
+
+    @classmethod
+    def generate_rsa_primes(cls, security_param, workers: int = None) -> RsaPrimes:
+        """
+        Generate the two primes of the RSA modulus
+
+        Args:
+            security_param: bit length of the modulus
+            workers: number of processes searching primes concurrently (sequential search if None or 1)
+        Returns:
+            RsaPrimes(p, q)
+        Raises:
+            Raises PrimeNumberNotFound if a prime number is not found
+        """
+        if workers is not None and workers > 1:
+            primes = cls.generate_rsa_primes_parallel(security_param=security_param, workers=workers)
+            if primes is not None:
+                return primes
+        try:
+            resp_q = PrimNumbers.sieved_prime_number(security_param // 2, backend=cls.backend)
+            resp_p = PrimNumbers.sieved_prime_number(security_param // 2, backend=cls.backend)
+            while resp_p.base_10 == resp_q.base_10:
+                resp_p = PrimNumbers.sieved_prime_number(security_param // 2, backend=cls.backend)
         except PrimeNumberNotFound as exc:
             raise exc
         return RsaPrimes(p=resp_p, q=resp_q)
+
+    @classmethod
+    def generate_rsa_primes_parallel(cls, security_param: int, workers: int) -> Union[RsaPrimes, None]:
+        """
+        Run one prime search per worker process, each with its own random seed, and keep the first two distinct
+        primes found. The pool is terminated as soon as they are found, cancelling the other searches.
+
+        Args:
+            security_param: bit length of the modulus
+            workers: number of worker processes (at least 2)
+        Returns:
+            RsaPrimes(p, q), or None if fewer than two distinct primes were found
+        """
+        tasks = [(security_param // 2, secrets.randbits(128), cls.backend.name) for _ in range(max(2, workers))]
+        found = []
+        with Pool(processes=len(tasks)) as pool:
+            try:
+                for prime in pool.imap_unordered(PrimNumbers.seeded_prime_number, tasks):
+                    if all(prime.base_10 != item.base_10 for item in found):
+                        found.append(prime)
+                    if len(found) == 2:
+                        break
+            except PrimeNumberNotFound:
+                pass
+            pool.terminate()
+        if len(found) < 2:
+            return None
+        return RsaPrimes(p=found[0], q=found[1])
@@ -1,19 +1,27 @@
 import hashlib
+import math
+import secrets
+import sys
 from functools import reduce
-from typing import List, Union
+from multiprocessing import Pool
+from time import perf_counter
+from typing import Iterable, List, Tuple, Union
 
-from crypto_VDF.data_transfer_objects.dto import RsaSetup, EvalResponse
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import RsaSetup, EvalResponse, EvalState, BatchVerifyResponse
+from crypto_VDF.utils.exponentiation import multi_exp
+from crypto_VDF.utils.hash_to_prime import hash_to_prime
 from crypto_VDF.utils.logger import set_level, get_logger
 from crypto_VDF.utils.number_theory import NumberTheory
-from crypto_VDF.utils.utils import hash_function, exp_non_modular, exp_modular, square_sequences_v2
+from crypto_VDF.utils.utils import exp_non_modular, exp_modular, square_sequences_v2, square_sequences_checkpoints
 from crypto_VDF.verifiable_delay_functions.vdf import VDF
-from sympy import nextprime, isprime
 import random
 
 _log = get_logger(__name__)
 
 
 class WesolowskiVDF(VDF):
+    name = "wesolowski"
 
     @staticmethod
     def alg_4_original(delay, prime_l, input_var, n):
@@ -43,26 +51,118 @@ class WesolowskiVDF(VDF):
         return x, bs, rs
 
     @classmethod
-    def setup(cls, security_param: int, delay: int, ret_sk: bool = False) -> RsaSetup:
-        primes = cls.generate_rsa_primes(security_param=security_param)
+    def setup(cls, security_param: int, delay: int, ret_sk: bool = False, workers: int = None) -> RsaSetup:
+        primes = cls.generate_rsa_primes(security_param=security_param, workers=workers)
         p, q = primes.p.base_10, primes.q.base_10
         if ret_sk:
-            return RsaSetup(n=p * q, phi=(p - 1) * (q - 1), security_param=security_param, delay=delay)
-        else:
-            return RsaSetup(n=p * q, security_param=security_param, delay=delay)
+            return cls.params_from_modulus(n=p * q, security_param=security_param, delay=delay,
+                                           phi=(p - 1) * (q - 1), p=p, q=q)
+        return cls.params_from_modulus(n=p * q, security_param=security_param, delay=delay)
+
+    @classmethod
+    def params_from_modulus(cls, n: int, security_param: int, delay: int, phi: int = None, p: int = None,
+                            q: int = None) -> RsaSetup:
+        return RsaSetup(n=n, phi=phi, p=p, q=q, security_param=security_param, delay=delay)
+
+    @classmethod
+    def state_interval(cls, setup: RsaSetup) -> int:
+        kappa, gamma = cls.proof_parameters(delay=setup.delay, security_param=setup.security_param)
+        return kappa * gamma
+
+    @classmethod
+    def output_from_state(cls, setup: RsaSetup, state: EvalState) -> int:
+        return NumberTheory.modular_abs(state.value, setup.n) if state.step > 0 else state.value
+
+    @classmethod
+    def proof_from_state(cls, setup: RsaSetup, state: EvalState) -> EvalResponse:
+        """
+        Windowed proof from the checkpoints of the state, with the window size kappa minimising the number of
+        multiplications among the ones for which kappa * gamma can be a multiple of the interval of the state
+        """
+        best = None
+        for kappa in range(1, max(2, setup.delay.bit_length())):
+            gamma = state.interval // math.gcd(state.interval, kappa)
+            cost = setup.delay / kappa + gamma * (kappa + (1 << (kappa + 1)))
+            if best is None or cost < best[0]:
+                best = (cost, kappa, gamma)
+        _, kappa, gamma = best
+        proof = cls.compute_proof_opt(setup=setup, input_param=state.input_param, output_param=state.value,
+                                      output_list=[cls.backend.mpz(item) for item in state.checkpoints],
+                                      interval=state.interval, kappa=kappa, gamma=gamma)
+        return EvalResponse(output=cls.output_from_state(setup=setup, state=state), proof=proof)
 
     @classmethod
     def trapdoor(cls, input_param: int, setup: RsaSetup) -> EvalResponse:
-        exp = exp_modular(a=2, exponent=setup.delay, n=setup.phi)
-        y = exp_modular(a=input_param, exponent=exp, n=setup.n)
+        """
+        Evaluation with the secret key: by CRT when the factors p and q are in the setup, otherwise modulo phi
+
+        Args:
+            input_param: input of the VDF
+            setup: setup with phi, and optionally p and q
+        Returns:
+            Output of the VDF and Proof
+        """
+        if setup.p is not None and setup.q is not None:
+            return cls.trapdoor_crt(input_param=input_param, setup=setup)
+        exp = exp_modular(a=2, exponent=setup.delay, n=setup.phi, backend=cls.backend)
+        y = NumberTheory.modular_abs(exp_modular(a=input_param, exponent=exp, n=setup.n, backend=cls.backend), setup.n)
         prime_l = cls.flat_shamir_hash(security_param=setup.security_param, g=input_param, y=y)
         _log.info(f"[TRAPDOOR] Generated prime l: {prime_l}")
-        r = exp % prime_l
-        if (exp - r) % prime_l != 0:
-            raise Exception("Invalid")
-        q = ((exp - r) // prime_l) % setup.phi
-        proof = exp_modular(a=input_param, exponent=q, n=setup.n)
-        return EvalResponse(output=y, proof=proof)
+        # floor(2^T / l) mod phi = (2^T - r) / l mod phi, with 2^T reduced modulo l * phi to keep the division exact
+        r = exp_modular(a=2, exponent=setup.delay, n=prime_l, backend=cls.backend)
+        q = ((exp_modular(a=2, exponent=setup.delay, n=prime_l * setup.phi, backend=cls.backend) - r) // prime_l) \
+            % setup.phi
+        proof = exp_modular(a=input_param, exponent=q, n=setup.n, backend=cls.backend)
+        return EvalResponse(output=y, proof=NumberTheory.modular_abs(proof, setup.n))
+
+    @classmethod
+    def trapdoor_crt(cls, input_param: int, setup: RsaSetup) -> EvalResponse:
+        """
+        Evaluation with the factors p and q of the modulus: the exponents are reduced modulo p - 1 and q - 1, the
+        exponentiations are done modulo p and q, and the results are recombined by CRT
+
+        Args:
+            input_param: input of the VDF
+            setup: setup with the factors p and q
+        Returns:
+            Output of the VDF and Proof, equal to the ones of eval
+        Raises:
+            GeneralException if the factors are not in the setup
+        """
+        return cls.trapdoor_batch(inputs=[input_param], setup=setup)[0]
+
+    @classmethod
+    def trapdoor_batch(cls, inputs: Iterable[int], setup: RsaSetup) -> List[EvalResponse]:
+        """
+        CRT evaluation of many inputs with the factors p and q of the modulus: the reductions of 2^T modulo p - 1 and
+        q - 1 and the CRT coefficient are computed once for all the inputs
+
+        Args:
+            inputs: inputs of the VDF
+            setup: setup with the factors p and q
+        Returns:
+            Output of the VDF and Proof of each input, in the order of the inputs
+        Raises:
+            GeneralException if the factors are not in the setup
+        """
+        if setup.p is None or setup.q is None:
+            raise GeneralException(message="The CRT trapdoor needs the factors p and q of the setup")
+        p, q, delay = setup.p, setup.q, setup.delay
+        exp_p = exp_modular(a=2, exponent=delay, n=p - 1, backend=cls.backend)
+        exp_q = exp_modular(a=2, exponent=delay, n=q - 1, backend=cls.backend)
+        q_inv = NumberTheory.modular_inverse(a=q, n=p, backend=cls.backend)
+        responses = []
+        for x in inputs:
+            y = NumberTheory.modular_abs(cls.crt_exp(a=x, exp_p=exp_p, exp_q=exp_q, p=p, q=q, q_inv=q_inv), setup.n)
+            prime_l = cls.flat_shamir_hash(security_param=setup.security_param, g=x, y=y)
+            _log.debug(f"[TRAPDOOR-BATCH] Generated prime l: {prime_l}")
+            # floor(2^T / l) mod (p - 1) = (2^T mod l * (p - 1) - r) / l, an integer in [0, p - 1)
+            r = exp_modular(a=2, exponent=delay, n=prime_l, backend=cls.backend)
+            proof_exp_p = (exp_modular(a=2, exponent=delay, n=prime_l * (p - 1), backend=cls.backend) - r) // prime_l
+            proof_exp_q = (exp_modular(a=2, exponent=delay, n=prime_l * (q - 1), backend=cls.backend) - r) // prime_l
+            proof = cls.crt_exp(a=x, exp_p=proof_exp_p, exp_q=proof_exp_q, p=p, q=q, q_inv=q_inv)
+            responses.append(EvalResponse(output=y, proof=NumberTheory.modular_abs(proof, setup.n)))
+        return responses
 
     @staticmethod
     def hash_g(setup: RsaSetup, input_param: int):
@@ -94,25 +194,203 @@ class WesolowskiVDF(VDF):
 
     @classmethod
     @set_level(logger=_log)
-    def eval(cls, setup: RsaSetup, input_param, _verbose: bool = False, _hide: bool = False) -> EvalResponse:
-        y = square_sequences_v2(steps=setup.delay, a=input_param, n=setup.n)
-        _log.info(f"[EVALUATION] VDF output: {y[0]}")
-        if not NumberTheory.gcd(a=y[0], b=setup.n) == 1:
+    def eval(cls, setup: RsaSetup, input_param, _verbose: bool = False, _hide: bool = False,
+             checkpoint_interval: int = None, memory_budget: int = None, windowed: bool = True, kappa: int = None,
+             gamma: int = None) -> EvalResponse:
+        """
+        Eval function. By default, the squarings are done by blocks, only the checkpoints g^{2^(i * kappa * gamma)}
+        are kept, and the proof is computed with the windowed algorithm, with kappa and gamma picked by
+        proof_parameters when they are not given. If checkpoint_interval is given, every checkpoint_interval-th
+        power is kept and the proof is computed bit by bit from those checkpoints. If windowed is False and neither
+        checkpoint_interval nor memory_budget is given, all the g^{2^i} are kept in memory to compute the proof.
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+            checkpoint_interval: store only g^{2^(j * checkpoint_interval)}
+            memory_budget: maximum number of bytes to use to store the checkpoints (ignored if checkpoint_interval
+             is given)
+            windowed: compute the proof with the windowed algorithm
+            kappa: window size of the windowed algorithm
+            gamma: checkpoint spacing (in windows) of the windowed algorithm
+        Returns:
+            Output of the VDF and Proof
+        """
+        if kappa is not None or gamma is not None or (windowed and checkpoint_interval is None):
+            if kappa is None or gamma is None:
+                kappa, gamma = cls.proof_parameters(delay=setup.delay, security_param=setup.security_param,
+                                                    memory_budget=memory_budget, kappa=kappa, gamma=gamma)
+            return cls.eval_checkpoints(setup=setup, input_param=input_param, interval=kappa * gamma, kappa=kappa,
+                                        gamma=gamma)
+        if checkpoint_interval is None and memory_budget is not None:
+            checkpoint_interval = cls.checkpoint_interval(setup=setup, memory_budget=memory_budget)
+        if checkpoint_interval is not None:
+            return cls.eval_checkpoints(setup=setup, input_param=input_param, interval=checkpoint_interval)
+        y = square_sequences_v2(steps=setup.delay, a=input_param, n=setup.n, backend=cls.backend)
+        output = NumberTheory.modular_abs(y[0], setup.n)
+        _log.info(f"[EVALUATION] VDF output: {output}")
+        if not NumberTheory.gcd(a=y[0], b=setup.n, backend=cls.backend) == 1:
             _log.warning(f"Output y = {y[0]} id not invertible in Z{setup.n}")
-        proof = cls.compute_proof_opt(setup=setup, input_param=input_param, output_param=y[0], output_list=y[1])
+        proof = cls.compute_proof_opt(setup=setup, input_param=input_param, output_param=output, output_list=y[1])
+        _log.info(f"[EVALUATION] VDF proof: {proof}")
+        return EvalResponse(output=output, proof=proof)
+
+    @staticmethod
+    def checkpoint_interval(setup: RsaSetup, memory_budget: int) -> int:
+        """
+        Smallest checkpoint interval such that the stored g^{2^(j * interval)} fit in the memory budget
+
+        Args:
+            setup: public parameters
+            memory_budget: maximum number of bytes to use to store the checkpoints
+        Returns:
+            checkpoint interval
+        """
+        max_checkpoints = max(1, memory_budget // sys.getsizeof(setup.n))
+        return max(1, math.ceil(setup.delay / max_checkpoints))
+
+    @staticmethod
+    def proof_parameters(delay: int, security_param: int = None, memory_budget: int = None, kappa: int = None,
+                         gamma: int = None) -> Tuple[int, int]:
+        """
+        Pick the window size kappa and the checkpoint spacing gamma of the windowed proof computation.
+        The number of stored checkpoints ceil(delay / (kappa * gamma)) is bounded by the memory budget (by default
+        about sqrt(delay) checkpoints), and kappa minimises the number of multiplications of the proof,
+        delay / kappa + gamma * (kappa + 2^(kappa + 1)). A given kappa or gamma is kept, and only the other one is
+        picked.
+
+        Args:
+            delay: VDF delay
+            security_param: bit length of the modulus, used to estimate the size of a checkpoint
+            memory_budget: maximum number of bytes to use to store the checkpoints
+            kappa: window size to keep
+            gamma: checkpoint spacing (in windows) to keep
+        Returns:
+            (kappa, gamma)
+        """
+        if memory_budget is None:
+            max_checkpoints = math.isqrt(delay) + 1
+        else:
+            checkpoint_size = sys.getsizeof(1 << (security_param or 1))
+            max_checkpoints = max(1, memory_budget // checkpoint_size)
+        if kappa is not None and gamma is not None:
+            return kappa, gamma
+        best = None
+        for window in [kappa] if kappa is not None else range(1, max(2, delay.bit_length())):
+            spacing = gamma if gamma is not None else max(1, math.ceil(delay / (window * max_checkpoints)))
+            # with a given gamma, the windows storing more checkpoints than the budget come last
+            over_budget = window * spacing * max_checkpoints < delay
+            cost = delay / window + spacing * (window + (1 << (window + 1)))
+            if best is None or (over_budget, cost) < best[0]:
+                best = ((over_budget, cost), window, spacing)
+        return best[1], best[2]
+
+    @classmethod
+    def eval_checkpoints(cls, setup: RsaSetup, input_param: int, interval: int, kappa: int = None,
+                         gamma: int = None) -> EvalResponse:
+        """
+        Eval function storing only one every interval powers of the input
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF
+            interval: distance between two stored powers
+            kappa: window size, if the proof is computed with the windowed algorithm
+            gamma: checkpoint spacing (in windows), if the proof is computed with the windowed algorithm
+        Returns:
+            Output of the VDF and Proof
+        """
+        _log.info(f"[EVALUATION] Storing one every {interval} squarings")
+        y, checkpoints = square_sequences_checkpoints(steps=setup.delay, a=input_param, n=setup.n, interval=interval,
+                                                      context=cls.modulus_context(setup.n))
+        y = NumberTheory.modular_abs(y, setup.n)
+        _log.info(f"[EVALUATION] VDF output: {y}")
+        if not NumberTheory.gcd(a=y, b=setup.n, backend=cls.backend) == 1:
+            _log.warning(f"Output y = {y} id not invertible in Z{setup.n}")
+        proof = cls.compute_proof_opt(setup=setup, input_param=input_param, output_param=y, output_list=checkpoints,
+                                      interval=interval, kappa=kappa, gamma=gamma)
         _log.info(f"[EVALUATION] VDF proof: {proof}")
-        return EvalResponse(output=y[0], proof=proof)
+        return EvalResponse(output=y, proof=proof)
+
+    @staticmethod
+    def segment_delays(delay: int, segments: int) -> List[int]:
+        """
+        Split the delay in segments whose delays differ by at most one (at most delay segments)
+
+        Args:
+            delay: VDF delay
+            segments: number of segments
+        Returns:
+            delays of the segments, the longest first
+        """
+        segments = max(1, min(segments, delay))
+        quotient, remainder = divmod(delay, segments)
+        return [quotient + 1] * remainder + [quotient] * (segments - remainder)
+
+    @classmethod
+    @set_level(logger=_log)
+    def eval_segmented(cls, setup: RsaSetup, input_param: int, segments: int = 4, workers: int = None,
+                       memory_budget: int = None, _verbose: bool = False, _hide: bool = False) -> EvalResponse:
+        """
+        Segmented (n-Wesolowski) eval: the chain is split in segments (segment_delays), and the output y_i of each
+        segment gets its own Wesolowski proof of y_{i-1}^{2^{t_i}} = y_i, with y_0 = x. With workers, the proof of a
+        segment is computed by a pool of processes while the calling process squares the next segments, so that only
+        the proof of the last segment is added to the squaring time.
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF x
+            segments: number of segments
+            workers: number of processes computing the proofs (computed in the calling process if None or 1)
+            memory_budget: maximum number of bytes to use to store the checkpoints of a segment
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+        Returns:
+            Output of the VDF and Proof [y_1, ..., y_{k-1}, pi_1, ..., pi_k] for k segments, checked by
+             verify_segmented
+        """
+        delays = cls.segment_delays(delay=setup.delay, segments=segments)
+        _log.info(f"[EVALUATION-SEGMENTED] {len(delays)} segments of delays {delays}")
+        context = cls.modulus_context(setup.n)
+        pool = Pool(processes=workers) if workers is not None and workers > 1 else None
+        outputs, proofs = [], []
+        try:
+            x = input_param
+            for delay in delays:
+                segment = setup.copy(update={"delay": delay})
+                kappa, gamma = cls.proof_parameters(delay=delay, security_param=setup.security_param,
+                                                    memory_budget=memory_budget)
+                y, checkpoints = square_sequences_checkpoints(steps=delay, a=x, n=setup.n, interval=kappa * gamma,
+                                                              context=context)
+                y = int(NumberTheory.modular_abs(y, setup.n))
+                args = (segment, x, y, checkpoints, kappa * gamma, kappa, gamma)
+                if pool is not None:
+                    proofs.append(pool.apply_async(cls.compute_proof_opt, args))
+                else:
+                    proofs.append(cls.compute_proof_opt(*args))
+                outputs.append(y)
+                x = y
+            if pool is not None:
+                proofs = [proof.get() for proof in proofs]
+        finally:
+            if pool is not None:
+                pool.terminate()
+        _log.info(f"[EVALUATION-SEGMENTED] VDF output: {outputs[-1]}")
+        return EvalResponse(output=outputs[-1], proof=outputs[:-1] + proofs)
 
     @classmethod
     @set_level(logger=_log)
     def eval_naive(cls, setup: RsaSetup, input_param, _verbose: bool = False) -> EvalResponse:
-        y = square_sequences_v2(steps=setup.delay, a=input_param, n=setup.n)
-        _log.info(f"[EVALUATION] VDF output: {y[0]}")
-        if not NumberTheory.gcd(a=y[0], b=setup.n) == 1:
+        y = square_sequences_v2(steps=setup.delay, a=input_param, n=setup.n, backend=cls.backend)
+        output = NumberTheory.modular_abs(y[0], setup.n)
+        _log.info(f"[EVALUATION] VDF output: {output}")
+        if not NumberTheory.gcd(a=y[0], b=setup.n, backend=cls.backend) == 1:
             _log.warning(message=f"Output y = {y[0]} is not invertible in Z{setup.n}")
-        proof = cls.compute_proof_naive(setup=setup, input_param=input_param, output_param=y[0], delay=setup.delay)
+        proof = cls.compute_proof_naive(setup=setup, input_param=input_param, output_param=output, delay=setup.delay)
         _log.info(f"[EVALUATION] VDF proof: {proof}")
-        return EvalResponse(output=y[0], proof=proof)
+        return EvalResponse(output=output, proof=proof)
 
     @classmethod
     @set_level(logger=_log)
@@ -134,7 +412,8 @@ class WesolowskiVDF(VDF):
         prime_l = cls.flat_shamir_hash(security_param=setup.security_param, g=input_param, y=output_param)
         _log.debug(f"[COMPUTE-PROOF] Generated prime l from flat_shamir_hash: {prime_l}")
         exp = exp_non_modular(a=2, exponent=delay)
-        return exp_modular(a=input_param, exponent=(exp // prime_l), n=setup.n)
+        proof = exp_modular(a=input_param, exponent=(exp // prime_l), n=setup.n, backend=cls.backend)
+        return NumberTheory.modular_abs(proof, setup.n)
 
     @staticmethod
     def get_component(idx: int, select_from: List[int], prime_l: int, delay) -> Union[int, None]:
@@ -174,7 +453,7 @@ class WesolowskiVDF(VDF):
         if not proof_l:
             return 1
         proof = reduce(lambda x, y: (x * y) % n, proof_l)
-        return proof
+        return int(proof)
 
     @classmethod
     def alg_4_revisited(cls, n: int, prime_l: int, delay: int, output_list) -> int:
@@ -198,7 +477,7 @@ class WesolowskiVDF(VDF):
             if b == 1:
                 proof_l.append(output_list[delay - i - 1])
         proof = reduce(lambda x, y: (x * y) % n, proof_l)
-        return proof
+        return int(proof)
 
     @staticmethod
     def compute_contribution(bit_val, output_list, idx, delay):
@@ -209,26 +488,267 @@ class WesolowskiVDF(VDF):
 
     @classmethod
     def compute_proof_opt(cls, setup: RsaSetup, input_param: int, output_param: int,
-                          output_list: List[int]):
-        prime_l = cls.flat_shamir_hash(security_param=setup.security_param, g=input_param, y=output_param)
+                          output_list: List[int], interval: int = 1, kappa: int = None, gamma: int = None) -> int:
+        """
+        Compute the proof g^{\\lfloor 2^t/l \\rfloor} from pre-calculated powers of g, in QR_N^+ (the canonical
+        representative min(pi, n - pi) of +-pi, the only one verify accepts), for the output y in QR_N^+
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF g
+            output_param: output of the VDF y
+            output_list: pre-calculated g^{2^(j * interval)}s
+            interval: distance between two pre-calculated powers
+            kappa: window size of the windowed algorithm (if None, the windowed algorithm is not used)
+            gamma: checkpoint spacing (in windows) of the windowed algorithm, kappa * gamma must be a multiple of
+             interval
+        Returns:
+            proof
+        """
+        prime_l = cls.flat_shamir_hash(security_param=setup.security_param, g=input_param,
+                                       y=NumberTheory.modular_abs(output_param, setup.n))
         _log.debug(f"[COMPUTE-PROOF] Generated prime l from flat_shamir_hash: {prime_l}")
-        proof = cls.alg_4_revisited(n=setup.n, prime_l=prime_l, delay=setup.delay, output_list=output_list)
-        return proof
+        if kappa is not None:
+            if gamma is None:
+                gamma = cls.proof_parameters(delay=setup.delay, security_param=setup.security_param, kappa=kappa)[1]
+            if (kappa * gamma) % interval != 0:
+                raise ValueError(f"kappa * gamma = {kappa * gamma} is not a multiple of the interval {interval}")
+            checkpoints = output_list[::kappa * gamma // interval]
+            proof = cls.alg_4_windowed(n=setup.n, prime_l=prime_l, delay=setup.delay, checkpoints=checkpoints,
+                                       kappa=kappa, gamma=gamma)
+        elif interval != 1:
+            proof = cls.alg_4_checkpoints(n=setup.n, prime_l=prime_l, delay=setup.delay, checkpoints=output_list,
+                                          interval=interval)
+        else:
+            proof = cls.alg_4_revisited(n=setup.n, prime_l=prime_l, delay=setup.delay, output_list=output_list)
+        return NumberTheory.modular_abs(proof, setup.n)
+
+    @staticmethod
+    def quotient_chunks(prime_l: int, delay: int, width: int) -> List[int]:
+        """
+        Split \\lfloor 2^delay/l \\rfloor in chunks of width bits, computed with the long division of Alg 4 without
+         materialising the quotient
+
+        Args:
+            prime_l: prime number l
+            delay: VDF delay
+            width: number of bits per chunk
+        Returns:
+            List of chunks, chunk c being the bits c * width to (c + 1) * width - 1 of the quotient
+        """
+        n_chunks = math.ceil(delay / width)
+        chunks = [0] * n_chunks
+        r = 1
+        for c in range(n_chunks - 1, -1, -1):
+            w = delay - c * width if c == n_chunks - 1 else width
+            chunks[c] = (r << w) // prime_l
+            r = (r << w) % prime_l
+        return chunks
+
+    @classmethod
+    def alg_4_checkpoints(cls, n: int, prime_l: int, delay: int, checkpoints: List[int], interval: int) -> int:
+        """
+        Calculate g^{\\lfloor 2^t/l \\rfloor} from the checkpoints g^{2^(j * interval)} only.
+        Writing the quotient as sum_j q_j 2^(j * interval), the proof is prod_j checkpoints[j]^{q_j}, which is
+        computed with interval squarings shared by all the checkpoints.
+
+        Args:
+            n: modulus
+            prime_l: prime number l
+            delay: VDF delay
+            checkpoints: pre-calculated g^{2^(j * interval)}s
+            interval: distance between two checkpoints
+        Returns:
+            g^{\\lfloor 2^t/l \\rfloor}
+        """
+        _log.info("Starting Alg 4 with checkpoints")
+        chunks = cls.quotient_chunks(prime_l=prime_l, delay=delay, width=interval)
+        proof = 1
+        for bit in range(interval - 1, -1, -1):
+            proof = (proof * proof) % n
+            for chunk, checkpoint in zip(chunks, checkpoints):
+                if (chunk >> bit) & 1:
+                    proof = (proof * checkpoint) % n
+        return int(proof)
+
+    @classmethod
+    def alg_4_windowed(cls, n: int, prime_l: int, delay: int, checkpoints: List[int], kappa: int, gamma: int) -> int:
+        """
+        Windowed computation of g^{\\lfloor 2^t/l \\rfloor} (Wesolowski, section 4.1). The quotient is split in
+        kappa-bit chunks I(c), and the checkpoints are C_i = g^{2^(i * kappa * gamma)}, so that the proof is
+        prod_{j < gamma} (prod_i C_i^{I(i * gamma + j)})^{2^(j * kappa)}. For each j, the checkpoints are first
+        gathered by chunk value b in y_b, then prod_b y_b^b is computed splitting b in two halves of the window.
+
+        Args:
+            n: modulus
+            prime_l: prime number l
+            delay: VDF delay
+            checkpoints: pre-calculated g^{2^(i * kappa * gamma)}s
+            kappa: window size
+            gamma: checkpoint spacing (in windows)
+        Returns:
+            g^{\\lfloor 2^t/l \\rfloor}
+        """
+        _log.info(f"Starting windowed Alg 4 with kappa = {kappa}, gamma = {gamma}")
+        chunks = cls.quotient_chunks(prime_l=prime_l, delay=delay, width=kappa)
+        kappa_1 = kappa // 2
+        kappa_0 = kappa - kappa_1
+        context = cls.modulus_context(n)
+        proof = 1
+        for j in range(gamma - 1, -1, -1):
+            proof = exp_modular(a=proof, exponent=1 << kappa, n=n, context=context)
+            ys = [1] * (1 << kappa)
+            for c, checkpoint in zip(range(j, len(chunks), gamma), checkpoints):
+                if chunks[c] != 0:
+                    ys[chunks[c]] = (ys[chunks[c]] * checkpoint) % n
+            for b_1 in range(1, 1 << kappa_1):
+                z = reduce(lambda u, v: (u * v) % n, ys[b_1 << kappa_0:(b_1 + 1) << kappa_0])
+                proof = (proof * exp_modular(a=z, exponent=b_1 << kappa_0, n=n, context=context)) % n
+            for b_0 in range(1, 1 << kappa_0):
+                z = reduce(lambda u, v: (u * v) % n, ys[b_0::1 << kappa_0])
+                proof = (proof * exp_modular(a=z, exponent=b_0, n=n, context=context)) % n
+        return int(proof)
 
     @classmethod
     @set_level(logger=_log)
     def verify(cls, setup: RsaSetup, input_param: int, output_param: int, proof: int, _verbose: bool = False,
                _hide: bool = False):
+        """
+        Check proof^l * x^r = y in QR_N^+, i.e. up to the sign (as Pietrzak's verification): the elements of order 2
+        cannot be detected by the small exponents test of verify_batch, so both checks work modulo +-1. The output
+        and the proof must be the canonical representatives min(v, n - v) given by eval, so that -y and -pi are not
+        second valid values.
+
+        Returns:
+            True -> output/proof valid, False -> output/proof not valid
+        """
+        if not 0 <= output_param <= setup.n - output_param or not 0 <= proof <= setup.n - proof:
+            return False
         prime_l = cls.flat_shamir_hash(security_param=setup.security_param, g=input_param, y=output_param)
         _log.debug(f"[VERIFY] Generated prime l from flat_shamir_hash: {prime_l}")
-        r = exp_modular(a=2, exponent=setup.delay, n=prime_l)
+        r = exp_modular(a=2, exponent=setup.delay, n=prime_l, backend=cls.backend)
         _log.debug(f"[VERIFY] Value of r = 2^T % n: {r}")
-        if (exp_modular(a=proof, exponent=prime_l, n=setup.n) * exp_modular(a=input_param, exponent=r,
-                                                                            n=setup.n)) % setup.n == output_param:
+        lhs = multi_exp(bases=[proof, input_param], exponents=[prime_l, r], n=setup.n, backend=cls.backend)
+        if NumberTheory.modular_abs(lhs, setup.n) == output_param:
             return True
         else:
             return False
 
+    @classmethod
+    @set_level(logger=_log)
+    def verify_segmented(cls, setup: RsaSetup, input_param: int, output_param: int, proof: List[int],
+                         _verbose: bool = False, _hide: bool = False) -> bool:
+        """
+        Verify a segmented proof of eval_segmented: the number of segments k is given by the length of the proof,
+        and each segment y_{i-1} -> y_i of delay t_i (segment_delays) is checked with its Wesolowski proof
+
+        Args:
+            setup: public parameters
+            input_param: input of the VDF x
+            output_param: output of the VDF y
+            proof: [y_1, ..., y_{k-1}, pi_1, ..., pi_k]
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+        Returns:
+            True -> output/proof valid, False -> output/proof not valid
+        """
+        if len(proof) % 2 == 0 or (len(proof) + 1) // 2 > setup.delay:
+            _log.error(f"[VERIFY-SEGMENTED] Malformed proof of length {len(proof)}")
+            return False
+        k = (len(proof) + 1) // 2
+        outputs = list(proof[:k - 1]) + [output_param]
+        x = input_param
+        for delay, y, segment_proof in zip(cls.segment_delays(delay=setup.delay, segments=k), outputs, proof[k - 1:]):
+            if not 0 <= y < setup.n or not cls.verify(setup.copy(update={"delay": delay}), x, y, segment_proof):
+                _log.info(f"[VERIFY-SEGMENTED] Segment of delay {delay} not valid")
+                return False
+            x = y
+        return True
+
+    @classmethod
+    @set_level(logger=_log)
+    def verify_batch(cls, setup: RsaSetup, triples: Iterable[Tuple[int, int, int]], exponent_bits: int = 64,
+                     _verbose: bool = False, _hide: bool = False) -> BatchVerifyResponse:
+        """
+        Verify many (x, y, proof) triples under the same setup with the small exponents test: the checks
+        proof_i^{l_i} * x_i^{r_i} = y_i are raised to random odd exponents rho_i and multiplied together, so that one
+        combined check is done with a single multi-exponentiation. The proofs sharing the same prime l are gathered
+        before the exponentiation by l, and the primes l and the remainders r = 2^T mod l are computed once per
+        distinct value. When a combined check fails, the batch is bisected to identify the bad entries.
+        The checks hold in QR_N^+ (up to the sign, as in verify) and the outputs and proofs must be canonical: the
+        signs of sign-flipped proofs would cancel in pairs in a combined check, so they are rejected beforehand.
+        Otherwise, a wrong triple passes a combined check with probability about 2^(-exponent_bits).
+
+        Args:
+            setup: public parameters
+            triples: (input x, output y, proof) triples
+            exponent_bits: bit length of the random exponents
+            _verbose: show debug logs
+            _hide: hide all logs except errors
+        Returns:
+            validity of each triple (same as verify), validity of the whole batch, elapsed time (s) and number of
+             proofs verified per second
+        """
+        start = perf_counter()
+        triples = [(int(x), int(y), int(proof)) for x, y, proof in triples]
+        results = [False] * len(triples)
+        primes = {}
+        remainders = {}
+        entries = []
+        for idx, (x, y, proof) in enumerate(triples):
+            # the non canonical outputs and proofs are rejected before the combined checks, as in verify
+            if not 0 <= y <= setup.n - y or not 0 <= proof <= setup.n - proof:
+                continue
+            if (x, y) not in primes:
+                primes[(x, y)] = cls.flat_shamir_hash(security_param=setup.security_param, g=x, y=y)
+            prime_l = primes[(x, y)]
+            if prime_l not in remainders:
+                remainders[prime_l] = exp_modular(a=2, exponent=setup.delay, n=prime_l, backend=cls.backend)
+            entries.append((idx, x, y, proof, prime_l, remainders[prime_l]))
+        _log.info(f"[VERIFY-BATCH] {len(entries)} triples to check, {len(remainders)} distinct primes l")
+
+        batches = [entries] if entries else []
+        while batches:
+            batch = batches.pop()
+            if cls.check_batch(n=setup.n, entries=batch, exponent_bits=exponent_bits if len(batch) > 1 else 0):
+                for entry in batch:
+                    results[entry[0]] = True
+            elif len(batch) > 1:
+                _log.debug(f"[VERIFY-BATCH] Combined check of {len(batch)} triples failed, bisecting")
+                batches += [batch[:len(batch) // 2], batch[len(batch) // 2:]]
+        elapsed = perf_counter() - start
+        _log.info(f"[VERIFY-BATCH] {sum(results)}/{len(results)} valid triples in {elapsed:.4f} s")
+        return BatchVerifyResponse(results=results, valid=all(results), elapsed=elapsed,
+                                   throughput=len(results) / elapsed if elapsed > 0 else float("inf"))
+
+    @classmethod
+    def check_batch(cls, n: int, entries: List[Tuple[int, int, int, int, int, int]], exponent_bits: int) -> bool:
+        """
+        Combined check prod_l (prod_{l_i = l} proof_i^{rho_i})^l * prod_i x_i^{rho_i * r_i} = prod_i y_i^{rho_i} in
+        QR_N^+ (up to the sign)
+
+        Args:
+            n: modulus
+            entries: (index, x, y, proof, l, r) tuples
+            exponent_bits: bit length of the random odd exponents rho_i (0 for rho_i = 1, i.e. the exact check of a
+             single triple)
+        Returns:
+            True if the combined check holds
+        """
+        rhos = [secrets.randbits(exponent_bits) | 1 for _ in entries]
+        groups = {}
+        for rho, (_, _, _, proof, prime_l, _) in zip(rhos, entries):
+            groups.setdefault(prime_l, ([], []))
+            groups[prime_l][0].append(proof)
+            groups[prime_l][1].append(rho)
+        proof_products = [multi_exp(bases=bases, exponents=exponents, n=n, backend=cls.backend)
+                          for bases, exponents in groups.values()]
+        lhs = multi_exp(bases=proof_products + [entry[1] for entry in entries],
+                        exponents=list(groups) + [rho * entry[5] for rho, entry in zip(rhos, entries)], n=n,
+                        backend=cls.backend)
+        rhs = multi_exp(bases=[entry[2] for entry in entries], exponents=rhos, n=n, backend=cls.backend)
+        return NumberTheory.modular_abs(lhs, n) == NumberTheory.modular_abs(rhs, n)
+
     @staticmethod
     def flat_shamir_hash(security_param: int, g: int, y: int) -> int:
         """
@@ -239,11 +759,7 @@ class WesolowskiVDF(VDF):
             g: value in Z_N^*
             y: value in Z_N^*
         Returns:
-            H_g(bin(g)||bin(y))
+            prime of 2 * lambda bits (at most 256 bits) hashed from the byte encoding of g and y, memoised on
+             (g, y, lambda)
         """
-        params = f"{bin(g)[2:]}*{bin(y)[2:]}".encode()
-        h = hash_function(hash_input=params, truncate_to=2 * security_param)
-        if isprime(h) is True:
-            return h
-        else:
-            return nextprime(h)
+        return hash_to_prime(g=int(g), y=int(y), security_param=security_param)
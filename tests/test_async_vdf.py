@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+
+from crypto_VDF.data_transfer_objects.dto import PublicParams, RsaSetup
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
+
+MODULUS = 260397651547576035527008437293696027923
+X = 15290776003867498194639638
+
+
+class TestAsyncVDF(unittest.IsolatedAsyncioTestCase):
+
+    async def test_aeval(self):
+        pp = PublicParams(delay=1024, modulus=MODULUS, security_param=128)
+        setup = RsaSetup(delay=1000, n=MODULUS, security_param=128)
+        for vdf, params in [(PietrzakVDF, pp), (WesolowskiVDF, setup)]:
+            reports = []
+            response = await vdf.aeval(params, X, progress=reports.append, chunk=300)
+            expected = vdf.eval(params, X)
+            self.assertEqual((response.output, response.proof), (expected.output, expected.proof))
+            self.assertEqual([report.steps for report in reports][:2], [300, 600])
+            self.assertEqual(reports[-1].steps, reports[-1].total)
+            self.assertTrue(all(report.rate > 0 for report in reports))
+            self.assertTrue(await vdf.averify(params, X, response.output, response.proof))
+            self.assertFalse(await vdf.averify(params, X, response.output + 1, response.proof))
+
+            responses = [response async for response in vdf.aeval_many(params, [X, 2, 3], workers=2)]
+            self.assertEqual(sorted(response.input_param for response in responses), [2, 3, X])
+            for response in responses:
+                self.assertEqual(response.output, vdf.eval(params, response.input_param).output)
+
+    async def test_cancel(self):
+        setup = RsaSetup(delay=10 ** 9, n=MODULUS, security_param=128)
+        reports = []
+        task = asyncio.ensure_future(WesolowskiVDF.aeval(setup, X, progress=reports.append, chunk=1000))
+        while not reports:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=30)
+        self.assertLess(reports[-1].steps, setup.delay)
+        self.assertGreater(reports[-1].eta, 0)
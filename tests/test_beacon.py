@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import BeaconHeader, BeaconRecord, PublicParams, RsaSetup
+from crypto_VDF.verifiable_delay_functions.beacon import Beacon, BeaconLog
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
+
+MODULUS = 260397651547576035527008437293696027923
+
+
+class TestBeacon(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_log(self):
+        log = BeaconLog(Path(self.directory.name) / "beacon.log")
+        records = [BeaconRecord(epoch=i, input_param=i + 2, output=3 * i, proof=[i, i + 1]) for i in range(5)]
+        for record in records:
+            log.append(record)
+        with self.assertRaises(ValueError):
+            log.append(records[2])
+        reopened = BeaconLog(log.path)
+        self.assertEqual(len(reopened), 5)
+        self.assertEqual([reopened.get(i) for i in [3, 0, 4]], [records[3], records[0], records[4]])
+        with self.assertRaises(IndexError):
+            reopened.get(5)
+
+    def test_run(self):
+        pp = PublicParams(delay=64, modulus=MODULUS, security_param=128)
+        setup = RsaSetup(delay=100, n=MODULUS, security_param=128)
+        for vdf, params in [(PietrzakVDF, pp), (WesolowskiVDF, setup)]:
+            path = Path(self.directory.name) / f"{vdf.name}.log"
+            for workers in [0, 2]:
+                records = list(Beacon(vdf=vdf, setup=params, seed=42, workers=workers).run(epochs=4))
+                self.assertEqual([record.epoch for record in records], [0, 1, 2, 3])
+                beacon = Beacon(vdf=vdf, setup=params, seed=42)
+                previous = 42
+                for record in records:
+                    self.assertEqual(vdf.eval(params, record.input_param).output, record.output)
+                    self.assertTrue(beacon.verify(record, previous=previous))
+                    previous = record.output
+
+            # the logged beacon goes on from its last epoch
+            self.assertEqual(list(Beacon(vdf=vdf, setup=params, seed=42, log=path).run(epochs=2)), records[:2])
+            beacon = Beacon(vdf=vdf, setup=params, seed=42, log=path)
+            self.assertEqual(list(beacon.run(epochs=2)), records[2:])
+            self.assertEqual(len(beacon.log), 4)
+            self.assertEqual([beacon.log.get(i) for i in range(4)], records)
+            self.assertTrue(all(beacon.verify(beacon.log.get(i)) for i in range(4)))
+            self.assertFalse(beacon.verify(records[2], previous=records[0].output))
+
+    def test_log_header(self):
+        setup = RsaSetup(delay=100, n=MODULUS, security_param=128)
+        path = Path(self.directory.name) / "beacon.log"
+        records = list(Beacon(vdf=WesolowskiVDF, setup=setup, seed=42, log=path).run(epochs=2))
+        log = BeaconLog(path)
+        self.assertEqual(log.header(), BeaconHeader(scheme=WesolowskiVDF.name, modulus=MODULUS, delay=100, seed=42))
+        self.assertEqual([log.get(i) for i in range(2)], records)
+
+        # a beacon under another modulus, delay or seed does not go on from the log
+        for other in [Beacon(vdf=WesolowskiVDF, setup=setup.copy(update={"n": MODULUS + 2}), seed=42, log=path),
+                      Beacon(vdf=WesolowskiVDF, setup=setup.copy(update={"delay": 99}), seed=42, log=path),
+                      Beacon(vdf=WesolowskiVDF, setup=setup, seed=43, log=path)]:
+            with self.assertRaises(GeneralException):
+                next(other.run(epochs=1))
+        self.assertEqual(len(BeaconLog(path)), 2)
+
+        # a log of epochs without header is refused
+        headless = BeaconLog(Path(self.directory.name) / "headless.log")
+        headless.append(records[0])
+        with self.assertRaises(GeneralException):
+            next(Beacon(vdf=WesolowskiVDF, setup=setup, seed=42, log=headless).run(epochs=1))
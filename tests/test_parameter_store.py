@@ -0,0 +1,71 @@
+import tempfile
+import time
+import unittest
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.utils.number_theory import NumberTheory
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
+
+
+class TestParameterStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_setup(self):
+        store = ParameterStore(directory=self.directory.name)
+        pp = store.setup(vdf=PietrzakVDF, security_param=128, delay=4)
+        self.assertEqual(pp.delay, 4)
+        pp_2 = store.setup(vdf=PietrzakVDF, security_param=128, delay=1024)
+        self.assertEqual(pp_2.delay, 1024)
+        self.assertEqual(pp_2.modulus, pp.modulus)
+        fresh = store.setup(vdf=PietrzakVDF, security_param=128, delay=4, fresh=True)
+        self.assertNotEqual(fresh.modulus, pp.modulus)
+
+        # the moduli and the trapdoor are loaded back from the disk
+        store = ParameterStore(directory=self.directory.name, keep_trapdoor=True)
+        setup = store.setup(vdf=WesolowskiVDF, security_param=128, delay=8, ret_sk=True)
+        self.assertEqual(store.path(scheme=WesolowskiVDF.name, security_param=128).stat().st_mode & 0o777, 0o600)
+        reloaded = ParameterStore(directory=self.directory.name).setup(vdf=WesolowskiVDF, security_param=128,
+                                                                       delay=16, ret_sk=True)
+        self.assertEqual((reloaded.n, reloaded.phi), (setup.n, setup.phi))
+        x = WesolowskiVDF.gen(setup)
+        evaluation = WesolowskiVDF.trapdoor(setup=setup, input_param=x)
+        self.assertTrue(WesolowskiVDF.verify(setup, x, evaluation.output, evaluation.proof))
+        self.assertEqual(ParameterStore(directory=self.directory.name).setup(vdf=PietrzakVDF, security_param=128,
+                                                                             delay=2).modulus, pp.modulus)
+
+    def test_without_trapdoor(self):
+        store = ParameterStore(directory=self.directory.name)
+        setup = store.setup(vdf=WesolowskiVDF, security_param=64, delay=4)
+        self.assertIsNone(setup.phi)
+        stored = ParameterStore(directory=self.directory.name).entry(scheme=WesolowskiVDF.name, security_param=64)
+        self.assertEqual([(modulus.p, modulus.q) for modulus in stored.issued], [(None, None)])
+        with self.assertRaises(GeneralException):
+            store.setup(vdf=WesolowskiVDF, security_param=64, delay=4, ret_sk=True)
+
+    def test_background_top_up(self):
+        store = ParameterStore(directory=self.directory.name)
+        store.keep_ready(vdf=PietrzakVDF, security_param=128, moduli=2, inputs=3)
+        pp = store.setup(vdf=PietrzakVDF, security_param=128, delay=16)
+        store.top_up()
+        self.assertEqual(len(store.entry(scheme=PietrzakVDF.name, security_param=128).ready), 2)
+        inputs = store.ready_inputs(pp)
+        self.assertEqual(len(inputs), 3)
+        x = store.gen(vdf=PietrzakVDF, params=pp)
+        self.assertEqual(x, inputs[0])
+        self.assertTrue(NumberTheory.check_quadratic_residue(x=x, modulus=pp.modulus))
+
+        store.start()
+        deadline = time.time() + 10
+        while len(store.ready_inputs(pp)) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        store.stop(timeout=10)
+        self.assertEqual(len(store.ready_inputs(pp)), 3)
+        evaluation = PietrzakVDF.eval(public_params=pp, input_param=x)
+        self.assertTrue(PietrzakVDF.verify(pp, x, evaluation.output, evaluation.proof))
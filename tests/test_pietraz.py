@@ -1,7 +1,8 @@
 import unittest
 from unittest import skip
 
-from crypto_VDF.data_transfer_objects.dto import PublicParams
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import EvalResponse, PublicParams
 from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
 
 
@@ -128,3 +129,57 @@ class TestPietrazVDF(unittest.TestCase):
         out, proof = PietrzakVDF.compute_proof(public_params=pp, input_param=x)
         verification = PietrzakVDF.verify(public_params=pp, input_param=x, output_param=out, proof=proof)
         self.assertTrue(verification)
+
+    def test_compute_proof_checkpoints(self):
+        modulus = 260397651547576035527008437293696027923
+        x = 15290776003867498194639638
+        for delay in [1, 2, 3, 8, 10, 64, 100, 604, 1024]:
+            pp = PublicParams(delay=delay, modulus=modulus, security_param=128)
+            expected = PietrzakVDF.compute_proof(public_params=pp, input_param=x)
+            for interval in [None, 1, 3, 16, 5000]:
+                out = PietrzakVDF.compute_proof_checkpoints(public_params=pp, input_param=x, interval=interval)
+                self.assertEqual(out, expected)
+        pp = PublicParams(delay=1024, modulus=modulus, security_param=128)
+        evaluation = PietrzakVDF.eval(public_params=pp, input_param=x, checkpoint_interval=8)
+        self.assertTrue(PietrzakVDF.verify(public_params=pp, input_param=x, output_param=evaluation.output,
+                                           proof=evaluation.proof))
+
+    def test_verify_batch(self):
+        modulus = 260397651547576035527008437293696027923
+        pp = PublicParams(delay=128, modulus=modulus, security_param=128)
+        triples = []
+        for x in [15290776003867498194639638, 2, 3, 1234567, 15290776003867498194639638]:
+            evaluation = PietrzakVDF.eval(public_params=pp, input_param=x)
+            triples.append((x, evaluation.output, evaluation.proof))
+        triples[1] = (triples[1][0], triples[1][1], [triples[1][2][0] + 1] + triples[1][2][1:])
+        triples[3] = (triples[3][0], triples[3][1] + 1, triples[3][2])
+        triples.append((5, modulus, []))
+        expected = [PietrzakVDF.verify(public_params=pp, input_param=x, output_param=y, proof=proof)
+                    for x, y, proof in triples]
+        self.assertEqual(expected, [True, False, True, False, True, False])
+        for workers in [None, 2]:
+            response = PietrzakVDF.verify_batch(public_params=pp, triples=triples, workers=workers)
+            self.assertEqual(response.results, expected)
+            self.assertFalse(response.valid)
+        self.assertTrue(PietrzakVDF.verify_batch(public_params=pp, triples=triples[:1]).valid)
+
+    def test_trapdoor(self):
+        p, q = 17544650956004806453, 14841996697486461991
+        x = 15290776003867498194639638
+        for delay in [1, 2, 3, 8, 10, 64, 100, 1024]:
+            pp = PublicParams(delay=delay, modulus=p * q, p=p, q=q, security_param=128)
+            output, proof = PietrzakVDF.compute_proof(public_params=pp, input_param=x)
+            self.assertEqual(PietrzakVDF.trapdoor(public_params=pp, input_param=x),
+                             EvalResponse(output=output, proof=proof))
+
+        setup = PietrzakVDF.setup(security_param=256, delay=1, ret_sk=True)
+        # delays beyond 2^64 are absorbed by the transcript too
+        for exponent in [40, 70]:
+            pp = setup.copy(update={"delay": 2 ** exponent})
+            x = PietrzakVDF.gen(pp)
+            evaluation = PietrzakVDF.trapdoor(public_params=pp, input_param=x)
+            self.assertEqual(len(evaluation.proof), exponent)
+            self.assertTrue(PietrzakVDF.verify(public_params=pp, input_param=x, output_param=evaluation.output,
+                                               proof=evaluation.proof))
+        with self.assertRaises(GeneralException):
+            PietrzakVDF.trapdoor(public_params=PublicParams(delay=4, modulus=p * q), input_param=x)
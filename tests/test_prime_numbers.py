@@ -9,4 +9,13 @@ class TestPrimeNumbers(unittest.TestCase):
         test_cases = [3, 5, 6, 7, 8, 11]
         for i in test_cases:
             x = PrimNumbers.robin_miller_test(i, 100)
-            self.assertTrue(x) if i in [3, 5, 7, 11] else self.assertFalse(x)
\ No newline at end of file
+            self.assertTrue(x) if i in [3, 5, 7, 11] else self.assertFalse(x)
+
+    def test_sieved_prime_number(self):
+        for k in [2, 3, 5, 10, 64, 100, 256, 512]:
+            for _ in range(5):
+                response = PrimNumbers.sieved_prime_number(k)
+                self.assertEqual(response.base_10.bit_length(), k)
+                self.assertTrue(PrimNumbers.robin_miller_test(response.base_10, 20))
+        self.assertEqual(PrimNumbers.miller_rabin_rounds(1024), 4)
+        self.assertEqual(PrimNumbers.miller_rabin_rounds(100), 40)
@@ -0,0 +1,124 @@
+import tempfile
+import threading
+import unittest
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.service.load_generator import percentile, request, run_load, wait_result
+from crypto_VDF.service.server import VDFService, make_server
+from crypto_VDF.verifiable_delay_functions.parameter_store import ParameterStore
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
+
+
+class TestService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.service = VDFService(param_sets=["wesolowski:128:1000", "pietrzak:128:256"], workers=2,
+                                 store=ParameterStore(directory=cls.directory.name))
+        cls.server = make_server(service=cls.service, port=0)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+        cls.directory.cleanup()
+
+    def test_eval_and_verify(self):
+        for name, vdf in [("wesolowski:128:1000", WesolowskiVDF), ("pietrzak:128:256", PietrzakVDF)]:
+            setup = self.service.params[name][1]
+            x = vdf.gen(setup)
+            submitted = request(f"{self.url}/eval", {"params": name, "x": x})
+            self.assertEqual((submitted["_status"], submitted["input_param"]), (202, x))
+            result = wait_result(self.url, submitted["job"], timeout=60)
+            expected = vdf.eval(setup, x)
+            self.assertEqual((result["output"], result["proof"]), (expected.output, expected.proof))
+            self.assertEqual(request(f"{self.url}/jobs/{submitted['job']}")["status"], "done")
+
+            item = {"x": x, "y": expected.output, "proof": expected.proof}
+            self.assertTrue(request(f"{self.url}/verify", {"params": name, **item})["valid"])
+            results = request(f"{self.url}/verify", {"params": name, "items": [item, {**item, "y": x}, item]})
+            self.assertEqual(results["results"], [True, False, True])
+
+    def test_errors(self):
+        self.assertEqual(request(f"{self.url}/eval", {"params": "wesolowski:128:5"})["_status"], 400)
+        self.assertEqual(request(f"{self.url}/verify", {"params": "wesolowski:128:1000"})["_status"], 400)
+        self.assertEqual(request(f"{self.url}/jobs/unknown")["_status"], 404)
+        with self.assertRaises(GeneralException):
+            run_load(url=self.url, params="wesolowski:128:1000", kind="unknown")
+
+    def test_verify_batching(self):
+        name = "wesolowski:128:1000"
+        setup = self.service.params[name][1]
+        responses = [WesolowskiVDF.eval(setup, x) for x in [2, 3, 5, 7]]
+        triples = [(x, response.output, response.proof) for x, response in zip([2, 3, 5, 7], responses)]
+        results = [None] * len(triples)
+
+        def verify(i):
+            results[i] = self.service.verify(name=name, triples=[triples[i]])
+
+        threads = [threading.Thread(target=verify, args=(i,)) for i in range(len(triples))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [[True]] * len(triples))
+
+    def test_verify_batching_malformed_request(self):
+        name = "wesolowski:128:1000"
+        response = WesolowskiVDF.eval(self.service.params[name][1], 2)
+        requests = [[(2, response.output, response.proof)], [(2, response.output, "junk")]]
+        results, errors = [None, None], [None, None]
+        barrier = threading.Barrier(len(requests))
+
+        def verify(i):
+            barrier.wait()
+            try:
+                results[i] = self.service.verify(name=name, triples=requests[i])
+            except GeneralException as exc:
+                errors[i] = exc
+
+        threads = [threading.Thread(target=verify, args=(i,)) for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((results[0], errors[0]), ([True], None))
+        self.assertIsNone(results[1])
+        self.assertIsInstance(errors[1], GeneralException)
+
+        item = {"x": 2, "y": response.output, "proof": response.proof}
+        self.assertEqual(request(f"{self.url}/verify", {"params": name, "items": [item, {**item, "proof": "junk"}]})
+                         ["_status"], 400)
+
+    def test_verify_sign_flipped_proofs(self):
+        name = "wesolowski:128:1000"
+        setup = self.service.params[name][1]
+        items = []
+        for x in [2, 3]:
+            response = WesolowskiVDF.eval(setup, x)
+            items.append({"x": x, "y": response.output, "proof": setup.n - response.proof})
+        self.assertEqual(request(f"{self.url}/verify", {"params": name, "items": items})["results"], [False, False])
+
+        results = [None] * len(items)
+
+        def verify(i):
+            results[i] = request(f"{self.url}/verify", {"params": name, **items[i]})["valid"]
+
+        threads = [threading.Thread(target=verify, args=(i,)) for i in range(len(items))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [False, False])
+
+    def test_load(self):
+        stats = run_load(url=self.url, params="wesolowski:128:1000", requests=20, concurrency=4)
+        self.assertEqual(stats["failures"], 0)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(percentile([3, 1, 2, 4], 99), 4)
@@ -1,7 +1,13 @@
+import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 
-from crypto_VDF.data_transfer_objects.dto import PublicParams
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import PublicParams, RsaSetup
+from crypto_VDF.utils.prime_numbers import PrimNumbers
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
 from crypto_VDF.verifiable_delay_functions.vdf import VDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
 
 
 class TestVDF(unittest.TestCase):
@@ -10,3 +16,85 @@ class TestVDF(unittest.TestCase):
         pp = PublicParams(delay=4, modulus=3)
         res = VDF.eval_function(public_params=pp, input_param=2)
         self.assertEqual(res, 1)
+
+    def test_generate_rsa_primes_parallel(self):
+        for workers in [None, 2, 3]:
+            primes = VDF.generate_rsa_primes(security_param=256, workers=workers)
+            self.assertNotEqual(primes.p.base_10, primes.q.base_10)
+            for prime in [primes.p.base_10, primes.q.base_10]:
+                self.assertEqual(prime.bit_length(), 128)
+                self.assertTrue(PrimNumbers.robin_miller_test(prime, 20))
+        pp = PietrzakVDF.setup(security_param=128, delay=4, workers=2)
+        self.assertGreater(pp.modulus.bit_length(), 120)
+
+    def test_eval_many(self):
+        modulus = 260397651547576035527008437293696027923
+        inputs = [15290776003867498194639638, 2, 3, 1234567, 987654321]
+        pp = PublicParams(delay=128, modulus=modulus, security_param=128)
+        setup = RsaSetup(delay=100, n=modulus, security_param=128)
+        for vdf, params in [(PietrzakVDF, pp), (WesolowskiVDF, setup)]:
+            expected = {x: vdf.eval(params, x) for x in inputs}
+            for workers in [None, 2]:
+                responses = list(vdf.eval_many(setup=params, inputs=inputs, workers=workers))
+                self.assertEqual(sorted(response.input_param for response in responses), sorted(inputs))
+                for response in responses:
+                    self.assertEqual((response.output, response.proof),
+                                     (expected[response.input_param].output, expected[response.input_param].proof))
+
+    def test_eval_state(self):
+        modulus = 260397651547576035527008437293696027923
+        x = 15290776003867498194639638
+        pp = PublicParams(delay=256, modulus=modulus, security_param=128)
+        setup = RsaSetup(delay=300, n=modulus, security_param=128)
+        for vdf, params in [(PietrzakVDF, pp), (WesolowskiVDF, setup)]:
+            response, state = vdf.eval_state(params, x)
+            self.assertEqual(response, vdf.eval(params, x))
+            # continuation to a larger delay, and back to a smaller one
+            for delay in [4 * params.delay, params.delay // 2]:
+                params_2 = params.copy(update={"delay": delay})
+                response_2, state_2 = vdf.eval_state(params_2, x, state=state)
+                self.assertEqual(response_2, vdf.eval(params_2, x))
+                self.assertTrue(vdf.verify(params_2, x, response_2.output, response_2.proof))
+                state = state_2 if state_2.step > state.step else state
+
+            with tempfile.TemporaryDirectory() as directory:
+                resumed = vdf.eval_resumable(params, x, checkpoint_dir=directory, save_every=100)
+                self.assertEqual(resumed, vdf.eval(params, x))
+                params_2 = params.copy(update={"delay": 2 * params.delay})
+                resumed = vdf.eval_resumable(params_2, x, checkpoint_dir=directory, save_every=100)
+                self.assertEqual(resumed, vdf.eval(params_2, x))
+
+    def test_eval_multi_delay(self):
+        modulus = 260397651547576035527008437293696027923
+        x = 15290776003867498194639638
+        pp = PublicParams(delay=1, modulus=modulus, security_param=128)
+        setup = RsaSetup(delay=1, n=modulus, security_param=128)
+        for vdf, params, delays in [(PietrzakVDF, pp, [512, 16, 128, 16]), (WesolowskiVDF, setup, [1000, 7, 350])]:
+            for workers in [None, 2]:
+                responses = vdf.eval_multi_delay(params, x, delays=delays, workers=workers)
+                self.assertEqual(len(responses), len(delays))
+                for delay, response in zip(delays, responses):
+                    params_2 = params.copy(update={"delay": delay})
+                    self.assertEqual(response, vdf.eval(params_2, x))
+                    self.assertTrue(vdf.verify(params_2, x, response.output, response.proof))
+
+    def test_eval_deferred(self):
+        modulus = 260397651547576035527008437293696027923
+        x = 15290776003867498194639638
+        pp = PublicParams(delay=256, modulus=modulus, security_param=128)
+        setup = RsaSetup(delay=300, n=modulus, security_param=128)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            for vdf, params in [(PietrzakVDF, pp), (WesolowskiVDF, setup)]:
+                expected = vdf.eval(params, x)
+                for pool in [None, executor]:
+                    handle = vdf.eval_deferred(params, x, executor=pool)
+                    self.assertEqual(handle.output, expected.output)
+                    self.assertEqual(handle.proof(timeout=60), expected.proof)
+                    self.assertTrue(handle.done())
+                    self.assertEqual(handle.response().proof, expected.proof)
+
+                handle = vdf.eval_deferred(params, x)
+                self.assertFalse(handle.done())
+                handle.release()
+                with self.assertRaises(GeneralException):
+                    handle.proof()
@@ -0,0 +1,69 @@
+import unittest
+
+from crypto_VDF.custom_errors.custom_exceptions import BackendNotAvailable
+from crypto_VDF.data_transfer_objects.dto import PublicParams, RsaSetup
+from crypto_VDF.utils.backend import ArithmeticBackend, get_backend, gmpy2_available
+from crypto_VDF.utils.number_theory import NumberTheory
+from crypto_VDF.utils.prime_numbers import PrimNumbers
+from crypto_VDF.utils.utils import square_sequences, square_sequences_v2, square_sequences_checkpoints, exp_modular
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
+
+N = 260397651547576035527008437293696027923
+X = 15290776003867498194639638
+
+
+class TestBackend(unittest.TestCase):
+
+    def tearDown(self):
+        PietrzakVDF.set_backend(get_backend())
+        WesolowskiVDF.set_backend(get_backend())
+
+    def test_get_backend(self):
+        self.assertEqual(get_backend('int').name, 'int')
+        backend = ArithmeticBackend()
+        self.assertIs(get_backend(backend), backend)
+        with self.assertRaises(BackendNotAvailable):
+            get_backend('unknown')
+        self.assertEqual(get_backend('auto').name, 'gmpy2' if gmpy2_available() else 'int')
+
+    def run_hot_paths(self, backend: ArithmeticBackend):
+        y, ys = square_sequences_v2(a=X, steps=100, n=N, backend=backend)
+        last, checkpoints = square_sequences_checkpoints(a=X, steps=100, n=N, interval=7, backend=backend)
+        PietrzakVDF.set_backend(backend)
+        WesolowskiVDF.set_backend(backend)
+        pp = PublicParams(delay=64, modulus=N, security_param=128)
+        setup = RsaSetup(delay=100, n=N, security_param=128, phi=260397651547576035494621789640204759480)
+        values = [
+            square_sequences(a=X, steps=100, n=N, backend=backend),
+            y, [int(item) for item in ys], last, [int(item) for item in checkpoints],
+            exp_modular(a=X, exponent=2 ** 100 + 12345, n=N, backend=backend),
+            NumberTheory.gcd(a=X * 6, b=N * 4, backend=backend),
+            NumberTheory.multiply(u=X, v=N - 2, n=N, backend=backend),
+            NumberTheory.modular_inverse(a=X, n=N, backend=backend),
+            [PrimNumbers.robin_miller_test(n=item, t=5, backend=backend) for item in [7, 11, 15, 23, N]],
+            PietrzakVDF.eval(public_params=pp, input_param=X),
+            PietrzakVDF.compute_proof(public_params=pp, input_param=X),
+            PietrzakVDF.verify(public_params=pp, input_param=X, output_param=1, proof=[2, 3, 4, 5, 6, 7]),
+            WesolowskiVDF.eval(setup=setup, input_param=X, windowed=False),
+            WesolowskiVDF.eval(setup=setup, input_param=X, windowed=True),
+            WesolowskiVDF.trapdoor(setup=setup, input_param=X),
+        ]
+        self.assert_builtin(values)
+        return values
+
+    def assert_builtin(self, value):
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                self.assert_builtin(item)
+        elif hasattr(value, 'output'):
+            self.assert_builtin([value.output, value.proof])
+        else:
+            self.assertIn(type(value), (int, bool))
+
+    @unittest.skipUnless(gmpy2_available(), "gmpy2 is not installed")
+    def test_backends_parity(self):
+        int_values = self.run_hot_paths(get_backend('int'))
+        gmpy2_values = self.run_hot_paths(get_backend('gmpy2'))
+        self.assertEqual(int_values, gmpy2_values)
+        self.assertEqual(NumberTheory.modular_inverse(a=X, n=N, backend=get_backend('int')) * X % N, 1)
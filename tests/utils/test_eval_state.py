@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from crypto_VDF.utils.eval_state import advance_state, load_state, new_state, save_state, state_path
+from crypto_VDF.utils.montgomery import get_modulus_context
+
+N = 260397651547576035527008437293696027923
+X = 15290776003867498194639638
+
+
+class TestEvalState(unittest.TestCase):
+
+    def test_advance_state(self):
+        context = get_modulus_context(N)
+        state = new_state(scheme="test", modulus=N, input_param=X, interval=7)
+        for steps in [50, 20, 100, 0]:
+            advanced = advance_state(state=state, steps=steps, context=context, save_every=9)
+            self.assertEqual(advanced.step, steps)
+            self.assertEqual(advanced.value, pow(X, 1 << steps, N))
+            self.assertEqual(advanced.checkpoints, [pow(X, 1 << i, N) for i in range(0, steps, 7)])
+            state = advanced if steps > state.step else state
+
+    def test_advance_state_in_place(self):
+        state = new_state(scheme="test", modulus=N, input_param=X, interval=7)
+        checkpoints = state.checkpoints
+        self.assertIs(advance_state(state=state, steps=30, context=get_modulus_context(N), save_every=9), state)
+        self.assertIs(state.checkpoints, checkpoints)
+        self.assertEqual(checkpoints, [pow(X, 1 << i, N) for i in range(0, 30, 7)])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state = new_state(scheme="test", modulus=N, input_param=X, interval=4)
+            path = state_path(directory=directory, state=state)
+            self.assertEqual(load_state(path=path, state=state), state)
+            advanced = advance_state(state=state, steps=30, context=get_modulus_context(N), path=path, save_every=8)
+            self.assertEqual(load_state(path=path, state=state), advanced)
+            other = new_state(scheme="test", modulus=N, input_param=X + 1, interval=4)
+            save_state(path=Path(path), state=other)
+            self.assertEqual(load_state(path=path, state=state), state)
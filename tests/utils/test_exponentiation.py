@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from crypto_VDF.utils.exponentiation import sliding_window_exp, FixedBaseExp, optimal_window, multi_exp
+from crypto_VDF.utils.utils import exp_modular, exp_modular_naive
+
+N = 260397651547576035527008437293696027923
+
+
+class TestExponentiation(unittest.TestCase):
+
+    def test_exp_modular(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            a, exponent = rng.randrange(N), rng.getrandbits(rng.randint(0, 300))
+            self.assertEqual(exp_modular(a=a, exponent=exponent, n=N), exp_modular_naive(a=a, exponent=exponent, n=N))
+        self.assertEqual(exp_modular(a=5, exponent=0, n=1), 0)
+
+    def test_sliding_window_exp(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            a, exponent = rng.randrange(N), rng.getrandbits(rng.randint(0, 300))
+            self.assertEqual(sliding_window_exp(a=a, exponent=exponent, n=N), pow(a, exponent, N))
+            for window in [1, 2, 5]:
+                self.assertEqual(sliding_window_exp(a=a, exponent=exponent, n=N, window=window), pow(a, exponent, N))
+        # custom multiplication: exponentiation in Z/21Z seen as integers modulo 21
+        self.assertEqual(sliding_window_exp(a=2, exponent=10, multiply=lambda u, v: (u * v) % 21, one=1), 1024 % 21)
+        self.assertEqual(optimal_window(8), 1)
+        self.assertEqual(optimal_window(2048), 7)
+
+    def test_fixed_base_exp(self):
+        rng = random.Random(2)
+        base = rng.randrange(N)
+        fixed_base = FixedBaseExp(base=base, n=N, max_bits=256, window=5)
+        for _ in range(50):
+            exponent = rng.getrandbits(rng.randint(0, 256))
+            self.assertEqual(fixed_base.exp(exponent), pow(base, exponent, N))
+        exponent = rng.getrandbits(400)
+        self.assertEqual(fixed_base.exp(exponent), pow(base, exponent, N))
+
+    def test_multi_exp(self):
+        rng = random.Random(3)
+        for k in [1, 2, 3, 4, 10]:
+            bases = [rng.randrange(N) for _ in range(k)]
+            exponents = [rng.getrandbits(rng.randint(0, 300)) for _ in range(k)]
+            expected = 1
+            for base, exponent in zip(bases, exponents):
+                expected = (expected * pow(base, exponent, N)) % N
+            self.assertEqual(multi_exp(bases=bases, exponents=exponents, n=N), expected)
+            for window in [1, 3, 6]:
+                self.assertEqual(multi_exp(bases=bases, exponents=exponents, n=N, window=window), expected)
+        self.assertEqual(multi_exp(bases=[], exponents=[], n=N), 1)
+        self.assertEqual(multi_exp(bases=[2, 3], exponents=[0, 0], n=1), 0)
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from crypto_VDF.utils.hash_to_prime import is_prime, next_prime, hash_to_prime, strong_lucas_probable_prime, \
+    small_primes
+from crypto_VDF.utils.prime_numbers import PrimNumbers
+
+
+def trial_division(n: int) -> bool:
+    return n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+
+class TestHashToPrime(unittest.TestCase):
+
+    def test_is_prime(self):
+        self.assertEqual(small_primes(30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        for n in range(-2, 20000):
+            self.assertEqual(is_prime(n), trial_division(n), msg=n)
+        # strong pseudoprimes to several bases and Carmichael numbers
+        for n in [3215031751, 2152302898747, 3474749660383, 341550071728321, 3825123056546413051,
+                  318665857834031151167461, 3317044064679887385961981, 561, 41041, 825265]:
+            self.assertFalse(is_prime(n), msg=n)
+        # strong Lucas pseudoprimes are composite, but pass the Lucas part of BPSW
+        for n in [5459, 5777, 10877, 16109, 18971]:
+            self.assertTrue(strong_lucas_probable_prime(n), msg=n)
+            self.assertFalse(is_prime(n), msg=n)
+        for p in [2 ** 89 - 1, 2 ** 127 - 1, 2 ** 521 - 1]:
+            self.assertTrue(is_prime(p))
+            self.assertFalse(is_prime(p * (2 ** 61 - 1)))
+
+    def test_next_prime(self):
+        for n in range(0, 3000):
+            p = next_prime(n)
+            self.assertTrue(trial_division(p))
+            self.assertFalse(any(trial_division(m) for m in range(n, p)))
+        rng = random.Random(0)
+        for _ in range(20):
+            n = rng.getrandbits(256)
+            p = next_prime(n, window=64)
+            self.assertEqual(p, next_prime(n))
+            self.assertTrue(PrimNumbers.robin_miller_test(n=p, t=20))
+            self.assertFalse(any(is_prime(m) for m in range(n, p)))
+
+    def test_hash_to_prime(self):
+        for security_param, bits in [(10, 20), (64, 128), (128, 256), (200, 256), (None, 256)]:
+            prime_l = hash_to_prime(g=2, y=3, security_param=security_param)
+            self.assertTrue(is_prime(prime_l))
+            self.assertEqual(prime_l.bit_length(), bits)
+            self.assertEqual(prime_l, hash_to_prime(g=2, y=3, security_param=security_param))
+        self.assertNotEqual(hash_to_prime(g=2, y=3, security_param=128), hash_to_prime(g=3, y=2, security_param=128))
+        self.assertNotEqual(hash_to_prime(g=1, y=23, security_param=128),
+                            hash_to_prime(g=12, y=3, security_param=128))
+        self.assertGreater(hash_to_prime.cache_info().hits, 0)
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
+from crypto_VDF.data_transfer_objects.dto import PublicParams
+from crypto_VDF.utils.montgomery import CONTEXTS, MontgomeryContext, get_modulus_context
+from crypto_VDF.utils.utils import square_chain, exp_modular
+from crypto_VDF.verifiable_delay_functions.pietrzak import PietrzakVDF
+
+N = 260397651547576035527008437293696027923
+
+
+class TestMontgomery(unittest.TestCase):
+
+    def tearDown(self):
+        PietrzakVDF.set_reduction("native")
+
+    def test_square_chain(self):
+        rng = random.Random(0)
+        for name, context_class in CONTEXTS.items():
+            context = context_class(n=N, backend="int")
+            for _ in range(10):
+                a, steps = rng.randrange(N), rng.randint(0, 300)
+                checkpoints = sorted(rng.sample(range(steps + 1), min(3, steps + 1)))
+                self.assertEqual(context.square_chain(a=a, steps=steps, checkpoints=checkpoints),
+                                 square_chain(a=a, steps=steps, n=N, checkpoints=checkpoints), msg=name)
+                self.assertEqual(context.square_chain(a=a, steps=steps, normalise=True)[0],
+                                 square_chain(a=a, steps=steps, n=N, normalise=True)[0], msg=name)
+            self.assertRaises(ValueError, context.square_chain, a=2, steps=5, checkpoints=[6])
+            # the squarings are done by blocks of at most block squarings
+            self.assertEqual(context.square_chain(a=3, steps=300, checkpoints=[100], block=7),
+                             (pow(3, 1 << 300, N), [pow(3, 1 << 100, N)]), msg=name)
+
+    def test_exp(self):
+        rng = random.Random(1)
+        for name, context_class in CONTEXTS.items():
+            context = context_class(n=N, backend="int")
+            for _ in range(20):
+                a, exponent = rng.randrange(N), rng.getrandbits(rng.randint(1, 300))
+                self.assertEqual(exp_modular(a=a, exponent=exponent, n=N, context=context), pow(a, exponent, N),
+                                 msg=name)
+
+    def test_get_modulus_context(self):
+        self.assertIs(get_modulus_context(n=N, reduction="montgomery", backend="int"),
+                      get_modulus_context(n=N, reduction="montgomery", backend="int"))
+        self.assertRaises(GeneralException, get_modulus_context, n=N, reduction="unknown")
+        self.assertRaises(GeneralException, MontgomeryContext, n=N + 1)
+
+    def test_prover(self):
+        params = PublicParams(modulus=N, delay=2 ** 6, security_param=128)
+        x = 15290776003867498194639638
+        expected = PietrzakVDF.compute_proof(public_params=params, input_param=x)
+        for reduction in CONTEXTS:
+            PietrzakVDF.set_reduction(reduction)
+            self.assertEqual(PietrzakVDF.compute_proof(public_params=params, input_param=x), expected)
+            self.assertEqual(PietrzakVDF.compute_proof_checkpoints(public_params=params, input_param=x), expected)
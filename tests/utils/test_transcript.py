@@ -0,0 +1,35 @@
+import unittest
+
+from crypto_VDF.utils.transcript import Transcript
+
+N = 260397651547576035527008437293696027923
+
+
+class TestTranscript(unittest.TestCase):
+
+    def challenge(self, delay, elements, bits=None, label=b"test", modulus=N):
+        transcript = Transcript(label=label, modulus=modulus)
+        transcript.append_integer(delay)
+        for element in elements:
+            transcript.append_element(element)
+        return transcript.challenge(bits=bits)
+
+    def test_challenge(self):
+        self.assertEqual(self.challenge(4, [2, 3, 5]), self.challenge(4, [2, 3, 5]))
+        self.assertEqual(self.challenge(4, [2, 3, 5]), self.challenge(4, [2 + N, 3, 5]))
+        self.assertNotEqual(self.challenge(4, [2, 3, 5]), self.challenge(5, [2, 3, 5]))
+        self.assertNotEqual(self.challenge(4, [2, 3, 5]), self.challenge(4, [3, 2, 5]))
+        self.assertNotEqual(self.challenge(4, [2, 3, 5]), self.challenge(4, [2, 3, 5], label=b"other"))
+        self.assertNotEqual(self.challenge(4, [2, 3, 5]), self.challenge(4, [2, 3, 5], modulus=N + 2))
+        # fixed-width encodings: no ambiguity between (12, 3) and (1, 23)
+        self.assertNotEqual(self.challenge(4, [12, 3]), self.challenge(4, [1, 23]))
+        # delays of any size
+        self.assertNotEqual(self.challenge(1 << 64, [2, 3, 5]), self.challenge(1 << 65, [2, 3, 5]))
+        self.assertNotEqual(self.challenge(1 << 64, [2, 3, 5]), self.challenge(0, [2, 3, 5]))
+
+    def test_challenge_bits(self):
+        full = self.challenge(4, [2, 3, 5])
+        self.assertLess(full.bit_length(), 257)
+        self.assertEqual(self.challenge(4, [2, 3, 5], bits=300), full)
+        self.assertEqual(self.challenge(4, [2, 3, 5], bits=128), full >> 128)
+        self.assertLess(self.challenge(4, [2, 3, 5], bits=4), 16)
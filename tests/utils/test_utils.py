@@ -1,7 +1,7 @@
 import unittest
 
 from crypto_VDF.utils.number_theory import NumberTheory
-from crypto_VDF.utils.utils import exp_modular, square_sequences, concat_hexs
+from crypto_VDF.utils.utils import exp_modular, square_sequences, concat_hexs, square_chain, square_sequences_v2
 
 
 class TestUtils(unittest.TestCase):
@@ -28,3 +28,17 @@ class TestUtils(unittest.TestCase):
         res = concat_hexs(1, 2)
         h1, h2 = '{:02x}'.format(x1), '{:02x}'.format(x2)
         self.assertEqual(int(h1 + h2, 16), res)
+
+    def test_square_chain(self):
+        n = 260397651547576035527008437293696027923
+        a = 15290776003867498194639638
+        y, ys = square_sequences_v2(a=a, steps=300, n=n)
+        for block in [1, 7, 64, 1024]:
+            last, values = square_chain(a=a, steps=300, n=n, checkpoints=[0, 5, 100, 128, 300], block=block)
+            self.assertEqual(last, y)
+            self.assertEqual(values, [ys[0], ys[5], ys[100], ys[128], ys[300]])
+            last, _ = square_chain(a=a, steps=300, n=n, block=block, normalise=True)
+            self.assertEqual(last, NumberTheory.modular_abs(y, n))
+        self.assertEqual(square_sequences(a=a, steps=300, n=n), NumberTheory.modular_abs(y, n))
+        with self.assertRaises(ValueError):
+            square_chain(a=a, steps=10, n=n, checkpoints=[5, 2])
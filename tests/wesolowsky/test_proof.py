@@ -1,7 +1,7 @@
 import unittest
 
 from crypto_VDF.data_transfer_objects.dto import RsaSetup
-from crypto_VDF.utils.utils import square_sequences_v2, exp_modular
+from crypto_VDF.utils.utils import square_sequences_v2, exp_modular, square_sequences_checkpoints
 from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
 
 
@@ -81,3 +81,54 @@ class TestWesolowskiProof(unittest.TestCase):
         out = square_sequences_v2(a=g, steps=t, n=n)
         r = WesolowskiVDF.alg_4_revisited(n=n, prime_l=l, delay=t, output_list=out[1])
         self.assertEqual(r, alg_4[0])
+
+    def test_alg_4_checkpoints(self):
+        n = 260397651547576035527008437293696027923
+        g = 15290776003867498194639638
+        delay = 257
+        out = square_sequences_v2(a=g, steps=delay, n=n)
+        for l in [3, 13, 65537, 340282366920938463463374607431768211507]:
+            expected = WesolowskiVDF.alg_4_revisited(n=n, prime_l=l, delay=delay, output_list=out[1])
+            for interval in [1, 2, 7, 16, 256, 300]:
+                y, checkpoints = square_sequences_checkpoints(a=g, steps=delay, n=n, interval=interval)
+                self.assertEqual(y, out[0])
+                self.assertEqual(len(checkpoints), -(-delay // interval))
+                r = WesolowskiVDF.alg_4_checkpoints(n=n, prime_l=l, delay=delay, checkpoints=checkpoints,
+                                                    interval=interval)
+                self.assertEqual(r, expected)
+
+    def test_quotient_chunks(self):
+        for delay, l, width in [(10, 3, 3), (64, 13, 8), (100, 65537, 7), (5, 7, 5)]:
+            chunks = WesolowskiVDF.quotient_chunks(prime_l=l, delay=delay, width=width)
+            self.assertEqual(sum(c << (i * width) for i, c in enumerate(chunks)), 2 ** delay // l)
+
+    def test_alg_4_windowed(self):
+        n = 260397651547576035527008437293696027923
+        g = 15290776003867498194639638
+        delay = 300
+        out = square_sequences_v2(a=g, steps=delay, n=n)
+        for l in [3, 13, 65537, 340282366920938463463374607431768211507]:
+            expected = WesolowskiVDF.alg_4_revisited(n=n, prime_l=l, delay=delay, output_list=out[1])
+            for kappa, gamma in [(1, 1), (1, 5), (2, 3), (3, 1), (4, 4), (5, 7), (8, 2), (10, 40)]:
+                checkpoints = out[1][:delay:kappa * gamma]
+                r = WesolowskiVDF.alg_4_windowed(n=n, prime_l=l, delay=delay, checkpoints=checkpoints, kappa=kappa,
+                                                 gamma=gamma)
+                self.assertEqual(r, expected)
+
+    def test_proof_parameters(self):
+        for delay in [1, 10, 2 ** 10, 2 ** 20, 2 ** 26]:
+            kappa, gamma = WesolowskiVDF.proof_parameters(delay=delay, security_param=2048)
+            self.assertTrue(kappa >= 1 and gamma >= 1)
+            self.assertTrue(-(-delay // (kappa * gamma)) <= delay ** 0.5 + 1)
+        kappa, gamma = WesolowskiVDF.proof_parameters(delay=2 ** 20, security_param=2048, memory_budget=2 ** 16)
+        self.assertTrue(-(-2 ** 20 // (kappa * gamma)) <= 2 ** 16 // 256)
+
+        # a given kappa or gamma is kept, the other one is picked within the memory budget
+        self.assertEqual(WesolowskiVDF.proof_parameters(delay=2 ** 20, kappa=3, gamma=7), (3, 7))
+        for kappa in [1, 2, 9]:
+            picked, gamma = WesolowskiVDF.proof_parameters(delay=2 ** 20, kappa=kappa)
+            self.assertEqual(picked, kappa)
+            self.assertTrue(-(-2 ** 20 // (kappa * gamma)) <= 2 ** 10 + 1)
+        kappa, gamma = WesolowskiVDF.proof_parameters(delay=2 ** 20, gamma=64)
+        self.assertEqual(gamma, 64)
+        self.assertTrue(-(-2 ** 20 // (kappa * gamma)) <= 2 ** 10 + 1)
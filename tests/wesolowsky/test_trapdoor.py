@@ -1,5 +1,6 @@
 import unittest
 
+from crypto_VDF.custom_errors.custom_exceptions import GeneralException
 from crypto_VDF.data_transfer_objects.dto import RsaSetup, EvalResponse
 from crypto_VDF.utils.utils import exp_modular
 from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
@@ -17,9 +18,29 @@ class TestTrapdoor(unittest.TestCase):
         pp = RsaSetup(phi=p_q_z, n=p_q, delay=1048576, security_param=128)
         t = WesolowskiVDF.trapdoor(input_param=x, setup=pp)
         self.assertTrue(isinstance(t, EvalResponse))
-        self.assertEqual(t.output, 168141932168425576701990652760156326268)
+        self.assertEqual(t.output, p_q - 168141932168425576701990652760156326268)
         self.assertTrue(t.proof < pp.n)
         prime_l = WesolowskiVDF.flat_shamir_hash(security_param=pp.security_param, g=x, y=t.output)
         r = exp_modular(a=2, exponent=pp.delay, n=prime_l)
         v = (exp_modular(a=t.proof, exponent=prime_l, n=pp.n) * exp_modular(a=x, exponent=r, n=pp.n)) % pp.n
-        self.assertEqual(v, t.output)
+        self.assertIn(v, [t.output, pp.n - t.output])
+
+    def test_trapdoor_crt(self):
+        p, q = 17544650956004806453, 14841996697486461991
+        x = 15290776003867498194639638
+        pp = RsaSetup(phi=(p - 1) * (q - 1), n=p * q, delay=1048576, security_param=128)
+        pp_crt = RsaSetup(phi=(p - 1) * (q - 1), n=p * q, p=p, q=q, delay=1048576, security_param=128)
+        self.assertEqual(WesolowskiVDF.trapdoor_crt(input_param=x, setup=pp_crt),
+                         WesolowskiVDF.trapdoor(input_param=x, setup=pp))
+        self.assertEqual(WesolowskiVDF.trapdoor(input_param=x, setup=pp_crt).output,
+                         p * q - 168141932168425576701990652760156326268)
+
+        # the batch matches the evaluation, also for inputs sharing a factor with the modulus
+        setup = WesolowskiVDF.setup(security_param=128, delay=300, ret_sk=True)
+        inputs = [WesolowskiVDF.gen(setup) for _ in range(5)] + [setup.p * 3, setup.q * 7]
+        responses = WesolowskiVDF.trapdoor_batch(inputs=inputs, setup=setup)
+        for x, response in zip(inputs, responses):
+            self.assertEqual(response, WesolowskiVDF.eval(setup=setup, input_param=x))
+            self.assertTrue(WesolowskiVDF.verify(setup, x, response.output, response.proof))
+        with self.assertRaises(GeneralException):
+            WesolowskiVDF.trapdoor_batch(inputs=[x], setup=pp)
@@ -1,6 +1,8 @@
+import sys
 import unittest
 
 from crypto_VDF.data_transfer_objects.dto import RsaSetup
+from crypto_VDF.utils.utils import square_sequences_v2
 from crypto_VDF.verifiable_delay_functions.wesolowski import WesolowskiVDF
 
 
@@ -73,3 +75,81 @@ class TestWesolowskiVDF(unittest.TestCase):
         wrong_output = WesolowskiVDF.gen(pp)
         verif = WesolowskiVDF.verify(pp, x, wrong_output, evaluation.proof)
         self.assertFalse(verif)
+
+    def test_eval_checkpoints(self):
+        pp = RsaSetup(n=260397651547576035527008437293696027923, delay=1000, security_param=128)
+        x = 15290776003867498194639638
+        expected = WesolowskiVDF.eval(setup=pp, input_param=x, windowed=False)
+        evaluation = WesolowskiVDF.eval(setup=pp, input_param=x, checkpoint_interval=32)
+        self.assertEqual(evaluation, expected)
+        self.assertTrue(WesolowskiVDF.verify(pp, x, evaluation.output, evaluation.proof))
+
+    def test_eval_memory_budget(self):
+        pp = RsaSetup(n=260397651547576035527008437293696027923, delay=1000, security_param=128)
+        x = 15290776003867498194639638
+        interval = WesolowskiVDF.checkpoint_interval(setup=pp, memory_budget=1000)
+        self.assertTrue(-(-pp.delay // interval) * sys.getsizeof(pp.n) <= 1000)
+        evaluation = WesolowskiVDF.eval(setup=pp, input_param=x, memory_budget=1000)
+        self.assertTrue(WesolowskiVDF.verify(pp, x, evaluation.output, evaluation.proof))
+
+    def test_eval_windowed(self):
+        pp = RsaSetup(n=260397651547576035527008437293696027923, delay=1000, security_param=128)
+        x = 15290776003867498194639638
+        expected = WesolowskiVDF.eval(setup=pp, input_param=x, windowed=False)
+        self.assertEqual(WesolowskiVDF.eval(setup=pp, input_param=x, windowed=True), expected)
+        self.assertEqual(WesolowskiVDF.eval(setup=pp, input_param=x, kappa=3, gamma=5), expected)
+        self.assertEqual(WesolowskiVDF.eval(setup=pp, input_param=x, kappa=2), expected)
+        y, output_list = square_sequences_v2(a=x, steps=pp.delay, n=pp.n)
+        proof = WesolowskiVDF.compute_proof_opt(setup=pp, input_param=x, output_param=y, output_list=output_list,
+                                                kappa=4, gamma=6)
+        self.assertEqual(proof, expected.proof)
+
+    def test_verify_batch(self):
+        pp = RsaSetup(n=260397651547576035527008437293696027923, delay=200, security_param=128)
+        triples = []
+        for x in [15290776003867498194639638, 2, 3, 1234567, 15290776003867498194639638]:
+            evaluation = WesolowskiVDF.eval(setup=pp, input_param=x)
+            triples.append((x, evaluation.output, evaluation.proof))
+        response = WesolowskiVDF.verify_batch(setup=pp, triples=triples)
+        self.assertEqual(response.results, [True] * 5)
+        self.assertTrue(response.valid)
+
+        triples[1] = (triples[1][0], triples[1][1], (triples[1][2] * 2) % pp.n)
+        triples[3] = (triples[3][0], pp.n - triples[3][1], triples[3][2])
+        triples.append((5, pp.n + 1, 1))
+        response = WesolowskiVDF.verify_batch(setup=pp, triples=triples)
+        self.assertEqual(response.results, [WesolowskiVDF.verify(pp, *item) for item in triples])
+        self.assertEqual(response.results, [True, False, True, False, True, False])
+        self.assertFalse(response.valid)
+        self.assertEqual(WesolowskiVDF.verify_batch(setup=pp, triples=[]).results, [])
+
+    def test_verify_batch_sign_flipped_proofs(self):
+        pp = RsaSetup(n=260397651547576035527008437293696027923, delay=200, security_param=128)
+        triples = []
+        for x in [2, 3]:
+            evaluation = WesolowskiVDF.eval(setup=pp, input_param=x)
+            triples.append((x, evaluation.output, pp.n - evaluation.proof))
+        # the order 2 factors of two sign-flipped proofs cancel in a combined check
+        self.assertEqual([WesolowskiVDF.verify(pp, *item) for item in triples], [False, False])
+        for _ in range(5):
+            self.assertEqual(WesolowskiVDF.verify_batch(setup=pp, triples=triples).results, [False, False])
+
+    def test_eval_segmented(self):
+        pp = RsaSetup(delay=1000, n=260397651547576035527008437293696027923, security_param=128)
+        x = 15290776003867498194639638
+        self.assertEqual(WesolowskiVDF.segment_delays(delay=10, segments=4), [3, 3, 2, 2])
+        self.assertEqual(WesolowskiVDF.segment_delays(delay=2, segments=4), [1, 1])
+        expected = WesolowskiVDF.eval(setup=pp, input_param=x)
+        for segments, workers in [(1, None), (3, None), (4, 2)]:
+            evaluation = WesolowskiVDF.eval_segmented(setup=pp, input_param=x, segments=segments, workers=workers)
+            self.assertEqual(evaluation.output, expected.output)
+            self.assertEqual(len(evaluation.proof), 2 * segments - 1)
+            self.assertTrue(WesolowskiVDF.verify_segmented(pp, x, evaluation.output, evaluation.proof))
+        self.assertEqual(evaluation.proof[-1], WesolowskiVDF.eval(
+            setup=pp.copy(update={"delay": 250}), input_param=evaluation.proof[2]).proof)
+
+        proof = list(evaluation.proof)
+        proof[1] = (proof[1] * 2) % pp.n
+        self.assertFalse(WesolowskiVDF.verify_segmented(pp, x, evaluation.output, proof))
+        self.assertFalse(WesolowskiVDF.verify_segmented(pp, x, evaluation.output, evaluation.proof[1:]))
+        self.assertFalse(WesolowskiVDF.verify_segmented(pp, x, (evaluation.output + 1) % pp.n, evaluation.proof))